@@ -2,14 +2,23 @@
 Admin-only API routes for ingestion and system management.
 """
 
-from fastapi import APIRouter, HTTPException, status, Header, Depends
+from fastapi import APIRouter, HTTPException, status, Header, Depends, Query
 from backend.api.models import (
-    IngestRequest, IngestResponse,
-    ReindexRequest, ReindexResponse,
-    StatsResponse
+    IngestRequest,
+    BulkIngestRequest,
+    ReindexRequest,
+    DeleteDocumentResponse,
+    StatsResponse,
+    MetricsResponse,
+    JobResponse, JobListResponse
 )
-from backend.ingestion.ingestion_pipeline import ingest_document, reindex_all
+from backend.ingestion.job_queue import get_job_queue
+from backend.ingestion.ingestion_pipeline import delete_document
+from backend.ingestion.index_store import IndexStore
+from backend.utils.metrics import get_metrics
+from backend.utils.admission import get_admission_controller
 from backend.config import settings
+import asyncio
 import logging
 import os
 
@@ -28,75 +37,225 @@ def verify_admin_key(x_admin_key: str = Header(...)):
     return x_admin_key
 
 
-@router.post("/ingest", response_model=IngestResponse, dependencies=[Depends(verify_admin_key)])
+@router.post(
+    "/ingest",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_admin_key)]
+)
 async def ingest_endpoint(request: IngestRequest):
     """
-    Ingest a document into the system.
+    Submit a document for ingestion as a background job.
     
     Supports:
     - PDF, DOCX, TXT (unstructured)
-    - CSV, Excel (structured)
-    - Web URLs (scraped content)
+    - CSV, Excel, HTML tables, JSON/JSONL records (structured, one chunk per row;
+      HTML and JSON are parsed as a stream, but their row chunks and embeddings
+      are held in memory until indexed)
+    - JSON/JSONL Q&A sets
+    - Web URLs (fetched, then parsed as HTML)
     
+    Returns immediately with a job; poll `GET /jobs/{job_id}` for progress.
     Requires admin authentication via X-Admin-Key header.
     """
+    # Verify file exists (for local files)
+    if request.document_type != "web" and not os.path.exists(request.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found: {request.file_path}"
+        )
+    
     try:
-        logger.info(f"Ingesting document: {request.file_path}")
+        logger.info(f"Queueing ingestion: {request.file_path}")
+        
+        job_id = get_job_queue().submit("ingest", {
+            "file_path": request.file_path,
+            "document_type": request.document_type,
+            "metadata": request.metadata or {},
+            "replaces": request.replaces_document_id
+        })
         
-        # Verify file exists (for local files)
-        if request.document_type != "web" and not os.path.exists(request.file_path):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"File not found: {request.file_path}"
-            )
+        return JobResponse(**get_job_queue().get(job_id))
         
-        # Execute ingestion pipeline
-        result = await ingest_document(
-            file_path=request.file_path,
-            document_type=request.document_type,
-            metadata=request.metadata or {}
+    except Exception as e:
+        logger.error(f"Error queueing ingestion: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error queueing ingestion: {str(e)}"
+        )
+
+
+@router.post(
+    "/ingest/bulk",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_admin_key)]
+)
+async def bulk_ingest_endpoint(request: BulkIngestRequest):
+    """
+    Submit a directory or manifest for bulk ingestion as a background job.
+    
+    Files are parsed in parallel and all chunks are committed to the
+    indices in a single batch. Requires admin authentication via
+    X-Admin-Key header.
+    """
+    if bool(request.directory) == bool(request.manifest):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of directory or manifest"
+        )
+    
+    source = request.directory or request.manifest
+    if not os.path.exists(source):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Path not found: {source}"
         )
+    
+    try:
+        logger.info(f"Queueing bulk ingestion: {source}")
         
-        logger.info(f"Ingestion successful: {result['chunks_created']} chunks created")
+        job_id = get_job_queue().submit("bulk_ingest", {
+            "directory": request.directory,
+            "manifest": request.manifest,
+            "recursive": request.recursive,
+            "metadata": request.metadata or {}
+        })
         
-        return IngestResponse(**result)
+        return JobResponse(**get_job_queue().get(job_id))
         
     except Exception as e:
-        logger.error(f"Error during ingestion: {e}", exc_info=True)
+        logger.error(f"Error queueing bulk ingestion: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error during ingestion: {str(e)}"
+            detail=f"Error queueing bulk ingestion: {str(e)}"
         )
 
 
-@router.post("/reindex", response_model=ReindexResponse, dependencies=[Depends(verify_admin_key)])
+@router.post(
+    "/reindex",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_admin_key)]
+)
 async def reindex_endpoint(request: ReindexRequest):
     """
-    Rebuild FAISS and/or BM25 indices from stored documents.
+    Submit a rebuild of the FAISS and BM25 indices as a background job.
     
     Use this after bulk ingestion or to recover from index corruption.
     Requires admin authentication via X-Admin-Key header.
     """
     try:
-        logger.info(f"Reindexing: FAISS={request.rebuild_faiss}, BM25={request.rebuild_bm25}")
+        logger.info(f"Queueing reindex (force={request.force})")
         
-        result = await reindex_all(
-            rebuild_faiss=request.rebuild_faiss,
-            rebuild_bm25=request.rebuild_bm25
-        )
+        job_id = get_job_queue().submit("reindex", {"force": request.force})
         
-        logger.info("Reindexing completed successfully")
+        return JobResponse(**get_job_queue().get(job_id))
         
-        return ReindexResponse(**result)
+    except Exception as e:
+        logger.error(f"Error queueing reindex: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error queueing reindex: {str(e)}"
+        )
+
+
+@router.delete(
+    "/documents/{document_id}",
+    response_model=DeleteDocumentResponse,
+    dependencies=[Depends(verify_admin_key)]
+)
+async def delete_document_endpoint(document_id: str):
+    """
+    Delete a document from the knowledge base.
+    
+    Its chunks are tombstoned and disappear from query results
+    immediately; no index rebuild is needed. A compaction job is queued
+    automatically once enough of the index is tombstoned.
+    Requires admin authentication via X-Admin-Key header.
+    """
+    try:
+        result = await asyncio.to_thread(delete_document, document_id)
+    except Exception as e:
+        logger.error(f"Error deleting document: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting document: {str(e)}"
+        )
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=result["message"]
+        )
+    return DeleteDocumentResponse(**result)
+
+
+@router.post(
+    "/compact",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_admin_key)]
+)
+async def compact_endpoint():
+    """
+    Submit a compaction of the indices as a background job.
+    
+    Physically removes tombstoned chunks from FAISS and BM25 without
+    re-embedding anything. Requires admin authentication via X-Admin-Key header.
+    """
+    try:
+        job_id = get_job_queue().submit("compact", {})
+        return JobResponse(**get_job_queue().get(job_id))
         
     except Exception as e:
-        logger.error(f"Error during reindexing: {e}", exc_info=True)
+        logger.error(f"Error queueing compaction: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error during reindexing: {str(e)}"
+            detail=f"Error queueing compaction: {str(e)}"
         )
 
 
+@router.get("/jobs", response_model=JobListResponse, dependencies=[Depends(verify_admin_key)])
+async def list_jobs_endpoint(limit: int = Query(default=50, ge=1, le=500)):
+    """List recent background jobs, newest first."""
+    return JobListResponse(jobs=[JobResponse(**job) for job in get_job_queue().list(limit)])
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, dependencies=[Depends(verify_admin_key)])
+async def job_status_endpoint(job_id: str):
+    """
+    Get status and progress of a background job.
+    
+    Progress includes pages parsed, chunks embedded and an ETA for the
+    current stage.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return JobResponse(**job)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse, dependencies=[Depends(verify_admin_key)])
+async def cancel_job_endpoint(job_id: str):
+    """
+    Cancel a queued or running background job.
+    
+    Running jobs stop at their next checkpoint, before the indices are
+    written. Finished jobs are returned unchanged.
+    """
+    job = get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return JobResponse(**job)
+
+
 @router.get("/stats", response_model=StatsResponse, dependencies=[Depends(verify_admin_key)])
 async def stats_endpoint():
     """
@@ -106,20 +265,20 @@ async def stats_endpoint():
     Requires admin authentication via X-Admin-Key header.
     """
     try:
-        # Calculate index sizes
+        # Calculate index sizes of the committed generation
         faiss_size = 0
         bm25_size = 0
+        total_chunks = 0
         
-        if settings.faiss_index_path.exists():
-            faiss_size = sum(f.stat().st_size for f in settings.faiss_index_path.rglob('*') if f.is_file())
-            faiss_size = faiss_size / (1024 * 1024)  # Convert to MB
-        
-        if settings.bm25_index_path.exists():
-            bm25_size = settings.bm25_index_path.stat().st_size / (1024 * 1024)
+        generation = IndexStore().current()
+        if generation is not None:
+            if generation.bm25_file.exists():
+                bm25_size = generation.bm25_file.stat().st_size / (1024 * 1024)
+            faiss_size = generation.size_bytes() / (1024 * 1024) - bm25_size  # Convert to MB
+            total_chunks = generation.manifest().get("chunks", 0)
         
         # Count documents
         total_documents = 0
-        total_chunks = 0
         if settings.documents_path.exists():
             total_documents = len(list(settings.documents_path.glob("*.json")))
         
@@ -138,3 +297,14 @@ async def stats_endpoint():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error getting stats: {str(e)}"
         )
+
+
+@router.get("/metrics", response_model=MetricsResponse, dependencies=[Depends(verify_admin_key)])
+async def metrics_endpoint():
+    """
+    Get query pipeline metrics (e.g. cross-encoder pairs scored per query)
+    and the current load of each admission-controlled stage.
+    
+    Requires admin authentication via X-Admin-Key header.
+    """
+    return MetricsResponse(**get_metrics().snapshot(), stages=get_admission_controller().snapshot())
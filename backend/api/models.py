@@ -15,17 +15,31 @@ class Language(str, Enum):
     TELUGU = "te"
 
 
+class QueryFilters(BaseModel):
+    """Metadata filters; values within a field are OR-ed, fields are AND-ed."""
+    type: Optional[List[str]] = Field(default=None, description="Document types: pdf, docx, txt, csv, excel, qa")
+    document: Optional[List[str]] = Field(default=None, description="Source document file names")
+    year: Optional[List[int]] = Field(default=None, description="Years the content refers to")
+    category: Optional[List[str]] = Field(default=None, description="Categories assigned at ingestion")
+    sheet_name: Optional[List[str]] = Field(default=None, description="Excel sheet names")
+
+
 class QueryRequest(BaseModel):
     """User query request model."""
     query: str = Field(..., description="User's question in any supported language", min_length=3)
     deterministic: bool = Field(default=False, description="Use deterministic mode (temperature=0)")
     language: Optional[Language] = Field(default=None, description="Override detected language")
+    filters: Optional[QueryFilters] = Field(default=None, description="Restrict retrieval to matching chunks")
+    timeout_seconds: Optional[float] = Field(
+        default=None, gt=0, le=300, description="Request deadline in seconds (default: server QUERY_TIMEOUT_SECONDS)"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "What is SIDBI Fund of Funds?",
-                "deterministic": False
+                "deterministic": False,
+                "filters": {"type": ["pdf"], "year": [2024]}
             }
         }
 
@@ -46,6 +60,10 @@ class QueryResponse(BaseModel):
     sources: List[Source] = Field(..., description="List of source citations")
     detected_language: Language = Field(..., description="Detected query language")
     processing_time_seconds: float = Field(..., description="Total processing time")
+    degradation_tier: int = Field(
+        default=0, description="Load-shedding tier the query was served at (0 = full pipeline)"
+    )
+    faq_id: Optional[str] = Field(default=None, description="Curated FAQ entry that answered the query, if any")
     
     class Config:
         json_schema_extra = {
@@ -67,11 +85,48 @@ class QueryResponse(BaseModel):
         }
 
 
+class BatchQueryRequest(BaseModel):
+    """Batch query request model."""
+    queries: List[QueryRequest] = Field(
+        ..., min_length=1, description="Queries to answer (at most BATCH_MAX_QUERIES); their timeout_seconds is ignored"
+    )
+    stream: bool = Field(default=False, description="Stream results as NDJSON lines as they complete")
+    timeout_seconds: Optional[float] = Field(
+        default=None, gt=0, le=3600, description="Deadline for the whole batch (default: server BATCH_TIMEOUT_SECONDS)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": [
+                    {"query": "What is SIDBI Fund of Funds?"},
+                    {"query": "Who is eligible for Startup India Seed Fund?", "deterministic": True}
+                ],
+                "stream": True
+            }
+        }
+
+
+class BatchQueryResult(BaseModel):
+    """Outcome of one query of a batch."""
+    index: int = Field(..., description="Position of the query in the request")
+    status_code: int = Field(default=200, description="HTTP status the query would have had on /api/query")
+    result: Optional[QueryResponse] = Field(default=None, description="Answer, if the query succeeded")
+    error: Optional[str] = Field(default=None, description="Error message, if the query failed")
+
+
+class BatchQueryResponse(BaseModel):
+    """Batch query response model."""
+    results: List[BatchQueryResult] = Field(..., description="One result per query, in request order")
+    processing_time_seconds: float = Field(..., description="Total processing time")
+
+
 class IngestRequest(BaseModel):
     """Document ingestion request model."""
-    file_path: str = Field(..., description="Path to document file")
-    document_type: str = Field(..., description="Type: pdf, docx, txt, csv, excel, web")
+    file_path: str = Field(..., description="Path to document file, or URL for web pages")
+    document_type: str = Field(..., description="Type: pdf, docx, txt, csv, excel, html, json (JSON/JSONL records), qa (JSON/JSONL Q&A set), web")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
+    replaces_document_id: Optional[str] = Field(default=None, description="Existing document this one replaces; deleted once the new one is indexed")
     
     class Config:
         json_schema_extra = {
@@ -91,10 +146,26 @@ class IngestResponse(BaseModel):
     document_id: Optional[str] = Field(default=None, description="Unique document ID")
 
 
+class BulkIngestRequest(BaseModel):
+    """Bulk ingestion request model (directory or manifest)."""
+    directory: Optional[str] = Field(default=None, description="Directory whose supported files are ingested")
+    manifest: Optional[str] = Field(default=None, description="JSON/JSONL manifest of {file_path, document_type, metadata}")
+    recursive: bool = Field(default=True, description="Include subdirectories when scanning a directory")
+    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Metadata applied to every file")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "directory": "/path/to/sample_data",
+                "recursive": True,
+                "metadata": {"source": "sample_data"}
+            }
+        }
+
+
 class ReindexRequest(BaseModel):
     """Reindex request model."""
-    rebuild_faiss: bool = Field(default=True, description="Rebuild FAISS index")
-    rebuild_bm25: bool = Field(default=True, description="Rebuild BM25 index")
+    force: bool = Field(default=False, description="Re-parse every document, ignoring the chunk cache")
 
 
 class ReindexResponse(BaseModel):
@@ -103,6 +174,19 @@ class ReindexResponse(BaseModel):
     message: str = Field(..., description="Status message")
     faiss_documents: int = Field(default=0, description="Documents in FAISS index")
     bm25_documents: int = Field(default=0, description="Documents in BM25 index")
+    documents_reused: int = Field(default=0, description="Unchanged documents served from the chunk cache")
+    documents_reparsed: int = Field(default=0, description="New or changed documents re-parsed")
+    documents_dropped: int = Field(default=0, description="Documents dropped because their source file was deleted or no longer parses")
+    failures: List[Dict[str, Any]] = Field(default_factory=list, description="Documents that produced no chunks: file_path and message")
+
+
+class DeleteDocumentResponse(BaseModel):
+    """Document deletion response model."""
+    success: bool = Field(..., description="Whether deletion succeeded")
+    message: str = Field(..., description="Status message")
+    document_id: str = Field(..., description="Deleted document ID")
+    chunks_removed: int = Field(default=0, description="Chunks tombstoned in the indices")
+    compaction_job_id: Optional[str] = Field(default=None, description="Compaction job queued because tombstones crossed the threshold")
 
 
 class StatsResponse(BaseModel):
@@ -113,3 +197,75 @@ class StatsResponse(BaseModel):
     bm25_index_size_mb: float = Field(..., description="BM25 index size in MB")
     supported_languages: List[str] = Field(..., description="Supported languages")
     embedding_model: str = Field(..., description="Current embedding model")
+
+
+class MetricsResponse(BaseModel):
+    """Query pipeline metrics."""
+    counters: Dict[str, float] = Field(..., description="Event counters, e.g. rerank.stop.converged")
+    summaries: Dict[str, Optional[Dict[str, float]]] = Field(
+        ..., description="Windowed count/mean/p50/p95/max, e.g. rerank.pairs_scored"
+    )
+    stages: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Current concurrency, active and waiting calls per pipeline stage"
+    )
+
+
+class JobStatus(str, Enum):
+    """Background job states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobProgressInfo(BaseModel):
+    """Progress of a background job."""
+    stage: str = Field(..., description="Current stage: queued, parsing, embedding, indexing, done")
+    files_parsed: int = Field(default=0, description="Files parsed so far (bulk jobs)")
+    files_total: Optional[int] = Field(default=None, description="Files to parse (bulk jobs)")
+    pages_parsed: int = Field(default=0, description="Pages parsed so far")
+    pages_total: Optional[int] = Field(default=None, description="Total pages discovered")
+    chunks_embedded: int = Field(default=0, description="Chunks embedded so far")
+    chunks_total: Optional[int] = Field(default=None, description="Total chunks to embed")
+    eta_seconds: Optional[float] = Field(default=None, description="Estimated seconds left in current stage")
+
+
+class JobResponse(BaseModel):
+    """Background job status model."""
+    job_id: str = Field(..., description="Unique job ID")
+    job_type: str = Field(..., description="Job type: ingest, bulk_ingest, reindex, compact")
+    status: JobStatus = Field(..., description="Current job status")
+    params: Optional[Dict[str, Any]] = Field(default=None, description="Job parameters")
+    progress: Optional[JobProgressInfo] = Field(default=None, description="Job progress")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="IngestResponse or ReindexResponse fields once finished")
+    error: Optional[str] = Field(default=None, description="Error message if the job failed")
+    cancel_requested: bool = Field(default=False, description="Whether cancellation was requested")
+    created_at: float = Field(..., description="Submission time (epoch seconds)")
+    started_at: Optional[float] = Field(default=None, description="Start time (epoch seconds)")
+    finished_at: Optional[float] = Field(default=None, description="Finish time (epoch seconds)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "5f0c7a52-3f0e-4c39-9d1b-8a4f4b0c2e11",
+                "job_type": "ingest",
+                "status": "running",
+                "progress": {
+                    "stage": "embedding",
+                    "pages_parsed": 42,
+                    "pages_total": 42,
+                    "chunks_embedded": 512,
+                    "chunks_total": 1310,
+                    "eta_seconds": 37.5
+                },
+                "cancel_requested": False,
+                "created_at": 1760870400.0,
+                "started_at": 1760870401.2
+            }
+        }
+
+
+class JobListResponse(BaseModel):
+    """List of background jobs."""
+    jobs: List[JobResponse] = Field(..., description="Most recent jobs first")
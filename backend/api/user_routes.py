@@ -2,9 +2,14 @@
 User-facing API routes for querying the RAG system.
 """
 
-from fastapi import APIRouter, HTTPException, status
-from backend.api.models import QueryRequest, QueryResponse
-from backend.graph.query_graph import execute_query_graph
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Union
+from backend.api.models import BatchQueryRequest, BatchQueryResponse, BatchQueryResult, QueryRequest, QueryResponse
+from backend.config import settings
+from backend.graph.query_graph import execute_query_batch, execute_query_graph
+from backend.utils.admission import OverloadedError, stage_limiter
+from backend.utils.deadline import ClientDisconnected, DeadlineExceeded, new_deadline, run_with_deadline
 import logging
 import time
 
@@ -14,7 +19,7 @@ router = APIRouter()
 
 
 @router.post("/query", response_model=QueryResponse)
-async def query_endpoint(request: QueryRequest):
+async def query_endpoint(request: QueryRequest, http_request: Request):
     """
     Main RAG query endpoint.
     
@@ -27,19 +32,29 @@ async def query_endpoint(request: QueryRequest):
     6. Cross-encoder reranking
     7. LLM answer generation
     
-    Returns answer with inline citations and source list.
+    Returns answer with inline citations and source list. When the server
+    is saturated the query is rejected with 503 and a Retry-After header;
+    a query that runs past its deadline gets 504. If the client disconnects
+    the in-flight work is cancelled.
     """
     start_time = time.time()
+    deadline = new_deadline(request.timeout_seconds)
+    
+    async def answer():
+        # Execute query through LangGraph pipeline (bounded concurrent queries)
+        async with stage_limiter("query").slot():
+            return await execute_query_graph(
+                query=request.query,
+                deterministic=request.deterministic,
+                language_override=request.language,
+                filters=request.filters.model_dump(exclude_none=True) if request.filters else None,
+                deadline=deadline
+            )
     
     try:
         logger.info(f"Received query: {request.query[:100]}...")
         
-        # Execute query through LangGraph pipeline
-        result = await execute_query_graph(
-            query=request.query,
-            deterministic=request.deterministic,
-            language_override=request.language
-        )
+        result = await run_with_deadline(answer(), deadline, http_request.is_disconnected)
         
         processing_time = time.time() - start_time
         result["processing_time_seconds"] = processing_time
@@ -48,6 +63,20 @@ async def query_endpoint(request: QueryRequest):
         
         return QueryResponse(**result)
         
+    except OverloadedError as e:
+        logger.warning(f"Query rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except DeadlineExceeded as e:
+        logger.warning(f"Query timed out after {time.time() - start_time:.2f}s")
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except ClientDisconnected:
+        logger.info("Client disconnected, query cancelled")
+        # Nobody is listening; 499 (client closed request) only shows up in logs
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"Error processing query: {e}", exc_info=True)
         raise HTTPException(
@@ -56,6 +85,117 @@ async def query_endpoint(request: QueryRequest):
         )
 
 
+def _batch_result(index: int, outcome: Union[Dict[str, Any], Exception], start_time: float) -> BatchQueryResult:
+    """Batch result for a query's answer or failure."""
+    if isinstance(outcome, OverloadedError):
+        return BatchQueryResult(index=index, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, error=str(outcome))
+    if isinstance(outcome, DeadlineExceeded):
+        return BatchQueryResult(index=index, status_code=status.HTTP_504_GATEWAY_TIMEOUT, error=str(outcome))
+    outcome["processing_time_seconds"] = time.time() - start_time
+    return BatchQueryResult(index=index, result=QueryResponse(**outcome))
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def query_batch_endpoint(request: BatchQueryRequest, http_request: Request):
+    """
+    Answer a batch of queries in one request.
+    
+    The queries share model calls: one encode call and multi-row FAISS
+    searches for all of them, one cross-encoder call over all pairs, and
+    a bounded number of concurrent LLM calls (see execute_query_batch).
+    
+    Returns every result in request order, or with stream=true one NDJSON
+    line per query as its answer completes (lines carry the query's index).
+    Queries that fail carry the status code they would have had on
+    /api/query; the batch itself holds one slot of the batch limiter, not
+    of the interactive query limiter.
+    """
+    if len(request.queries) > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_max_queries} queries per batch"
+        )
+    
+    start_time = time.time()
+    deadline = new_deadline(request.timeout_seconds or settings.batch_timeout_seconds)
+    queries = [
+        {
+            "query": query.query,
+            "deterministic": query.deterministic,
+            "language_override": query.language,
+            "filters": query.filters.model_dump(exclude_none=True) if query.filters else None
+        }
+        for query in request.queries
+    ]
+    logger.info(f"Received batch of {len(queries)} queries")
+    
+    if request.stream:
+        async def stream_results():
+            sent = set()
+            try:
+                async with stage_limiter("batch").slot():
+                    async for index, outcome in execute_query_batch(queries, deadline=deadline):
+                        sent.add(index)
+                        yield _batch_result(index, outcome, start_time).model_dump_json() + "\n"
+            except Exception as e:
+                # Headers are already sent: report the failure on every pending line
+                if isinstance(e, OverloadedError):
+                    logger.warning(f"Batch rejected: {e}")
+                    code = status.HTTP_503_SERVICE_UNAVAILABLE
+                else:
+                    logger.error(f"Error processing batch: {e}", exc_info=True)
+                    code = status.HTTP_500_INTERNAL_SERVER_ERROR
+                for index in range(len(queries)):
+                    if index not in sent:
+                        yield BatchQueryResult(index=index, status_code=code, error=str(e)).model_dump_json() + "\n"
+            logger.info(f"Batch of {len(queries)} queries streamed in {time.time() - start_time:.2f}s")
+        
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+    
+    results: Dict[int, BatchQueryResult] = {}
+    
+    async def collect():
+        # A batch holds one batch slot for its whole duration
+        async with stage_limiter("batch").slot():
+            async for index, outcome in execute_query_batch(queries, deadline=deadline):
+                results[index] = _batch_result(index, outcome, start_time)
+    
+    try:
+        await run_with_deadline(collect(), deadline, http_request.is_disconnected)
+    except OverloadedError as e:
+        logger.warning(f"Batch rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except DeadlineExceeded:
+        # Answers completed so far are still returned
+        logger.warning(f"Batch deadline exceeded after {len(results)} of {len(queries)} queries")
+    except ClientDisconnected:
+        logger.info("Client disconnected, batch cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except Exception as e:
+        logger.error(f"Error processing batch: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing batch: {str(e)}"
+        )
+    
+    processing_time = time.time() - start_time
+    logger.info(f"Batch of {len(queries)} queries processed in {processing_time:.2f}s")
+    
+    return BatchQueryResponse(
+        results=[
+            results.get(index) or BatchQueryResult(
+                index=index, status_code=status.HTTP_504_GATEWAY_TIMEOUT, error="Request deadline exceeded"
+            )
+            for index in range(len(queries))
+        ],
+        processing_time_seconds=processing_time
+    )
+
+
 @router.get("/languages")
 async def get_supported_languages():
     """Get list of supported languages."""
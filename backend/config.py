@@ -23,26 +23,118 @@ class Settings(BaseSettings):
         env="EMBEDDING_MODEL"
     )
     
+    # Chunking (lengths in embedding model tokens; max is the model's max_seq_length)
+    chunk_max_tokens: int = Field(default=128, env="CHUNK_MAX_TOKENS")
+    chunk_overlap_tokens: int = Field(default=24, env="CHUNK_OVERLAP_TOKENS")
+    
     # Storage Paths
     storage_path: Path = Field(default=Path("./storage"), env="STORAGE_PATH")
     faiss_index_path: Path = Field(default=Path("./storage/faiss_index"), env="FAISS_INDEX_PATH")
     bm25_index_path: Path = Field(default=Path("./storage/bm25_index.pkl"), env="BM25_INDEX_PATH")
     documents_path: Path = Field(default=Path("./storage/documents"), env="DOCUMENTS_PATH")
+    jobs_db_path: Path = Field(default=Path("./storage/jobs.db"), env="JOBS_DB_PATH")
+    chunk_cache_path: Path = Field(default=Path("./storage/chunk_cache"), env="CHUNK_CACHE_PATH")
+    table_store_path: Path = Field(default=Path("./storage/tables"), env="TABLE_STORE_PATH")
+    faq_store_path: Path = Field(default=Path("./storage/faq"), env="FAQ_STORE_PATH")
+    
+    # Background Ingestion Jobs
+    ingest_workers: int = Field(default=1, env="INGEST_WORKERS")
+    ingest_parse_workers: int = Field(default=4, env="INGEST_PARSE_WORKERS")
+    embedding_batch_size: int = Field(default=256, env="EMBEDDING_BATCH_SIZE")
+    compaction_tombstone_ratio: float = Field(default=0.2, env="COMPACTION_TOMBSTONE_RATIO")
+    index_generations_keep: int = Field(default=2, env="INDEX_GENERATIONS_KEEP")
+    
+    # Vector Storage (applied on the next full index build)
+    faiss_storage: str = Field(default="flat", env="FAISS_STORAGE")  # flat, fp16, sq8, pq, hnsw
+    faiss_metric: str = Field(default="l2", env="FAISS_METRIC")  # l2 or cosine
+    faiss_pq_subquantizers: int = Field(default=48, env="FAISS_PQ_SUBQUANTIZERS")
+    faiss_hnsw_m: int = Field(default=32, env="FAISS_HNSW_M")
+    faiss_hnsw_ef_search: int = Field(default=64, env="FAISS_HNSW_EF_SEARCH")
     
     # Retrieval Configuration
     top_k_retrieval: int = Field(default=20, env="TOP_K_RETRIEVAL")
     top_k_rerank: int = Field(default=5, env="TOP_K_RERANK")
     rrf_k: int = Field(default=60, env="RRF_K")
+    dense_min_similarity: float = Field(default=0.2, env="DENSE_MIN_SIMILARITY")  # cosine indices only
+    
+    # Cross-lingual Retrieval ("expand": offline BM25 term expansion, "translate": translation API, or "both")
+    cross_lingual_mode: str = Field(default="expand", env="CROSS_LINGUAL_MODE")
+    query_expansion_max_terms: int = Field(default=20000, env="QUERY_EXPANSION_MAX_TERMS")
+    query_expansion_terms: int = Field(default=3, env="QUERY_EXPANSION_TERMS")
+    query_expansion_min_similarity: float = Field(default=0.5, env="QUERY_EXPANSION_MIN_SIMILARITY")
+    
+    # Adaptive Reranking (cross-encoder pairs adjusted per query)
+    rerank_adaptive: bool = Field(default=True, env="RERANK_ADAPTIVE")
+    rerank_max_pairs: int = Field(default=24, env="RERANK_MAX_PAIRS")
+    rerank_batch_size: int = Field(default=8, env="RERANK_BATCH_SIZE")
+    rerank_rrf_ratio: float = Field(default=0.45, env="RERANK_RRF_RATIO")
+    rerank_dense_gap: float = Field(default=0.25, env="RERANK_DENSE_GAP")  # needs cosine similarities
+    rerank_budget_ms: float = Field(default=250.0, env="RERANK_BUDGET_MS")
+    
+    # FAQ fast path (curated answers for known questions, no LLM call)
+    enable_faq: bool = Field(default=True, env="ENABLE_FAQ")
+    faq_min_similarity: float = Field(default=0.9, env="FAQ_MIN_SIMILARITY")
+    
+    # Structured-data analytics
+    enable_table_analytics: bool = Field(default=True, env="ENABLE_TABLE_ANALYTICS")
+    analytics_max_rows: int = Field(default=15, env="ANALYTICS_MAX_ROWS")
     
     # LLM Configuration
     llm_temperature_deterministic: float = Field(default=0.0, env="LLM_TEMPERATURE_DETERMINISTIC")
     llm_temperature_explanatory: float = Field(default=0.2, env="LLM_TEMPERATURE_EXPLANATORY")
     llm_max_tokens: int = Field(default=1000, env="LLM_MAX_TOKENS")
     llm_timeout_seconds: int = Field(default=30, env="LLM_TIMEOUT_SECONDS")
+    # auto (Groq for gsk_ keys, else Gemini), gemini, groq, or openai (any
+    # OpenAI-compatible endpoint at LLM_BASE_URL, e.g. backend.llm.mock_server)
+    llm_provider: str = Field(default="auto", env="LLM_PROVIDER")
+    llm_base_url: str = Field(default="http://127.0.0.1:8100/v1", env="LLM_BASE_URL")
+    
+    # Context Packing (overlap removal and query-relevant sentences within a token budget)
+    context_packing: bool = Field(default=True, env="CONTEXT_PACKING")
+    context_token_budget: int = Field(default=1500, env="CONTEXT_TOKEN_BUDGET")
+    context_min_overlap_words: int = Field(default=8, env="CONTEXT_MIN_OVERLAP_WORDS")
+    
+    # Admission Control (concurrent queries and per-stage inference limits)
+    query_max_concurrency: int = Field(default=32, env="QUERY_MAX_CONCURRENCY")
+    query_max_queue: int = Field(default=64, env="QUERY_MAX_QUEUE")
+    encoder_concurrency: int = Field(default=2, env="ENCODER_CONCURRENCY")
+    bm25_concurrency: int = Field(default=4, env="BM25_CONCURRENCY")
+    reranker_concurrency: int = Field(default=2, env="RERANKER_CONCURRENCY")
+    analytics_concurrency: int = Field(default=2, env="ANALYTICS_CONCURRENCY")
+    llm_concurrency: int = Field(default=8, env="LLM_CONCURRENCY")
+    stage_max_queue: int = Field(default=64, env="STAGE_MAX_QUEUE")
+    admission_queue_timeout_seconds: float = Field(default=10.0, env="ADMISSION_QUEUE_TIMEOUT_SECONDS")
+    
+    # Request Deadlines (QueryRequest.timeout_seconds overrides the default)
+    query_timeout_seconds: float = Field(default=30.0, env="QUERY_TIMEOUT_SECONDS")
+    deadline_llm_reserve_seconds: float = Field(default=5.0, env="DEADLINE_LLM_RESERVE_SECONDS")
+    llm_tokens_per_second: float = Field(default=50.0, env="LLM_TOKENS_PER_SECOND")  # Caps max_tokens to the time left
+    
+    # Batch Queries (/api/query/batch)
+    batch_max_queries: int = Field(default=500, env="BATCH_MAX_QUERIES")
+    batch_max_concurrency: int = Field(default=2, env="BATCH_MAX_CONCURRENCY")  # Batches processed at once
+    batch_stage_size: int = Field(default=64, env="BATCH_STAGE_SIZE")  # Queries per batched encode/search/rerank call
+    batch_llm_concurrency: int = Field(default=4, env="BATCH_LLM_CONCURRENCY")
+    batch_timeout_seconds: float = Field(default=600.0, env="BATCH_TIMEOUT_SECONDS")
+    
+    # Load Shedding (degradation tiers: skip translation, skip reranking,
+    # fewer retrieval candidates, trimmed LLM context)
+    load_shedding: bool = Field(default=True, env="LOAD_SHEDDING")
+    retrieval_latency_slo_seconds: float = Field(default=2.0, env="RETRIEVAL_LATENCY_SLO_SECONDS")  # Pre-LLM time
+    latency_window_seconds: float = Field(default=30.0, env="LATENCY_WINDOW_SECONDS")
+    degradation_thresholds: List[float] = Field(default=[0.6, 0.75, 0.9, 1.0], env="DEGRADATION_THRESHOLDS")
+    degraded_top_k_retrieval: int = Field(default=10, env="DEGRADED_TOP_K_RETRIEVAL")
+    degraded_context_chunks: int = Field(default=3, env="DEGRADED_CONTEXT_CHUNKS")
+    degraded_chunk_chars: int = Field(default=800, env="DEGRADED_CHUNK_CHARS")
     
     # Translation
     enable_translation: bool = Field(default=False, env="ENABLE_TRANSLATION")
     translation_api_key: str = Field(default="", env="TRANSLATION_API_KEY")
+    translation_provider: str = Field(default="google", env="TRANSLATION_PROVIDER")  # google or local
+    translation_workers: int = Field(default=4, env="TRANSLATION_WORKERS")
+    translation_cache_path: Path = Field(default=Path("./storage/translation_cache.db"), env="TRANSLATION_CACHE_PATH")
+    translation_cache_size: int = Field(default=50000, env="TRANSLATION_CACHE_SIZE")
+    translation_cache_ttl_seconds: float = Field(default=30 * 24 * 3600, env="TRANSLATION_CACHE_TTL_SECONDS")
     
     # API Configuration
     api_host: str = Field(default="127.0.0.1", env="API_HOST")
@@ -1,10 +1,15 @@
 """
 LangGraph-based query execution pipeline.
 Orchestrates: Language Detection → Translation → Retrieval → RRF → Reranking → LLM
+Known FAQ questions are answered from curated Q&A sets right after language detection.
+Aggregate questions over CSV/Excel data take a table analytics branch instead of retrieval.
+Batches of queries run the same nodes stage by stage, sharing model calls.
 """
 
-from typing import Dict, Any, Optional, TypedDict
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, TypedDict, Union
+import asyncio
 import logging
+import time
 from langgraph.graph import StateGraph, END
 
 from backend.utils.language_utils import detect_language
@@ -12,7 +17,23 @@ from backend.utils.translation_pipeline import get_translation_pipeline
 from backend.retriever.hybrid_retriever import get_retriever
 from backend.retriever.rrf import reciprocal_rank_fusion
 from backend.retriever.reranker import get_reranker
+from backend.retriever.table_analytics import is_analytical_query, answer_from_tables
+from backend.ingestion.table_store import get_table_store
+from backend.ingestion.faq_store import get_faq_store
 from backend.llm.llm_client import get_llm_client
+from backend.llm.context_packer import pack_context
+from backend.utils.metrics import get_metrics
+from backend.utils.admission import (
+    DEGRADE_REDUCE_RETRIEVAL,
+    DEGRADE_SKIP_RERANK,
+    DEGRADE_SKIP_TRANSLATION,
+    DEGRADE_TRIM_CONTEXT,
+    OverloadedError,
+    degradation_tier,
+    record_retrieval_latency,
+    stage_limiter
+)
+from backend.utils.deadline import DeadlineExceeded, new_deadline, remaining
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
@@ -25,14 +46,30 @@ class QueryState(TypedDict):
     detected_language: str
     language_override: Optional[str]
     deterministic: bool
+    filters: Optional[Dict[str, Any]]
     translated_query: Optional[str]
+    query_embedding: Optional[Any]  # Raw embedding of the query, reused by retrieval
+    faq_id: Optional[str]  # Curated FAQ entry that answered the query
     dense_results: list
     sparse_results: list
     fused_results: list
     reranked_results: list
+    table_results: list
     answer: str
     sources: list
     error: Optional[str]
+    degradation_tier: int  # Load-shedding tier (see backend.utils.admission)
+    deadline: float  # Absolute time.monotonic() deadline of the request
+    started: Optional[float]  # time.monotonic() start of an interactive query (None in batches)
+
+
+# Answers are never capped below this many tokens, however little time is left
+_MIN_ANSWER_TOKENS = 64
+
+
+def _spare_seconds(state: QueryState) -> float:
+    """Seconds left before the deadline beyond the time reserved for generation."""
+    return remaining(state["deadline"]) - settings.deadline_llm_reserve_seconds
 
 
 async def detect_language_node(state: QueryState) -> QueryState:
@@ -56,28 +93,163 @@ async def detect_language_node(state: QueryState) -> QueryState:
     return state
 
 
+def _faq_eligible(state: QueryState) -> bool:
+    """Curated answers are English and unscoped, so only English queries without filters match."""
+    return settings.enable_faq and not state.get("filters") and state["detected_language"] == "en"
+
+
+async def _match_faq(states: List[QueryState]) -> List[Optional[Tuple[Dict[str, Any], float]]]:
+    """
+    Match queries against the known FAQ questions.
+    
+    Exact (normalized) matches need no model call; the rest are encoded in
+    one call and their embeddings kept in the state for dense retrieval.
+    
+    Returns:
+        (FAQ entry, similarity) or None per state
+    """
+    store = get_faq_store()
+    if not store.size():
+        return [None] * len(states)
+    
+    matches = [store.lookup(state["query"]) for state in states]
+    unmatched = [i for i, match in enumerate(matches) if match is None]
+    if unmatched:
+        embeddings = await stage_limiter("encoder").run(
+            get_retriever().embedding_model.encode,
+            [states[i]["query"] for i in unmatched],
+            convert_to_numpy=True
+        )
+        for i, embedding in zip(unmatched, embeddings):
+            states[i]["query_embedding"] = embedding
+            matches[i] = store.search(embedding)
+    
+    metrics = get_metrics()
+    hits = sum(match is not None for match in matches)
+    metrics.increment("faq.hit", hits)
+    metrics.increment("faq.miss", len(matches) - hits)
+    return matches
+
+
+def _answer_from_faq(state: QueryState, entry: Dict[str, Any], similarity: float):
+    """Answer with a curated FAQ entry, cited as the only source."""
+    state["faq_id"] = entry["faq_id"]
+    state["answer"] = f"{entry['answer']} [Source 1]"
+    state["sources"] = [{
+        "source_id": 1,
+        "document": entry["document"],
+        "page": None,
+        "section": entry.get("category"),
+        "content_snippet": entry["answer"][:200],
+        "metadata": {
+            "document_id": entry["document_id"],
+            "faq_id": entry["faq_id"],
+            "question": entry["question"],
+            "type": "faq",
+            "similarity": round(similarity, 4)
+        }
+    }]
+    logger.info(f"Answered from FAQ {entry['document']}#{entry['faq_id']} (similarity {similarity:.3f})")
+
+
+async def faq_node(state: QueryState) -> QueryState:
+    """Answer known questions from the curated FAQ sets."""
+    if not _faq_eligible(state):
+        return state
+    
+    try:
+        match = (await _match_faq([state]))[0]
+        if match is not None:
+            _answer_from_faq(state, *match)
+        
+    except OverloadedError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in FAQ lookup: {e}")
+    
+    return state
+
+
+def route_after_faq(state: QueryState) -> str:
+    """Stop at a curated answer, otherwise continue to translation."""
+    return "answered" if state["faq_id"] else "translate"
+
+
 async def translate_node(state: QueryState) -> QueryState:
     """Optionally translate query to English."""
     try:
         translation_pipeline = get_translation_pipeline()
         
-        if translation_pipeline.enabled:
-            translated = await translation_pipeline.translate_query(
-                state["query"],
-                state["detected_language"]
+        # In "expand" mode Indic queries are matched through the offline term
+        # dictionary at retrieval time, without a translation round-trip
+        if state["degradation_tier"] >= DEGRADE_SKIP_TRANSLATION:
+            logger.info("Translation skipped (load shedding)")
+        elif _spare_seconds(state) <= 0:
+            logger.info("Translation skipped (deadline)")
+        elif translation_pipeline.enabled and settings.cross_lingual_mode in ("translate", "both"):
+            # Shielded: a translation shared with other queries is not cancelled
+            # when this one runs out of time, and its result is still cached
+            translated = await asyncio.wait_for(
+                asyncio.shield(translation_pipeline.translate_query(state["query"], state["detected_language"])),
+                timeout=_spare_seconds(state)
             )
             
             if translated:
                 state["translated_query"] = translated
                 state["query"] = translated  # Use translated query for retrieval
+                state["query_embedding"] = None
                 logger.info("Using translated query for retrieval")
         
+    except asyncio.TimeoutError:
+        logger.warning("Translation timed out, using original query")
     except Exception as e:
         logger.error(f"Error in translation: {e}")
     
     return state
 
 
+async def analytics_node(state: QueryState) -> QueryState:
+    """Answer aggregate/filter questions from the columnar table store."""
+    try:
+        # Parquet reads and pandas masks run off the event loop
+        table_results = await stage_limiter("analytics").run(answer_from_tables, state["query"])
+        state["table_results"] = table_results
+        
+        if table_results:
+            # Computed tables are the context; no chunk retrieval needed
+            state["reranked_results"] = table_results
+            logger.info(f"Answered from {len(table_results)} tables")
+        
+    except Exception as e:
+        logger.error(f"Error in table analytics: {e}")
+        state["table_results"] = []
+    
+    return state
+
+
+def route_after_translate(state: QueryState) -> str:
+    """Send aggregate questions to table analytics, everything else to retrieval."""
+    if state.get("filters") is None and is_analytical_query(state["query"]):
+        return "analytics"
+    return "retrieve"
+
+
+def route_after_analytics(state: QueryState) -> str:
+    """Fall back to retrieval if no table could answer the question."""
+    return "generate" if state["table_results"] else "retrieve"
+
+
+def _retrieval_top_k(state: QueryState) -> int:
+    """
+    Candidates to retrieve: fewer under load, or when less than twice the
+    generation reserve is left.
+    """
+    short_on_time = _spare_seconds(state) < settings.deadline_llm_reserve_seconds
+    if state["degradation_tier"] >= DEGRADE_REDUCE_RETRIEVAL or short_on_time:
+        return min(settings.top_k_retrieval, settings.degraded_top_k_retrieval)
+    return settings.top_k_retrieval
+
+
 async def retrieve_node(state: QueryState) -> QueryState:
     """Hybrid retrieval (FAISS + BM25)."""
     try:
@@ -85,7 +257,9 @@ async def retrieve_node(state: QueryState) -> QueryState:
         
         results = await retriever.retrieve_hybrid(
             query=state["query"],
-            top_k=settings.top_k_retrieval
+            top_k=_retrieval_top_k(state),
+            filters=state.get("filters"),
+            query_embedding=state.get("query_embedding")
         )
         
         state["dense_results"] = results["dense_results"]
@@ -93,6 +267,8 @@ async def retrieve_node(state: QueryState) -> QueryState:
         
         logger.info(f"Retrieved: {len(state['dense_results'])} dense, {len(state['sparse_results'])} sparse")
         
+    except OverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in retrieval: {e}")
         state["error"] = str(e)
@@ -122,17 +298,63 @@ async def fusion_node(state: QueryState) -> QueryState:
     return state
 
 
+def _rrf_order(state: QueryState) -> list:
+    """Top fused results in RRF order (reranking fallback)."""
+    return state["fused_results"][:settings.top_k_rerank]
+
+
+def _skip_rerank(state: QueryState) -> bool:
+    """Use RRF order instead of the cross-encoder when shedding load or out of time."""
+    if state["degradation_tier"] >= DEGRADE_SKIP_RERANK:
+        reason = "shed"
+    elif _spare_seconds(state) <= 0:
+        reason = "deadline"
+    else:
+        return False
+    
+    get_metrics().increment(f"rerank.stop.{reason}")
+    state["reranked_results"] = _rrf_order(state)
+    logger.info(f"Reranking skipped ({reason}), using RRF order")
+    return True
+
+
+def _record_rerank_stats(stats: Dict[str, Any]):
+    metrics = get_metrics()
+    metrics.observe("rerank.candidates", stats["candidates"])
+    metrics.observe("rerank.pairs_scored", stats["pairs_scored"])
+    metrics.increment(f"rerank.stop.{stats['stop_reason']}")
+
+
 async def rerank_node(state: QueryState) -> QueryState:
     """Cross-encoder reranking."""
+    if _skip_rerank(state):
+        return state
+    
     try:
         reranker = get_reranker()
         
         # Use original query for reranking (not translated)
-        reranked = await reranker.rerank(
-            query=state["original_query"],
-            results=state["fused_results"],
-            top_k=settings.top_k_rerank
-        )
+        if settings.rerank_adaptive:
+            reranked, stats = await reranker.rerank_adaptive(
+                query=state["original_query"],
+                results=state["fused_results"],
+                top_k=settings.top_k_rerank,
+                retrieval_query=state["query"],
+                budget_ms=min(settings.rerank_budget_ms, _spare_seconds(state) * 1000)
+            )
+        else:
+            reranked = await reranker.rerank(
+                query=state["original_query"],
+                results=state["fused_results"],
+                top_k=settings.top_k_rerank
+            )
+            stats = {
+                "candidates": len(state["fused_results"]),
+                "pairs_scored": len(state["fused_results"]),
+                "stop_reason": "disabled"
+            }
+        
+        _record_rerank_stats(stats)
         
         state["reranked_results"] = reranked
         
@@ -142,13 +364,40 @@ async def rerank_node(state: QueryState) -> QueryState:
         logger.error(f"Error in reranking: {e}")
         state["error"] = str(e)
         # Fallback: use fused results
-        state["reranked_results"] = state["fused_results"][:settings.top_k_rerank]
+        state["reranked_results"] = _rrf_order(state)
     
     return state
 
 
+def _source_metadata(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Chunk metadata for the sources response, with the structured rows of
+    CSV/Excel chunks rebuilt from the table store (one read per table).
+    """
+    metadatas = [chunk.get("metadata", {}) for chunk in chunks]
+    wanted: Dict[str, List[int]] = {}
+    for metadata in metadatas:
+        if "table_id" in metadata and "row_index" in metadata and "structured_data" not in metadata:
+            wanted.setdefault(metadata["table_id"], []).append(metadata["row_index"])
+    if not wanted:
+        return metadatas
+    
+    store = get_table_store()
+    rows = {table_id: store.rows(table_id, indices) for table_id, indices in wanted.items()}
+    return [
+        {**metadata, "structured_data": rows[metadata["table_id"]].get(metadata["row_index"])}
+        if metadata.get("table_id") in rows and "row_index" in metadata and "structured_data" not in metadata
+        else metadata
+        for metadata in metadatas
+    ]
+
+
 async def generate_node(state: QueryState) -> QueryState:
     """Generate answer using LLM."""
+    if state["started"] is not None:
+        # Load signal for degradation tiers (LLM time excluded)
+        record_retrieval_latency(time.monotonic() - state["started"])
+    
     try:
         llm_client = get_llm_client()
         
@@ -158,20 +407,41 @@ async def generate_node(state: QueryState) -> QueryState:
             state["answer"] = "I don't have enough information to answer this accurately based on the available documents."
             state["sources"] = []
             return state
-
+        
+        context_chunks = state["reranked_results"]
+        if state["degradation_tier"] >= DEGRADE_TRIM_CONTEXT:
+            # Fewer, shorter chunks (sources are numbered to match)
+            state["reranked_results"] = state["reranked_results"][:settings.degraded_context_chunks]
+            context_chunks = [
+                {**chunk, "content": chunk.get("content", "")[:settings.degraded_chunk_chars]}
+                for chunk in state["reranked_results"]
+            ]
+        
+        # Shared spans and less relevant sentences are cut to the token budget
+        if settings.context_packing:
+            context_chunks = pack_context(state["query"], context_chunks)
+        
+        # The answer must fit in the time left
+        left = remaining(state["deadline"])
+        if left <= 0:
+            raise DeadlineExceeded("Request deadline exceeded before generation")
+        max_tokens = min(settings.llm_max_tokens, max(_MIN_ANSWER_TOKENS, int(left * settings.llm_tokens_per_second)))
+        
         answer = await llm_client.generate_answer(
             query=state["original_query"],
-            context_chunks=state["reranked_results"],
+            context_chunks=context_chunks,
             language=state["detected_language"],
-            deterministic=state["deterministic"]
+            deterministic=state["deterministic"],
+            max_tokens=max_tokens,
+            timeout=left
         )
         
         state["answer"] = answer
         
-        # Build sources list
+        # Build sources list (structured rows are read from Parquet off the event loop)
+        metadatas = await asyncio.to_thread(_source_metadata, state["reranked_results"])
         sources = []
-        for i, chunk in enumerate(state["reranked_results"], 1):
-            metadata = chunk.get("metadata", {})
+        for i, (chunk, metadata) in enumerate(zip(state["reranked_results"], metadatas), 1):
             sources.append({
                 "source_id": i,
                 "document": metadata.get("document", "Unknown"),
@@ -185,7 +455,11 @@ async def generate_node(state: QueryState) -> QueryState:
         
         logger.info("Answer generated successfully")
         
+    except (OverloadedError, DeadlineExceeded):
+        raise
     except Exception as e:
+        if isinstance(e, asyncio.TimeoutError) and remaining(state["deadline"]) <= 0:
+            raise DeadlineExceeded("Request deadline exceeded during generation") from e
         logger.error(f"Error in generation: {e}")
         state["error"] = str(e)
         state["answer"] = "Error generating answer. Please try again."
@@ -202,7 +476,9 @@ def build_query_graph():
     
     # Add nodes
     workflow.add_node("detect_language", detect_language_node)
+    workflow.add_node("faq", faq_node)
     workflow.add_node("translate", translate_node)
+    workflow.add_node("analytics", analytics_node)
     workflow.add_node("retrieve", retrieve_node)
     workflow.add_node("fusion", fusion_node)
     workflow.add_node("rerank", rerank_node)
@@ -210,8 +486,22 @@ def build_query_graph():
     
     # Add edges
     workflow.set_entry_point("detect_language")
-    workflow.add_edge("detect_language", "translate")
-    workflow.add_edge("translate", "retrieve")
+    workflow.add_edge("detect_language", "faq")
+    workflow.add_conditional_edges(
+        "faq",
+        route_after_faq,
+        {"answered": END, "translate": "translate"}
+    )
+    workflow.add_conditional_edges(
+        "translate",
+        route_after_translate,
+        {"analytics": "analytics", "retrieve": "retrieve"}
+    )
+    workflow.add_conditional_edges(
+        "analytics",
+        route_after_analytics,
+        {"generate": "generate", "retrieve": "retrieve"}
+    )
     workflow.add_edge("retrieve", "fusion")
     workflow.add_edge("fusion", "rerank")
     workflow.add_edge("rerank", "generate")
@@ -224,48 +514,272 @@ def build_query_graph():
 _graph = None
 
 
+def _initial_state(
+    query: str,
+    deterministic: bool,
+    language_override: Optional[str],
+    filters: Optional[Dict[str, Any]],
+    tier: int,
+    deadline: float,
+    started: Optional[float] = None
+) -> QueryState:
+    return {
+        "query": query,
+        "original_query": query,
+        "detected_language": "en",
+        "language_override": language_override,
+        "deterministic": deterministic,
+        "filters": filters,
+        "translated_query": None,
+        "query_embedding": None,
+        "faq_id": None,
+        "dense_results": [],
+        "sparse_results": [],
+        "fused_results": [],
+        "reranked_results": [],
+        "table_results": [],
+        "answer": "",
+        "sources": [],
+        "error": None,
+        "degradation_tier": tier,
+        "deadline": deadline,
+        "started": started
+    }
+
+
+def _query_result(state: QueryState) -> Dict[str, Any]:
+    return {
+        "answer": state["answer"],
+        "sources": state["sources"],
+        "detected_language": state["detected_language"],
+        "degradation_tier": state["degradation_tier"],
+        "faq_id": state["faq_id"]
+    }
+
+
 async def execute_query_graph(
     query: str,
     deterministic: bool = False,
-    language_override: Optional[str] = None
+    language_override: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    tier: Optional[int] = None,
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Execute query through LangGraph pipeline.
     
+    English queries without filters that match a curated FAQ question
+    (exactly, or within FAQ_MIN_SIMILARITY) return its answer right after
+    language detection, without retrieval or an LLM call.
+    
+    Under load, optional work is shed by degradation tier (each tier
+    includes the ones below): 1 skips translation, 2 skips cross-encoder
+    reranking in favour of RRF order, 3 retrieves fewer candidates and 4
+    sends fewer, shorter chunks to the LLM.
+    
+    Every node also sees the request deadline: translation and reranking
+    are skipped once no more than DEADLINE_LLM_RESERVE_SECONDS is left
+    (fewer candidates are retrieved below twice that), the reranking budget
+    shrinks to the spare time, and the answer's max_tokens and the LLM
+    timeout are capped to the remaining time.
+    
     Args:
         query: User query
         deterministic: Use deterministic mode
         language_override: Override detected language
+        filters: Metadata filters for retrieval ({field: [values]})
+        tier: Degradation tier (default: chosen from current load)
+        deadline: Absolute time.monotonic() deadline (default: QUERY_TIMEOUT_SECONDS from now)
     
     Returns:
-        Dictionary with answer, sources, detected_language
+        Dictionary with answer, sources, detected_language, degradation_tier,
+        faq_id
+    
+    Raises:
+        DeadlineExceeded: No time was left to generate the answer
     """
     global _graph
     if _graph is None:
         _graph = build_query_graph()
     
+    if deadline is None:
+        deadline = new_deadline()
+    if tier is None:
+        tier = degradation_tier()
+    get_metrics().increment(f"degradation.tier.{tier}")
+    if tier:
+        logger.info(f"Serving query at degradation tier {tier}")
+    
     # Initialize state
-    initial_state: QueryState = {
-        "query": query,
-        "original_query": query,
-        "detected_language": "en",
-        "language_override": language_override,
-        "deterministic": deterministic,
-        "translated_query": None,
-        "dense_results": [],
-        "sparse_results": [],
-        "fused_results": [],
-        "reranked_results": [],
-        "answer": "",
-        "sources": [],
-        "error": None
-    }
+    initial_state = _initial_state(
+        query, deterministic, language_override, filters, tier, deadline, started=time.monotonic()
+    )
     
     # Execute graph
     final_state = await _graph.ainvoke(initial_state)
     
-    return {
-        "answer": final_state["answer"],
-        "sources": final_state["sources"],
-        "detected_language": final_state["detected_language"]
-    }
+    return _query_result(final_state)
+
+
+async def _retrieve_batch(states: List[QueryState]):
+    """Batched retrieve_node: one encode call and multi-row searches for all states."""
+    try:
+        results = await get_retriever().retrieve_hybrid_batch(
+            queries=[state["query"] for state in states],
+            top_k=_retrieval_top_k(states[0]),
+            filters=[state.get("filters") for state in states],
+            query_embeddings=[state.get("query_embedding") for state in states]
+        )
+    except OverloadedError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch retrieval: {e}")
+        results = [{"dense_results": [], "sparse_results": []} for _ in states]
+        for state in states:
+            state["error"] = str(e)
+    
+    for state, state_results in zip(states, results):
+        state["dense_results"] = state_results["dense_results"]
+        state["sparse_results"] = state_results["sparse_results"]
+    
+    logger.info(f"Batch retrieved for {len(states)} queries")
+
+
+async def _rerank_batch(states: List[QueryState]):
+    """Batched rerank_node: one cross-encoder call over the pairs of all states."""
+    states = [state for state in states if not _skip_rerank(state)]
+    if not states:
+        return
+    
+    try:
+        reranked, stats = await get_reranker().rerank_batch(
+            queries=[state["original_query"] for state in states],
+            results=[state["fused_results"] for state in states],
+            top_k=settings.top_k_rerank,
+            retrieval_queries=[state["query"] for state in states]
+        )
+    except Exception as e:
+        logger.error(f"Error in batch reranking: {e}")
+        for state in states:
+            state["error"] = str(e)
+            state["reranked_results"] = _rrf_order(state)
+        return
+    
+    for state, state_reranked, state_stats in zip(states, reranked, stats):
+        _record_rerank_stats(state_stats)
+        state["reranked_results"] = state_reranked
+
+
+async def _execute_batch_stage(
+    states: List[QueryState],
+    offset: int,
+    generation_slots: asyncio.Semaphore
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+    """Run one stage-sized slice of a batch; yields results as answers complete."""
+    for state in states:
+        await detect_language_node(state)
+    
+    # Known questions are answered from the FAQ sets, sharing one encode call
+    eligible = [state for state in states if _faq_eligible(state)]
+    if eligible:
+        try:
+            for state, match in zip(eligible, await _match_faq(eligible)):
+                if match is not None:
+                    _answer_from_faq(state, *match)
+        except Exception as e:
+            # Unmatched queries still go through retrieval
+            logger.error(f"Error in batch FAQ lookup: {e}")
+    pending = [state for state in states if not state["faq_id"]]
+    
+    await asyncio.gather(*(translate_node(state) for state in pending))
+    
+    # Aggregate questions go to table analytics first, as in the graph
+    for state in pending:
+        if route_after_translate(state) == "analytics":
+            await analytics_node(state)
+    
+    to_retrieve = [state for state in pending if not state["table_results"]]
+    rejected: Optional[OverloadedError] = None
+    if to_retrieve:
+        try:
+            await _retrieve_batch(to_retrieve)
+            for state in to_retrieve:
+                await fusion_node(state)
+            await _rerank_batch(to_retrieve)
+        except OverloadedError as e:
+            # Queries needing retrieval fail together; table answers go on
+            logger.warning(f"Batch retrieval rejected: {e}")
+            rejected = e
+    failed = {id(state) for state in to_retrieve} if rejected else set()
+    
+    async def generate(index: int, state: QueryState) -> Tuple[int, Union[Dict[str, Any], Exception]]:
+        if id(state) in failed:
+            return index, rejected
+        if state["faq_id"]:
+            return index, _query_result(state)
+        async with generation_slots:
+            try:
+                return index, _query_result(await generate_node(state))
+            except (OverloadedError, DeadlineExceeded) as e:
+                return index, e
+    
+    tasks = [asyncio.ensure_future(generate(offset + i, state)) for i, state in enumerate(states)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def execute_query_batch(
+    queries: List[Dict[str, Any]],
+    tier: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+    """
+    Execute a batch of queries, sharing model calls across them.
+    
+    The graph's nodes run stage by stage over BATCH_STAGE_SIZE queries at a
+    time: language detection, one FAQ match over all of them, translation
+    and table analytics per query, then one encode call and multi-row FAISS searches for all of them, BM25
+    scoring in one worker thread hop, and one cross-encoder predict over
+    all query-chunk pairs. Answers are generated with at most
+    BATCH_LLM_CONCURRENCY LLM calls in flight and yielded as they complete.
+    
+    Args:
+        queries: Arguments of execute_query_graph per query (query,
+            deterministic, language_override, filters)
+        tier: Degradation tier of the whole batch (default: chosen from current load)
+        deadline: Absolute time.monotonic() deadline of the batch
+            (default: BATCH_TIMEOUT_SECONDS from now)
+    
+    Yields:
+        (position of the query in the batch, result as returned by
+        execute_query_graph, or the OverloadedError/DeadlineExceeded that
+        failed it)
+    """
+    if deadline is None:
+        deadline = new_deadline(settings.batch_timeout_seconds)
+    if tier is None:
+        tier = degradation_tier()
+    get_metrics().increment(f"degradation.tier.{tier}", len(queries))
+    logger.info(f"Executing batch of {len(queries)} queries at degradation tier {tier}")
+    
+    states = [
+        _initial_state(
+            query["query"],
+            query.get("deterministic", False),
+            query.get("language_override"),
+            query.get("filters"),
+            tier,
+            deadline
+        )
+        for query in queries
+    ]
+    
+    generation_slots = asyncio.Semaphore(max(settings.batch_llm_concurrency, 1))
+    stage_size = max(settings.batch_stage_size, 1)
+    for start in range(0, len(states), stage_size):
+        async for item in _execute_batch_stage(states[start:start + stage_size], start, generation_slots):
+            yield item
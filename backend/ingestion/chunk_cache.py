@@ -0,0 +1,172 @@
+"""
+Per-document cache of parsed chunks and their embeddings.
+Lets reindexing skip parsing and embedding for unchanged source files.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from backend.config import settings
+from backend.ingestion.chunker import chunker_signature
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(file_path: str) -> Dict[str, Any]:
+    """
+    Fingerprint a source file by size, mtime and content hash.
+    
+    Args:
+        file_path: Path to file
+    
+    Returns:
+        Dictionary with size, mtime and sha256
+    """
+    stat = os.stat(file_path)
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": _sha256(file_path)
+    }
+
+
+def fingerprint_matches(stored: Optional[Dict[str, Any]], file_path: str) -> bool:
+    """
+    Check whether a file still matches its stored fingerprint.
+    
+    Size and mtime are compared first; the content hash is only computed
+    when the size is equal but the mtime moved (e.g. the file was touched).
+    
+    Args:
+        stored: Fingerprint recorded at ingestion (may be None)
+        file_path: Path to file
+    
+    Returns:
+        True if the file content is unchanged
+    """
+    if not stored:
+        return False
+    
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+    
+    if stat.st_size != stored.get("size"):
+        return False
+    
+    if stat.st_mtime == stored.get("mtime"):
+        return True
+    
+    return _sha256(file_path) == stored.get("sha256")
+
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkCache:
+    """
+    On-disk cache of chunks and embeddings, one compressed file per document.
+    """
+    
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Initialize chunk cache.
+        
+        Args:
+            cache_path: Cache directory (default: settings.chunk_cache_path)
+        """
+        self.cache_path = cache_path or settings.chunk_cache_path
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+    
+    def _file(self, document_id: str) -> Path:
+        return self.cache_path / f"{document_id}.pkl.gz"
+    
+    def save(
+        self,
+        document_id: str,
+        fingerprint: Dict[str, Any],
+        chunks: List[Dict[str, Any]],
+        embeddings: np.ndarray
+    ):
+        """
+        Cache a document's chunks and embeddings.
+        
+        Args:
+            document_id: Document ID
+            fingerprint: Source file fingerprint at parse time
+            chunks: Parsed chunks (with chunk IDs and metadata)
+            embeddings: Embedding matrix aligned with chunks
+        """
+        entry = {
+            "fingerprint": fingerprint,
+            "embedding_model": settings.embedding_model,
+            "chunker": chunker_signature(),
+            "chunks": chunks,
+            "embeddings": np.asarray(embeddings, dtype="float32")
+        }
+        
+        tmp_file = self._file(document_id).with_suffix(".tmp")
+        with gzip.open(tmp_file, "wb", compresslevel=3) as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self._file(document_id))
+    
+    def load(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Load a cached document entry, or None if missing/unreadable."""
+        cache_file = self._file(document_id)
+        if not cache_file.exists():
+            return None
+        
+        try:
+            with gzip.open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable chunk cache {cache_file.name}: {e}")
+            return None
+    
+    def get_valid(
+        self,
+        document_id: str,
+        file_path: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Get cached chunks and embeddings if the source file is unchanged.
+        
+        Chunks are only returned if they were cut with the current chunking
+        configuration, and embeddings only if they were produced by the
+        current embedding model.
+        
+        Returns:
+            (chunks, embeddings); either may be None
+        """
+        entry = self.load(document_id)
+        if entry is None or not fingerprint_matches(entry.get("fingerprint"), file_path):
+            return None, None
+        if entry.get("chunker") != chunker_signature():
+            return None, None
+        
+        embeddings = entry.get("embeddings")
+        if entry.get("embedding_model") != settings.embedding_model:
+            embeddings = None
+        
+        return entry["chunks"], embeddings
+    
+    def delete(self, document_id: str):
+        """Remove a document's cache entry."""
+        self._file(document_id).unlink(missing_ok=True)
+    
+    def document_ids(self) -> List[str]:
+        """List document IDs with a cache entry."""
+        return [p.name[:-len(".pkl.gz")] for p in self.cache_path.glob("*.pkl.gz")]
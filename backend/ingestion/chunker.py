@@ -0,0 +1,288 @@
+"""
+Structure-aware text chunking sized with the embedding model's tokenizer.
+
+Text is split into sections at headings (markdown, numbered, ALL CAPS or
+"Title:" lines in plain text; heading styles in DOCX; h1-h6 in HTML) and
+into sentences within each section. Sentences are packed into chunks of
+at most CHUNK_MAX_TOKENS tokens, counted with the embedding model's own
+tokenizer including its special tokens, so no chunk is truncated when
+it is embedded. Chunks never cross a heading, carry their section title
+in metadata["section"], and consecutive chunks of a section share only
+whole trailing sentences of up to CHUNK_OVERLAP_TOKENS tokens.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+import re
+from functools import lru_cache
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends (Latin punctuation, Devanagari danda) not followed by a
+# lowercase word or number, which would mark an abbreviation ("Rs. 10", "e.g. the")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?\u0964\u0965])\s+(?=[\"'(\[]*[^\sa-z0-9])")
+
+_MARKDOWN_HEADING_RE = re.compile(r"^#{1,6}\s+(.+?)\s*#*$")
+_NUMBERED_HEADING_RE = re.compile(
+    r"^(?:(?:Chapter|CHAPTER|Section|SECTION|Part|PART|Annexure|ANNEXURE|Appendix|APPENDIX|Schedule|SCHEDULE)"
+    r"\s+[\w.-]+|\d+(?:\.\d+)+\.?)\s+[^\sa-z]"
+)
+
+# "1." or "IV." in front of a title; could also be a numbered list item
+_LIST_NUMBER_RE = re.compile(r"^(?:\d+|[IVXLC]+)\.?\s+(?=[^\sa-z])")
+
+# Words left lowercase in title-case headings
+_TITLE_SMALL_WORDS = {
+    "a", "an", "the", "and", "or", "nor", "but", "of", "for", "to", "in", "on", "at", "by", "with",
+    "from", "as", "under", "into", "per", "via", "vs"
+}
+
+# Section number in front of a heading ("3.2", "IV.")
+_LEADING_NUMBER_RE = re.compile(r"^(?:\d+(?:\.\d+)*|[IVXLC]+)\.?\s+")
+
+# A line not ending like this continues onto the next line (wrapped text)
+_LINE_END_RE = re.compile(r"[.!?:;\u0964\u0965]$")
+
+# Lines longer than this are never headings
+_MAX_HEADING_WORDS = 8
+
+# Section titles are cut to this length in metadata
+_MAX_SECTION_CHARS = 200
+
+# Special tokens assumed when the tokenizer is unavailable (<s> ... </s>)
+_DEFAULT_SPECIAL_TOKENS = 2
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    """
+    Tokenizer of the embedding model (None if it cannot be loaded).
+    
+    Without it, token counts are estimated conservatively from the UTF-8
+    length, so chunks still fit but are shorter than they could be.
+    """
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(settings.embedding_model)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer of {settings.embedding_model}, estimating chunk lengths: {e}")
+        return None
+
+
+def chunker_signature() -> str:
+    """Identifies the chunking configuration (chunks cached under another one are re-parsed)."""
+    return f"sentences-v2:{settings.embedding_model}:{settings.chunk_max_tokens}:{settings.chunk_overlap_tokens}"
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a paragraph into sentences."""
+    return [sentence for sentence in _SENTENCE_END_RE.split(text.strip()) if sentence]
+
+
+def _is_title_case(title: str) -> bool:
+    """Whether every word but small words is capitalized, with at least one such word."""
+    words = [word for word in title.split() if any(c.isalpha() for c in word)]
+    content = [word for word in words if word.lower() not in _TITLE_SMALL_WORDS]
+    return bool(content) and all(not word[0].isalpha() or word[0].isupper() for word in content)
+
+
+def heading_text(line: str) -> Optional[str]:
+    """
+    Title of a plain-text line that looks like a heading.
+    
+    Markdown headings, section-numbered headings ("3.2 Eligibility",
+    "CHAPTER IV Incentives"), title-case lines numbered like list items
+    ("1. Eligibility Criteria", but not "1. The"), short ALL CAPS lines
+    without numbers (running page headers have them) and short capitalized
+    lines ending in a colon count; anything ending like a sentence does not.
+    
+    Returns:
+        Heading title, or None if the line is body text
+    """
+    match = _MARKDOWN_HEADING_RE.match(line)
+    if match:
+        return match.group(1)
+    
+    words = line.split()
+    if len(words) > _MAX_HEADING_WORDS or line.endswith((".", ",", ";")):
+        return None
+    if line.endswith(":"):
+        return line[:-1].strip() if line[0].isupper() and len(line) > 1 else None
+    if _NUMBERED_HEADING_RE.match(line):
+        return line
+    list_number = _LIST_NUMBER_RE.match(line)
+    if list_number and _is_title_case(line[list_number.end():]):
+        return line
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) >= 3 and line.upper() == line and any(c.isupper() for c in letters):
+        title = _LEADING_NUMBER_RE.sub("", line)
+        return None if any(c.isdigit() for c in title) else line
+    return None
+
+
+def split_blocks(text: str) -> List[Tuple[str, str]]:
+    """
+    Split plain text into headings and paragraphs.
+    
+    Blank lines end a paragraph; single line breaks (PDF line wraps) do
+    not, and a line continuing an unfinished sentence is never a heading.
+    
+    Returns:
+        ("heading", title) and ("text", paragraph) blocks in order
+    """
+    blocks = []
+    paragraph: List[str] = []
+    wrapped = False  # The previous line continues onto this one
+    previous_heading = False
+    
+    def flush():
+        if paragraph:
+            blocks.append(("text", " ".join(paragraph)))
+            paragraph.clear()
+    
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            flush()
+            wrapped = previous_heading = False
+            continue
+        title = None if wrapped else heading_text(line)
+        if title and previous_heading and not _LEADING_NUMBER_RE.match(title):
+            # A heading wrapped over several lines ("CHAPTER II" / "RATES OF INCOME-TAX")
+            blocks[-1] = ("heading", f"{blocks[-1][1]} {title}")
+        elif title:
+            flush()
+            blocks.append(("heading", title))
+        else:
+            paragraph.append(line)
+        wrapped = not title and not _LINE_END_RE.search(line)
+        previous_heading = bool(title)
+    flush()
+    return blocks
+
+
+class TextChunker:
+    """
+    Packs the sentences of one document into token-limited chunks.
+    
+    The current section carries over between calls, so a document can be
+    chunked page by page.
+    """
+    
+    def __init__(self, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None):
+        """
+        Initialize text chunker.
+        
+        Args:
+            max_tokens: Maximum chunk length in tokens, special tokens
+                included (default: settings.chunk_max_tokens)
+            overlap_tokens: Maximum tokens of whole sentences repeated from
+                the previous chunk (default: settings.chunk_overlap_tokens)
+        """
+        self.tokenizer = get_tokenizer()
+        special = (
+            self.tokenizer.num_special_tokens_to_add(pair=False)
+            if self.tokenizer is not None else _DEFAULT_SPECIAL_TOKENS
+        )
+        self.budget = max((max_tokens or settings.chunk_max_tokens) - special, 1)
+        self.overlap_tokens = settings.chunk_overlap_tokens if overlap_tokens is None else overlap_tokens
+        self.section: Optional[str] = None
+        self._sentences: List[Tuple[str, int]] = []
+        self._tokens = 0
+        self._carried = 0  # Leading sentences repeated from the previous chunk
+    
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token counts of texts, without special tokens."""
+        if not texts:
+            return []
+        if self.tokenizer is None:
+            # About three UTF-8 bytes per token or fewer for the supported scripts
+            return [math.ceil(len(text.encode("utf-8")) / 3) for text in texts]
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+    
+    def chunk_text(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Chunk plain text (a page or a whole file).
+        
+        Returns:
+            Chunks as {"content", "section"}; section is None before the
+            first heading
+        """
+        return self.chunk_blocks(split_blocks(text))
+    
+    def chunk_blocks(self, blocks: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Chunk headings and paragraphs.
+        
+        Args:
+            blocks: ("heading", title) and ("text", paragraph) pairs in order
+        
+        Returns:
+            Chunks as {"content", "section"}
+        """
+        chunks: List[Dict[str, Any]] = []
+        for kind, text in blocks:
+            if kind == "heading":
+                self._flush(chunks)
+                self.section = " ".join(text.split())[:_MAX_SECTION_CHARS] or None
+                continue
+            
+            sentences = split_sentences(text)
+            for sentence, count in zip(sentences, self.count_tokens(sentences)):
+                if count > self.budget:
+                    for piece, piece_count in self._split_long(sentence):
+                        self._add(piece, piece_count, chunks)
+                else:
+                    self._add(sentence, count, chunks)
+        
+        # Chunks do not continue across calls (pages)
+        self._flush(chunks)
+        return chunks
+    
+    def _split_long(self, sentence: str) -> List[Tuple[str, int]]:
+        """Cut a sentence longer than the budget at word boundaries."""
+        words = sentence.split()
+        pieces = []
+        piece: List[str] = []
+        tokens = 0
+        for word, count in zip(words, self.count_tokens(words)):
+            if piece and tokens + count > self.budget:
+                pieces.append((" ".join(piece), tokens))
+                piece, tokens = [], 0
+            piece.append(word)
+            tokens += count
+        if piece:
+            pieces.append((" ".join(piece), tokens))
+        return pieces
+    
+    def _add(self, sentence: str, count: int, chunks: List[Dict[str, Any]]):
+        if self._tokens + count > self.budget and len(self._sentences) > self._carried:
+            self._emit(chunks)
+            
+            # Repeat the trailing sentences that fit in the overlap
+            carried: List[Tuple[str, int]] = []
+            tokens = 0
+            for previous, previous_count in reversed(self._sentences):
+                if tokens + previous_count > self.overlap_tokens or tokens + previous_count + count > self.budget:
+                    break
+                carried.insert(0, (previous, previous_count))
+                tokens += previous_count
+            self._sentences, self._tokens, self._carried = carried, tokens, len(carried)
+        
+        self._sentences.append((sentence, count))
+        self._tokens += count
+    
+    def _emit(self, chunks: List[Dict[str, Any]]):
+        chunks.append({
+            "content": " ".join(sentence for sentence, _ in self._sentences),
+            "section": self.section
+        })
+    
+    def _flush(self, chunks: List[Dict[str, Any]]):
+        if len(self._sentences) > self._carried:
+            self._emit(chunks)
+        self._sentences, self._tokens, self._carried = [], 0, 0
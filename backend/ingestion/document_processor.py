@@ -2,63 +2,87 @@
 Document processor for unstructured data (PDF, DOCX, TXT).
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from pathlib import Path
 import PyPDF2
 import pdfplumber
 from docx import Document as DocxDocument
 
+from backend.ingestion.chunker import TextChunker
+from backend.ingestion.progress import JobProgress, JobCancelled, NullProgress
+
 logger = logging.getLogger(__name__)
 
 
 class DocumentProcessor:
     """Process unstructured documents into chunks."""
     
-    def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50):
+    def __init__(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
         """
         Initialize document processor.
         
         Args:
-            chunk_size: Target chunk size in tokens (approximate)
-            chunk_overlap: Overlap between chunks in tokens
+            chunk_size: Maximum chunk size in embedding model tokens
+                (default: settings.chunk_max_tokens)
+            chunk_overlap: Maximum overlap between chunks in tokens, as whole
+                sentences (default: settings.chunk_overlap_tokens)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
     
-    def process_pdf(self, file_path: str) -> List[Dict[str, Any]]:
+    def _chunker(self) -> TextChunker:
+        """Chunker for one document (tracks its current section)."""
+        return TextChunker(self.chunk_size, self.chunk_overlap)
+    
+    @staticmethod
+    def _make_chunks(pieces: List[Dict[str, Any]], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Chunks with metadata from chunker output (section added where known)."""
+        chunks = []
+        for piece in pieces:
+            chunk_metadata = dict(metadata)
+            if piece["section"]:
+                chunk_metadata["section"] = piece["section"]
+            chunks.append({"content": piece["content"], "metadata": chunk_metadata})
+        return chunks
+    
+    def process_pdf(self, file_path: str, progress: Optional[JobProgress] = None) -> List[Dict[str, Any]]:
         """
         Process PDF file.
         
         Args:
             file_path: Path to PDF file
+            progress: Optional progress handle (pages parsed, cancellation)
         
         Returns:
             List of chunks with metadata
         """
+        progress = progress or NullProgress()
         chunks = []
         
         try:
             # Try pdfplumber first (better for tables)
             with pdfplumber.open(file_path) as pdf:
+                progress.add_pages_total(len(pdf.pages))
+                chunker = self._chunker()
                 for page_num, page in enumerate(pdf.pages, 1):
+                    progress.check_cancelled()
                     text = page.extract_text()
                     
                     if text:
-                        page_chunks = self._chunk_text(text)
-                        
-                        for chunk_text in page_chunks:
-                            chunks.append({
-                                "content": chunk_text,
-                                "metadata": {
-                                    "document": Path(file_path).name,
-                                    "page": page_num,
-                                    "type": "pdf"
-                                }
-                            })
+                        chunks.extend(self._make_chunks(chunker.chunk_text(text), {
+                            "document": Path(file_path).name,
+                            "page": page_num,
+                            "type": "pdf"
+                        }))
+                    
+                    progress.page_parsed()
             
             logger.info(f"Processed PDF: {len(chunks)} chunks from {file_path}")
             
+        except JobCancelled:
+            raise
+        
         except Exception as e:
             logger.error(f"Error processing PDF with pdfplumber: {e}")
             
@@ -66,25 +90,24 @@ class DocumentProcessor:
             try:
                 with open(file_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
+                    chunker = self._chunker()
                     
                     for page_num, page in enumerate(pdf_reader.pages, 1):
+                        progress.check_cancelled()
                         text = page.extract_text()
                         
                         if text:
-                            page_chunks = self._chunk_text(text)
-                            
-                            for chunk_text in page_chunks:
-                                chunks.append({
-                                    "content": chunk_text,
-                                    "metadata": {
-                                        "document": Path(file_path).name,
-                                        "page": page_num,
-                                        "type": "pdf"
-                                    }
-                                })
+                            chunks.extend(self._make_chunks(chunker.chunk_text(text), {
+                                "document": Path(file_path).name,
+                                "page": page_num,
+                                "type": "pdf"
+                            }))
                 
                 logger.info(f"Processed PDF with PyPDF2: {len(chunks)} chunks")
                 
+            except JobCancelled:
+                raise
+            
             except Exception as e2:
                 logger.error(f"Error processing PDF with PyPDF2: {e2}")
         
@@ -105,18 +128,19 @@ class DocumentProcessor:
         try:
             doc = DocxDocument(file_path)
             
-            full_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
+            # Heading styles mark sections; each paragraph is its own block
+            blocks: List[Tuple[str, str]] = []
+            for para in doc.paragraphs:
+                if not para.text.strip():
+                    continue
+                style = para.style.name if para.style is not None else ""
+                kind = "heading" if style.startswith("Heading") or style == "Title" else "text"
+                blocks.append((kind, para.text))
             
-            text_chunks = self._chunk_text(full_text)
-            
-            for chunk_text in text_chunks:
-                chunks.append({
-                    "content": chunk_text,
-                    "metadata": {
-                        "document": Path(file_path).name,
-                        "type": "docx"
-                    }
-                })
+            chunks = self._make_chunks(self._chunker().chunk_blocks(blocks), {
+                "document": Path(file_path).name,
+                "type": "docx"
+            })
             
             logger.info(f"Processed DOCX: {len(chunks)} chunks from {file_path}")
             
@@ -141,16 +165,10 @@ class DocumentProcessor:
             with open(file_path, 'r', encoding='utf-8') as file:
                 text = file.read()
             
-            text_chunks = self._chunk_text(text)
-            
-            for chunk_text in text_chunks:
-                chunks.append({
-                    "content": chunk_text,
-                    "metadata": {
-                        "document": Path(file_path).name,
-                        "type": "txt"
-                    }
-                })
+            chunks = self._make_chunks(self._chunker().chunk_text(text), {
+                "document": Path(file_path).name,
+                "type": "txt"
+            })
             
             logger.info(f"Processed TXT: {len(chunks)} chunks from {file_path}")
             
@@ -159,44 +177,25 @@ class DocumentProcessor:
         
         return chunks
     
-    def _chunk_text(self, text: str) -> List[str]:
-        """
-        Chunk text into smaller pieces with overlap.
-        
-        Args:
-            text: Input text
-        
-        Returns:
-            List of text chunks
-        """
-        # Simple word-based chunking (approximate tokens)
-        words = text.split()
-        chunks = []
-        
-        i = 0
-        while i < len(words):
-            chunk_words = words[i:i + self.chunk_size]
-            chunk_text = " ".join(chunk_words)
-            chunks.append(chunk_text)
-            
-            # Move forward with overlap
-            i += self.chunk_size - self.chunk_overlap
-        
-        return chunks
-    
-    def process_document(self, file_path: str, document_type: str) -> List[Dict[str, Any]]:
+    def process_document(
+        self,
+        file_path: str,
+        document_type: str,
+        progress: Optional[JobProgress] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process document based on type.
         
         Args:
             file_path: Path to document
             document_type: Type (pdf, docx, txt)
+            progress: Optional progress handle (pages parsed, cancellation)
         
         Returns:
             List of chunks with metadata
         """
         if document_type == "pdf":
-            return self.process_pdf(file_path)
+            return self.process_pdf(file_path, progress)
         elif document_type == "docx":
             return self.process_docx(file_path)
         elif document_type == "txt":
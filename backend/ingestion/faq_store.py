@@ -0,0 +1,257 @@
+"""
+FAQ index over the question side of curated Q&A sets.
+
+Q&A sets (JSON/JSONL records with question/answer or term/definition, or
+CSV files with question and answer columns) get their questions embedded
+at ingest time, one file per document. At query time a question that is
+known verbatim (after normalization) or embeds within FAQ_MIN_SIMILARITY
+of a known question is answered with the curated answer, skipping
+retrieval, reranking and the LLM.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import csv
+import logging
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from backend.config import settings
+from backend.ingestion.stream_readers import iter_json_records
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# Column/field names of the two sides of a Q&A record
+_QUESTION_FIELDS = ("question", "term")
+_ANSWER_FIELDS = ("answer", "definition")
+
+
+def normalize_question(text: str) -> str:
+    """Exact-match key of a question: case-folded words, punctuation dropped."""
+    return _NON_WORD_RE.sub(" ", text.casefold()).strip()
+
+
+def _qa_record(record: Dict[str, Any], position: int) -> Optional[Dict[str, Any]]:
+    fields = {str(key).strip().lower(): value for key, value in record.items()}
+    if fields.get("question") and fields.get("answer"):
+        question, answer = fields["question"], fields["answer"]
+    elif fields.get("term") and fields.get("definition"):
+        # Glossary entries are asked as "What is <term>?" (as in the benchmarks)
+        question, answer = f"What is {fields['term']}?", fields["definition"]
+    else:
+        return None
+    
+    metadata = fields.get("metadata") if isinstance(fields.get("metadata"), dict) else {}
+    return {
+        "faq_id": str(fields.get("id") or position),
+        "question": str(question).strip(),
+        "answer": str(answer).strip(),
+        "category": metadata.get("category") or fields.get("category")
+    }
+
+
+def read_qa_records(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Read the Q&A records of a curated set.
+    
+    Args:
+        file_path: .json (list of records), .jsonl or .csv file
+    
+    Returns:
+        Records with faq_id, question, answer and category; empty if the
+        file is not a Q&A set (judged by its first record or CSV header)
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in (".json", ".jsonl"):
+        return _collect_qa_records(iter_json_records(file_path))
+    if suffix != ".csv":
+        return []
+    
+    with open(file_path, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        header = {str(name).strip().lower() for name in reader.fieldnames or []}
+        if not any(q in header and a in header for q, a in zip(_QUESTION_FIELDS, _ANSWER_FIELDS)):
+            return []
+        return _collect_qa_records(reader, sniff=False)
+
+
+def _collect_qa_records(records: Iterable[Any], sniff: bool = True) -> List[Dict[str, Any]]:
+    qa_records = []
+    for position, record in enumerate(records):
+        qa_record = _qa_record(record, position) if isinstance(record, dict) else None
+        if qa_record is not None:
+            qa_records.append(qa_record)
+        elif sniff and position == 0:
+            return []  # Not a Q&A set: stop before reading a large dump
+    return qa_records
+
+
+def is_qa_set(file_path: str) -> bool:
+    """Whether a JSON/JSONL file holds Q&A records (judged by its first record)."""
+    records = iter_json_records(file_path)
+    try:
+        first = next(records, None)
+    except (OSError, ValueError):
+        return False
+    finally:
+        records.close()
+    return isinstance(first, dict) and _qa_record(first, 0) is not None
+
+
+class FAQStore:
+    """
+    Embedded FAQ questions, one pickle per source document.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Initialize FAQ store.
+        
+        Args:
+            root: FAQ directory (default: settings.faq_store_path)
+        """
+        self.root = root or settings.faq_store_path
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._exact: Dict[str, int] = {}
+        self._index: Optional[faiss.Index] = None
+    
+    def save_document(
+        self,
+        document_id: str,
+        file_path: str,
+        records: List[Dict[str, Any]],
+        encode: Callable[[List[str]], np.ndarray]
+    ) -> int:
+        """
+        Store the questions of a Q&A set, replacing an earlier version.
+        
+        Args:
+            document_id: Document ID
+            file_path: Source file (its name is cited in answers)
+            records: Q&A records from read_qa_records
+            encode: Normalized embeddings of a list of texts
+        
+        Returns:
+            Number of questions stored
+        """
+        entries = [
+            {**record, "document_id": document_id, "document": Path(file_path).name}
+            for record in records
+        ]
+        embeddings = np.asarray(encode([entry["question"] for entry in entries]), dtype="float32")
+        
+        data_file = self.root / f"{document_id}.pkl"
+        tmp_file = data_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"model": settings.embedding_model, "entries": entries, "embeddings": embeddings}, f)
+        os.replace(tmp_file, data_file)
+        
+        logger.info(f"Stored {len(entries)} FAQ questions for {Path(file_path).name}")
+        return len(entries)
+    
+    def delete_document(self, document_id: str):
+        """Remove the questions of a document."""
+        (self.root / f"{document_id}.pkl").unlink(missing_ok=True)
+    
+    def has_document(self, document_id: str) -> bool:
+        """Whether questions are stored for a document."""
+        return (self.root / f"{document_id}.pkl").exists()
+    
+    def document_ids(self) -> List[str]:
+        """IDs of documents with stored questions."""
+        return [path.stem for path in self.root.glob("*.pkl")]
+    
+    def _load(self):
+        """(Re)build the in-memory index when the directory changed."""
+        mtime = self.root.stat().st_mtime
+        if mtime == self._mtime:
+            return
+        
+        entries = []
+        embeddings = []
+        for path in sorted(self.root.glob("*.pkl")):
+            try:
+                with open(path, "rb") as f:
+                    data = pickle.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable FAQ file {path.name}: {e}")
+                continue
+            if data["model"] != settings.embedding_model:
+                logger.warning(f"Skipping FAQ file {path.name} embedded with {data['model']}; reindex to refresh it")
+                continue
+            entries.extend(data["entries"])
+            embeddings.append(data["embeddings"])
+        
+        index = None
+        if entries:
+            matrix = np.vstack(embeddings)
+            index = faiss.IndexFlatIP(matrix.shape[1])
+            index.add(matrix)
+        
+        self._entries = entries
+        self._exact = {normalize_question(entry["question"]): i for i, entry in enumerate(entries)}
+        self._index = index
+        self._mtime = mtime
+        logger.info(f"Loaded FAQ index with {len(entries)} questions")
+    
+    def size(self) -> int:
+        """Number of known questions (re-read when the store changes)."""
+        with self._lock:
+            self._load()
+            return len(self._entries)
+    
+    def lookup(self, query: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Exact match of a query against the known questions.
+        
+        Returns:
+            (FAQ entry, similarity 1.0), or None
+        """
+        with self._lock:
+            self._load()
+            position = self._exact.get(normalize_question(query))
+            return None if position is None else (self._entries[position], 1.0)
+    
+    def search(self, embedding: np.ndarray) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Nearest known question to a query embedding.
+        
+        Args:
+            embedding: Query embedding (normalized here)
+        
+        Returns:
+            (FAQ entry, cosine similarity) if at least settings.faq_min_similarity, else None
+        """
+        vector = np.asarray(embedding, dtype="float32").reshape(1, -1)
+        vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        with self._lock:
+            self._load()
+            if self._index is None or self._index.d != vector.shape[1]:
+                return None
+            similarities, positions = self._index.search(vector, 1)
+            similarity = float(similarities[0][0])
+            if similarity < settings.faq_min_similarity:
+                return None
+            return self._entries[int(positions[0][0])], similarity
+
+
+# Global FAQ store instance
+_faq_store: Optional[FAQStore] = None
+
+
+def get_faq_store() -> FAQStore:
+    """Get or create global FAQ store instance."""
+    global _faq_store
+    if _faq_store is None:
+        _faq_store = FAQStore()
+    return _faq_store
@@ -0,0 +1,300 @@
+"""
+Versioned on-disk index generations.
+
+Each build writes a complete generation (FAISS index, chunk metadata, BM25
+index, manifest) into a fresh directory under the FAISS index path. It is
+published by atomically replacing the CURRENT pointer file, so readers
+always see either the old or the new generation, never a partial one.
+
+Writers in all processes sharing the index directory (several uvicorn
+workers, CLI scripts) are serialized by a lock file, and a generation is
+only published if CURRENT still names the generation it was built from.
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+from backend.config import settings
+from backend.ingestion.tombstones import TombstoneStore
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "WRITE.lock"
+
+_GENERATION_RE = re.compile(r"^gen-(\d+)$")
+
+
+class StaleGenerationError(RuntimeError):
+    """
+    CURRENT changed while a generation was being written.
+    """
+
+
+class IndexWriteLock:
+    """
+    Serializes index writers (ingest, delete, compaction) across threads
+    and processes.
+    
+    An exclusive lock on LOCK_FILE in the index directory is held while
+    any thread of this process is inside the lock; it is reentrant within
+    a thread, so a writer may call another writer (e.g. a rebuild).
+    Readers never need it since generations are immutable once committed.
+    """
+    
+    def __init__(self):
+        """Initialize write lock."""
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+    
+    def __enter__(self) -> "IndexWriteLock":
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = self._lock_file()
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            file, self._file = self._file, None
+            try:
+                if os.name == "nt":
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            finally:
+                file.close()
+        self._lock.release()
+    
+    @staticmethod
+    def _lock_file():
+        """Open the lock file and wait for the exclusive lock on it."""
+        root = settings.faiss_index_path
+        root.mkdir(parents=True, exist_ok=True)
+        file = open(root / LOCK_FILE, "a+b")
+        try:
+            if os.name == "nt":
+                file.seek(0)
+                while True:
+                    try:
+                        # Gives up after about 10 s; keep waiting
+                        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+
+class IndexGeneration:
+    """
+    One committed (or in-progress) set of index files.
+    """
+    
+    def __init__(self, path: Path, name: str, bm25_file: Optional[Path] = None):
+        """
+        Initialize generation handle.
+        
+        Args:
+            path: Generation directory
+            name: Generation name (e.g. gen-000003, or "legacy")
+            bm25_file: BM25 pickle path (default: inside the generation directory)
+        """
+        self.path = path
+        self.name = name
+        self.faiss_file = path / "index.faiss"
+        self.metadata_file = path / "metadata.pkl"
+        self.bm25_file = bm25_file or path / "bm25.pkl"
+        self.filters_file = path / "filters.pkl"
+        self.terms_file = path / "terms.pkl"
+        self.manifest_file = path / MANIFEST_FILE
+        self.parent: Optional[str] = None  # CURRENT when created with IndexStore.create()
+    
+    def manifest(self) -> Dict[str, Any]:
+        """Read the generation manifest (empty for legacy indices)."""
+        if not self.manifest_file.exists():
+            return {}
+        with open(self.manifest_file, "r") as f:
+            return json.load(f)
+    
+    def tombstones(self) -> TombstoneStore:
+        """Tombstones recorded against this generation."""
+        return TombstoneStore(self.path)
+    
+    def size_bytes(self) -> int:
+        """Total size of the generation's files."""
+        files = [p for p in self.path.iterdir() if p.is_file()] if self.path.exists() else []
+        if self.bm25_file not in files and self.bm25_file.exists():
+            files.append(self.bm25_file)
+        return sum(p.stat().st_size for p in files)
+
+
+class IndexStore:
+    """
+    Manages index generations and the CURRENT pointer.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Initialize index store.
+        
+        Args:
+            root: Directory holding generations (default: settings.faiss_index_path)
+        """
+        self.root = root or settings.faiss_index_path
+        self.pointer_file = self.root / POINTER_FILE
+    
+    def current_name(self) -> Optional[str]:
+        """Name of the committed generation, or None if nothing is committed."""
+        try:
+            return self.pointer_file.read_text().strip() or None
+        except OSError:
+            return None
+    
+    def pointer_mtime(self) -> Optional[float]:
+        """Modification time of the CURRENT pointer, or None if absent."""
+        try:
+            return self.pointer_file.stat().st_mtime
+        except OSError:
+            return None
+    
+    def current(self) -> Optional[IndexGeneration]:
+        """
+        Get the committed generation.
+        
+        Falls back to index files written directly into the index directory
+        by earlier versions, so existing deployments keep working until the
+        next build.
+        """
+        name = self.current_name()
+        if name is not None:
+            return IndexGeneration(self.root / name, name)
+        
+        if (self.root / "metadata.pkl").exists():
+            return IndexGeneration(self.root, "legacy", settings.bm25_index_path)
+        
+        return None
+    
+    def create(self) -> IndexGeneration:
+        """
+        Create an empty directory for the next generation.
+        
+        The generation remembers the committed one it is based on; commit()
+        refuses to publish it once CURRENT has moved on.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        parent = self.current_name()
+        
+        numbers = [int(m.group(1)) for m in map(_GENERATION_RE.match, os.listdir(self.root)) if m]
+        number = max(numbers, default=0) + 1
+        while True:
+            name = f"gen-{number:06d}"
+            path = self.root / name
+            try:
+                path.mkdir()
+                break
+            except FileExistsError:
+                number += 1
+        
+        generation = IndexGeneration(path, name)
+        generation.parent = parent
+        return generation
+    
+    def commit(self, generation: IndexGeneration, manifest: Dict[str, Any]):
+        """
+        Publish a fully written generation.
+        
+        Args:
+            generation: Generation created with create()
+            manifest: Build details recorded alongside the index files
+        
+        Raises:
+            StaleGenerationError: CURRENT no longer names the generation this
+                one was built from (its changes would be lost)
+        """
+        parent = self.current_name()
+        if parent != generation.parent:
+            raise StaleGenerationError(
+                f"Index generation {generation.name} was built from {generation.parent}, "
+                f"but {parent} is current; not publishing it"
+            )
+        manifest = {
+            "generation": generation.name,
+            "parent": parent,
+            "created_at": time.time(),
+            "embedding_model": settings.embedding_model,
+            **manifest
+        }
+        with open(generation.manifest_file, "w") as f:
+            json.dump(manifest, f, indent=2)
+        
+        tmp_file = self.root / f"{POINTER_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            f.write(generation.name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.pointer_file)
+        
+        logger.info(f"Committed index generation {generation.name} (parent {parent})")
+        self.collect_garbage()
+    
+    def discard(self, generation: IndexGeneration):
+        """Remove an uncommitted generation after a failed build."""
+        shutil.rmtree(generation.path, ignore_errors=True)
+    
+    def generations(self) -> List[str]:
+        """Names of all generation directories, oldest first."""
+        if not self.root.exists():
+            return []
+        return sorted(name for name in os.listdir(self.root) if _GENERATION_RE.match(name))
+    
+    def collect_garbage(self, keep: Optional[int] = None):
+        """
+        Delete old generations, keeping the newest `keep` (always including CURRENT).
+        
+        Retrievers read a generation fully into memory when swapping it in,
+        so deleting its files afterwards does not affect running queries.
+        """
+        keep = keep or settings.index_generations_keep
+        current = self.current_name()
+        
+        for name in self.generations()[:-keep]:
+            if name != current:
+                shutil.rmtree(self.root / name, ignore_errors=True)
+                logger.info(f"Removed old index generation {name}")
+        
+        # Files from the pre-generation layout are superseded by the first commit
+        if current is not None:
+            for legacy_file in (
+                self.root / "index.faiss",
+                self.root / "metadata.pkl",
+                self.root / "tombstones.json",
+                settings.bm25_index_path
+            ):
+                if legacy_file.exists():
+                    legacy_file.unlink()
+                    logger.info(f"Removed legacy index file {legacy_file}")
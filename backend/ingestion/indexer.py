@@ -2,7 +2,7 @@
 Index builder for FAISS and BM25.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 import numpy as np
 from sentence_transformers import SentenceTransformer
@@ -14,10 +14,23 @@ from pathlib import Path
 import uuid
 
 from backend.config import settings
+from backend.ingestion.progress import JobProgress, NullProgress
+from backend.ingestion.index_store import IndexStore, IndexGeneration, IndexWriteLock
+from backend.ingestion.vector_storage import (
+    create_index, empty_like, storage_mode, index_metric, prepare_vectors
+)
+from backend.retriever.filters import build_filter_index
+from backend.retriever.query_expansion import TermDictionary
+from backend.retriever.analyzer import ANALYZER_VERSION, Vocabulary, analyze
 
 logger = logging.getLogger(__name__)
 
 
+# Serializes writers (ingest, delete, compaction) across threads and
+# worker processes; readers never need it since generations are immutable
+INDEX_WRITE_LOCK = IndexWriteLock()
+
+
 class IndexBuilder:
     """Build and manage FAISS and BM25 indices."""
     
@@ -32,32 +45,93 @@ class IndexBuilder:
             logger.info(f"Loading embedding model: {settings.embedding_model}")
             self.embedding_model = SentenceTransformer(settings.embedding_model)
     
-    async def build_indices(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def embed_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        progress: Optional[JobProgress] = None
+    ) -> np.ndarray:
+        """
+        Embed chunk contents in batches, reporting progress between batches.
+        
+        Args:
+            chunks: List of chunks with content
+            progress: Optional progress handle (chunks embedded, cancellation)
+        
+        Returns:
+            float32 embedding matrix, one row per chunk
+        """
+        progress = progress or NullProgress()
+        self.load_embedding_model()
+        
+        texts = [chunk["content"] for chunk in chunks]
+        batch_size = settings.embedding_batch_size
+        
+        logger.info(f"Generating embeddings for {len(texts)} chunks...")
+        progress.set_stage("embedding")
+        progress.set_chunks_total(len(texts))
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            progress.check_cancelled()
+            batch = self.embedding_model.encode(
+                texts[start:start + batch_size],
+                batch_size=min(batch_size, 64),
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+            batches.append(batch.astype('float32'))
+            progress.chunks_done(len(batch))
+        
+        return np.vstack(batches)
+    
+    async def build_indices(
+        self,
+        chunks: List[Dict[str, Any]],
+        progress: Optional[JobProgress] = None,
+        embeddings: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Build FAISS and BM25 indices from chunks.
         
         Args:
             chunks: List of chunks with content and metadata
+            progress: Optional progress handle (chunks embedded, cancellation)
+            embeddings: Precomputed embeddings aligned with chunks (skips encoding)
         
         Returns:
             Dictionary with build statistics
         """
+        progress = progress or NullProgress()
+        
         if not chunks:
             logger.warning("No chunks provided for indexing")
             return {"faiss_vectors": 0, "bm25_documents": 0}
         
         self.load_embedding_model()
         
-        # Add unique chunk IDs
-        for i, chunk in enumerate(chunks):
-            if "chunk_id" not in chunk:
-                chunk["chunk_id"] = str(uuid.uuid4())
+        self._assign_chunk_ids(chunks)
         
-        # Build FAISS index
-        faiss_stats = await self._build_faiss_index(chunks)
+        # Embed everything first so a cancelled job leaves the indices untouched
+        if embeddings is None:
+            embeddings = self.embed_chunks(chunks, progress)
+        progress.check_cancelled()
+        progress.set_stage("indexing")
         
-        # Build BM25 index
-        bm25_stats = await self._build_bm25_index(chunks)
+        with INDEX_WRITE_LOCK:
+            store = IndexStore()
+            generation = store.create()
+            try:
+                # Build FAISS index
+                faiss_stats = await self._build_faiss_index(chunks, embeddings, generation)
+                
+                # Build BM25 index
+                bm25_stats = await self._build_bm25_index(chunks, generation)
+                
+                # A fresh build contains no deleted chunks
+                self._commit(store, generation, chunks, faiss_stats, bm25_stats)
+            except Exception:
+                store.discard(generation)
+                raise
         
         # Save chunk metadata
         self.chunk_metadata = chunks
@@ -67,60 +141,145 @@ class IndexBuilder:
             "bm25_documents": bm25_stats["documents"]
         }
     
-    async def _build_faiss_index(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Build FAISS index."""
+    def _assign_chunk_ids(self, chunks: List[Dict[str, Any]]):
+        """Add unique chunk IDs where missing."""
+        for chunk in chunks:
+            if "chunk_id" not in chunk:
+                chunk["chunk_id"] = str(uuid.uuid4())
+    
+    def _commit(
+        self,
+        store: IndexStore,
+        generation: IndexGeneration,
+        chunks: List[Dict[str, Any]],
+        faiss_stats: Dict[str, Any],
+        bm25_stats: Dict[str, Any],
+        tombstones: Optional[Set[str]] = None
+    ):
+        """Verify a written generation and publish it."""
+        if faiss_stats["vectors"] != len(chunks) or bm25_stats["documents"] != len(chunks):
+            raise RuntimeError(
+                f"Index build incomplete (FAISS {faiss_stats['vectors']}, "
+                f"BM25 {bm25_stats['documents']}, chunks {len(chunks)}); generation discarded"
+            )
+        
+        # Metadata filter bitmaps are precomputed so queries only combine them
+        with open(generation.filters_file, "wb") as f:
+            pickle.dump(build_filter_index(chunks), f)
+        
+        if tombstones:
+            generation.tombstones().add(tombstones)
+        
+        store.commit(generation, {
+            "chunks": len(chunks),
+            "faiss_vectors": faiss_stats["vectors"],
+            "bm25_documents": bm25_stats["documents"],
+            "dimension": faiss_stats.get("dimension"),
+            "vector_storage": faiss_stats.get("storage"),
+            "metric": faiss_stats.get("metric")
+        })
+    
+    async def _build_faiss_index(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        generation: IndexGeneration,
+        template: Optional[faiss.Index] = None
+    ) -> Dict[str, Any]:
+        """
+        Build FAISS index.
+        
+        Args:
+            chunks: Chunks in index order
+            embeddings: Embeddings aligned with chunks
+            generation: Generation to write into
+            template: Index whose storage mode and trained quantizer to reuse
+                (default: a new index in the configured storage mode)
+        """
         try:
             logger.info("Building FAISS index...")
             
-            # Extract texts
-            texts = [chunk["content"] for chunk in chunks]
-            
-            # Generate embeddings
-            logger.info(f"Generating embeddings for {len(texts)} chunks...")
-            embeddings = self.embedding_model.encode(
-                texts,
-                show_progress_bar=True,
-                convert_to_numpy=True
-            )
-            
-            # Create FAISS index
+            # Create FAISS index; IDs are chunk positions in metadata, kept
+            # explicit (IDMap) so deleted chunks can be removed by ID
             dimension = embeddings.shape[1]
-            index = faiss.IndexFlatL2(dimension)
-            index.add(embeddings.astype('float32'))
-            
-            # Save index
-            settings.faiss_index_path.mkdir(parents=True, exist_ok=True)
-            faiss.write_index(index, str(settings.faiss_index_path / "index.faiss"))
+            if template is not None:
+                index = empty_like(template)
+            else:
+                index = create_index(dimension, embeddings)
+            self._add_vectors(index, embeddings, start_id=0)
             
-            # Save metadata
-            with open(settings.faiss_index_path / "metadata.pkl", "wb") as f:
-                pickle.dump(chunks, f)
+            self._save_faiss_index(index, chunks, generation)
             
-            logger.info(f"FAISS index built: {index.ntotal} vectors")
+            mode, metric = storage_mode(index), index_metric(index)
+            logger.info(f"FAISS index built: {index.ntotal} vectors ({mode} storage, {metric})")
             
-            return {"vectors": index.ntotal}
+            return {"vectors": index.ntotal, "dimension": dimension, "storage": mode, "metric": metric}
             
         except Exception as e:
             logger.error(f"Error building FAISS index: {e}", exc_info=True)
             return {"vectors": 0}
     
-    async def _build_bm25_index(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _add_vectors(self, index: faiss.Index, embeddings: np.ndarray, start_id: int):
+        """Append vectors with sequential IDs (plain indices use implicit positions)."""
+        # Cosine indices store normalized copies; cached embeddings stay raw
+        embeddings = prepare_vectors(embeddings, index_metric(index))
+        if hasattr(index, "id_map"):
+            ids = np.arange(start_id, start_id + len(embeddings), dtype='int64')
+            index.add_with_ids(embeddings, ids)
+        else:
+            index.add(embeddings)
+    
+    def _save_faiss_index(self, index: faiss.Index, chunks: List[Dict[str, Any]], generation: IndexGeneration):
+        """Write FAISS index and chunk metadata."""
+        faiss.write_index(index, str(generation.faiss_file))
+        
+        with open(generation.metadata_file, "wb") as f:
+            pickle.dump(chunks, f)
+    
+    def _load_existing(
+        self,
+        load_index: bool = True
+    ) -> Tuple[Optional[faiss.Index], List[Dict[str, Any]], Optional[IndexGeneration]]:
+        """Load the committed FAISS index and chunk metadata, if any."""
+        index = None
+        chunks = []
+        
+        generation = IndexStore().current()
+        if generation is None:
+            return index, chunks, generation
+        
+        if generation.metadata_file.exists():
+            with open(generation.metadata_file, "rb") as f:
+                chunks = pickle.load(f)
+        
+        if load_index and generation.faiss_file.exists():
+            index = faiss.read_index(str(generation.faiss_file))
+        
+        return index, chunks, generation
+    
+    async def _build_bm25_index(self, chunks: List[Dict[str, Any]], generation: IndexGeneration) -> Dict[str, Any]:
         """Build BM25 index."""
         try:
             logger.info("Building BM25 index...")
             
-            # Tokenize documents (simple whitespace tokenization)
-            tokenized_docs = [chunk["content"].lower().split() for chunk in chunks]
+            # Analyze documents into term IDs (queries use the same analyzer)
+            vocabulary = Vocabulary()
+            tokenized_docs = [vocabulary.add(analyze(chunk["content"])) for chunk in chunks]
             
             # Create BM25 index
             bm25 = BM25Okapi(tokenized_docs)
             
             # Save index
-            settings.bm25_index_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(settings.bm25_index_path, "wb") as f:
-                pickle.dump({"index": bm25}, f)
+            with open(generation.bm25_file, "wb") as f:
+                pickle.dump({
+                    "index": bm25,
+                    "analyzer": ANALYZER_VERSION,
+                    "vocabulary": vocabulary.terms
+                }, f)
+            
+            logger.info(f"BM25 index built: {len(tokenized_docs)} documents, {len(vocabulary)} terms")
             
-            logger.info(f"BM25 index built: {len(tokenized_docs)} documents")
+            self._build_term_dictionary(bm25, vocabulary, generation)
             
             return {"documents": len(tokenized_docs)}
             
@@ -128,27 +287,204 @@ class IndexBuilder:
             logger.error(f"Error building BM25 index: {e}", exc_info=True)
             return {"documents": 0}
     
-    async def add_chunks_to_indices(self, new_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _build_term_dictionary(self, bm25: BM25Okapi, vocabulary: Vocabulary, generation: IndexGeneration):
+        """
+        Write the cross-lingual term dictionary for a BM25 vocabulary.
+        
+        Optional: queries fall back to unexpanded BM25 if this fails.
+        """
+        try:
+            current = IndexStore().current()
+            previous = TermDictionary.load(current.terms_file) if current is not None else None
+            idf = {vocabulary.terms[term_id]: value for term_id, value in bm25.idf.items()}
+            dictionary = TermDictionary.build(idf, self.encode_normalized, previous)
+            dictionary.save(generation.terms_file)
+        except Exception as e:
+            logger.warning(f"Could not build term dictionary: {e}")
+    
+    def encode_normalized(self, texts: List[str]) -> np.ndarray:
+        """Normalized embeddings of short texts (vocabulary terms, FAQ questions)."""
+        self.load_embedding_model()
+        return self.embedding_model.encode(
+            texts,
+            batch_size=256,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+    
+    async def add_chunks_to_indices(
+        self,
+        new_chunks: List[Dict[str, Any]],
+        progress: Optional[JobProgress] = None,
+        embeddings: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Add new chunks to existing indices (incremental update).
         
         Args:
             new_chunks: New chunks to add
+            progress: Optional progress handle (chunks embedded, cancellation)
+            embeddings: Precomputed embeddings aligned with new_chunks
         
         Returns:
             Update statistics
         """
-        # For simplicity, rebuild indices
-        # In production, implement true incremental updates
-        logger.info("Rebuilding indices with new chunks...")
-        
-        # Load existing chunks
-        existing_chunks = []
-        metadata_file = settings.faiss_index_path / "metadata.pkl"
-        if metadata_file.exists():
-            with open(metadata_file, "rb") as f:
-                existing_chunks = pickle.load(f)
-        
-        # Combine and rebuild
-        all_chunks = existing_chunks + new_chunks
-        return await self.build_indices(all_chunks)
+        progress = progress or NullProgress()
+        
+        if not new_chunks:
+            logger.warning("No chunks provided for indexing")
+            return {"faiss_vectors": 0, "bm25_documents": 0}
+        
+        self._assign_chunk_ids(new_chunks)
+        
+        # Only the new chunks are embedded; existing vectors are reused as-is
+        if embeddings is None:
+            embeddings = self.embed_chunks(new_chunks, progress)
+        progress.check_cancelled()
+        progress.set_stage("indexing")
+        
+        with INDEX_WRITE_LOCK:
+            existing_index, existing_chunks, current = self._load_existing()
+            
+            # Fall back to a full rebuild if the stored index is missing or out of sync
+            if (
+                existing_index is None
+                or existing_index.ntotal != len(existing_chunks)
+                or existing_index.d != embeddings.shape[1]
+            ):
+                # Deleted chunks are left out, since the new generation starts without tombstones
+                tombstones = current.tombstones().load() if current is not None else set()
+                existing_chunks = [chunk for chunk in existing_chunks if chunk["chunk_id"] not in tombstones]
+                if existing_chunks:
+                    logger.warning("FAISS index out of sync with metadata, rebuilding from scratch")
+                    return await self.build_indices(existing_chunks + new_chunks, progress)
+                return await self.build_indices(new_chunks, progress, embeddings)
+            
+            logger.info(f"Adding {len(new_chunks)} chunks to index of {existing_index.ntotal}...")
+            
+            all_chunks = existing_chunks + new_chunks
+            
+            store = IndexStore()
+            generation = store.create()
+            try:
+                self._add_vectors(existing_index, embeddings, start_id=len(existing_chunks))
+                self._save_faiss_index(existing_index, all_chunks, generation)
+                logger.info(f"FAISS index updated: {existing_index.ntotal} vectors")
+                
+                # BM25 statistics are corpus-wide, so it is rebuilt (tokenization only)
+                bm25_stats = await self._build_bm25_index(all_chunks, generation)
+                
+                # Pending deletions carry over until the next compaction
+                self._commit(
+                    store,
+                    generation,
+                    all_chunks,
+                    {
+                        "vectors": existing_index.ntotal,
+                        "dimension": existing_index.d,
+                        "storage": storage_mode(existing_index),
+                        "metric": index_metric(existing_index)
+                    },
+                    bm25_stats,
+                    tombstones=current.tombstones().load()
+                )
+            except Exception:
+                store.discard(generation)
+                raise
+        
+        self.chunk_metadata = all_chunks
+        
+        return {
+            "faiss_vectors": existing_index.ntotal,
+            "bm25_documents": bm25_stats["documents"]
+        }
+    
+    def tombstone_document(self, document_id: str) -> Dict[str, Any]:
+        """
+        Mark all chunks of a document as deleted.
+        
+        The chunks stay in the on-disk indices until compaction; queries
+        filter them out as soon as the tombstone file is updated.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of chunks removed and the resulting tombstone ratio
+        """
+        with INDEX_WRITE_LOCK:
+            _, chunks, generation = self._load_existing(load_index=False)
+            if generation is None:
+                return {"chunks_removed": 0, "tombstone_ratio": 0.0}
+            
+            chunk_ids = [
+                chunk["chunk_id"] for chunk in chunks
+                if chunk.get("metadata", {}).get("document_id") == document_id
+            ]
+            
+            store = generation.tombstones()
+            tombstones = store.add(chunk_ids) if chunk_ids else store.load()
+        
+        ratio = len(tombstones) / len(chunks) if chunks else 0.0
+        logger.info(f"Tombstoned {len(chunk_ids)} chunks of {document_id} (ratio {ratio:.2f})")
+        
+        return {"chunks_removed": len(chunk_ids), "tombstone_ratio": ratio}
+    
+    async def compact(self, progress: Optional[JobProgress] = None) -> Dict[str, Any]:
+        """
+        Rewrite indices without tombstoned chunks.
+        
+        Vectors of surviving chunks are copied from the existing FAISS index,
+        so nothing is re-embedded; quantized indices keep their trained
+        quantizer, so surviving codes are unchanged.
+        
+        Args:
+            progress: Optional progress handle when run as a background job
+        
+        Returns:
+            Compaction statistics
+        """
+        progress = progress or NullProgress()
+        progress.set_stage("indexing")
+        
+        with INDEX_WRITE_LOCK:
+            index, chunks, current = self._load_existing()
+            tombstones = current.tombstones().load() if current is not None else set()
+            
+            if index is None or not tombstones:
+                return {"faiss_vectors": index.ntotal if index is not None else 0, "chunks_removed": 0}
+            
+            keep = [i for i, chunk in enumerate(chunks) if chunk["chunk_id"] not in tombstones]
+            kept_chunks = [chunks[i] for i in keep]
+            
+            logger.info(f"Compacting indices: {len(chunks)} → {len(kept_chunks)} chunks")
+            
+            store = IndexStore()
+            generation = store.create()
+            try:
+                if kept_chunks:
+                    vectors = index.reconstruct_batch(np.array(keep, dtype='int64'))
+                    faiss_stats = await self._build_faiss_index(kept_chunks, vectors, generation, template=index)
+                    bm25_stats = await self._build_bm25_index(kept_chunks, generation)
+                else:
+                    # Everything was deleted: publish an empty generation
+                    with open(generation.metadata_file, "wb") as f:
+                        pickle.dump([], f)
+                    faiss_stats = {
+                        "vectors": 0,
+                        "dimension": index.d,
+                        "storage": storage_mode(index),
+                        "metric": index_metric(index)
+                    }
+                    bm25_stats = {"documents": 0}
+                
+                self._commit(store, generation, kept_chunks, faiss_stats, bm25_stats)
+            except Exception:
+                store.discard(generation)
+                raise
+        
+        return {
+            "faiss_vectors": faiss_stats["vectors"],
+            "chunks_removed": len(chunks) - len(kept_chunks)
+        }
@@ -2,51 +2,265 @@
 Main ingestion pipeline orchestrating document processing and indexing.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import hashlib
 import logging
 import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import uuid
 
+import numpy as np
+import requests
+
 from backend.ingestion.document_processor import DocumentProcessor
 from backend.ingestion.structured_data_parser import StructuredDataParser
 from backend.ingestion.indexer import IndexBuilder
+from backend.ingestion.chunk_cache import ChunkCache, file_fingerprint
+from backend.ingestion.table_store import TableStore
+from backend.ingestion.faq_store import FAQStore, is_qa_set, read_qa_records
+from backend.ingestion.progress import JobProgress, JobCancelled, NullProgress
+from backend.retriever.filters import derive_year
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+UNSTRUCTURED_TYPES = ["pdf", "docx", "txt"]
+STRUCTURED_TYPES = ["csv", "excel", "html", "json"]  # html/json are streamed
+QA_TYPES = ["qa"]  # JSON/JSONL Q&A sets
+WEB_TYPE = "web"  # Page fetched from a URL, then parsed as html
+
+# Seconds to wait for a web page to start and keep arriving
+_WEB_TIMEOUT_SECONDS = 30
+
+# File extension → document type, used for directory ingestion
+EXTENSION_TYPES = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".txt": "txt",
+    ".md": "txt",
+    ".csv": "csv",
+    ".xlsx": "excel",
+    ".xls": "excel",
+    ".html": "html",
+    ".htm": "html",
+    ".json": "json",
+    ".jsonl": "json",
+}
+
+
+def detect_document_type(file_path: str) -> Optional[str]:
+    """
+    Infer document type from file extension (None if unsupported).
+    
+    JSON/JSONL files whose records are question/answer or term/definition
+    pairs are Q&A sets ("qa"); other JSON files are record dumps ("json").
+    """
+    document_type = EXTENSION_TYPES.get(Path(file_path).suffix.lower())
+    if document_type == "json" and is_qa_set(file_path):
+        return "qa"
+    return document_type
+
+
+def _fetch_web_page(url: str) -> str:
+    """
+    Download a web page into storage, streaming it to disk.
+    
+    Returns:
+        Path of the local copy (stable per URL, so re-ingesting refreshes it)
+    """
+    directory = settings.storage_path / "web"
+    directory.mkdir(parents=True, exist_ok=True)
+    local_file = directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html"
+    tmp_file = local_file.with_suffix(".tmp")
+    
+    with requests.get(url, stream=True, timeout=_WEB_TIMEOUT_SECONDS) as response:
+        response.raise_for_status()
+        with open(tmp_file, "wb") as f:
+            for block in response.iter_content(chunk_size=1 << 16):
+                f.write(block)
+    os.replace(tmp_file, local_file)
+    
+    logger.info(f"Fetched {url} to {local_file}")
+    return str(local_file)
+
+
+def _resolve_source(
+    file_path: str,
+    document_type: str,
+    metadata: Optional[Dict[str, Any]]
+) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """
+    Turn a web source into a local HTML file; other sources pass through.
+    
+    Returns:
+        (file path, document type, metadata); fetched pages record their
+        URL in metadata["url"]
+    """
+    if document_type != WEB_TYPE:
+        return file_path, document_type, metadata
+    if file_path.startswith(("http://", "https://")):
+        return _fetch_web_page(file_path), "html", {**(metadata or {}), "url": file_path}
+    return file_path, "html", metadata
+
+
+def parse_document(
+    file_path: str,
+    document_type: str,
+    progress: Optional[JobProgress] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse a document into chunks without touching the indices.
+    
+    Args:
+        file_path: Path to document
+        document_type: Type (pdf, docx, txt, csv, excel, html, json, qa)
+        progress: Optional progress handle
+    
+    Returns:
+        List of chunks, or None if the document type is unsupported
+    """
+    if document_type in UNSTRUCTURED_TYPES:
+        processor = DocumentProcessor()
+        return processor.process_document(file_path, document_type, progress)
+    
+    if document_type in STRUCTURED_TYPES:
+        parser = StructuredDataParser()
+        return parser.process_structured_data(file_path, document_type)
+    
+    if document_type in QA_TYPES:
+        return StructuredDataParser().process_qa(file_path)
+    
+    return None
+
+
+def _attach_document_metadata(
+    chunks: List[Dict[str, Any]],
+    document_id: str,
+    metadata: Optional[Dict[str, Any]]
+):
+    """
+    Stamp chunk IDs, document ID, user metadata, filterable year and, for
+    structured rows, the table reference onto every chunk.
+    """
+    for chunk in chunks:
+        chunk.setdefault("chunk_id", str(uuid.uuid4()))
+        chunk_metadata = chunk["metadata"]
+        chunk_metadata["document_id"] = document_id
+        if metadata:
+            chunk_metadata.update(metadata)
+        
+        year = derive_year(chunk_metadata)
+        if year is not None:
+            chunk_metadata["year"] = year
+        
+        if chunk_metadata.get("type") not in STRUCTURED_TYPES or "table_id" in chunk_metadata:
+            continue
+        
+        # Cached chunks from before the table store carry the row inline. Their
+        # sheet position is only known for CSV; Excel rows keep it until re-parsed.
+        if "sheet_index" in chunk_metadata or chunk_metadata["type"] == "csv":
+            chunk_metadata.pop("structured_data", None)
+            chunk_metadata["table_id"] = TableStore.table_id(document_id, chunk_metadata.pop("sheet_index", 0))
+
+
+def _save_document_record(
+    document_id: str,
+    file_path: str,
+    document_type: str,
+    chunks_count: int,
+    metadata: Optional[Dict[str, Any]],
+    fingerprint: Optional[Dict[str, Any]] = None
+):
+    """Save document metadata (including source file fingerprint) to documents_path."""
+    doc_metadata = {
+        "document_id": document_id,
+        "file_path": file_path,
+        "document_type": document_type,
+        "chunks_count": chunks_count,
+        "fingerprint": fingerprint,
+        "metadata": metadata or {}
+    }
+    
+    settings.documents_path.mkdir(parents=True, exist_ok=True)
+    with open(settings.documents_path / f"{document_id}.json", "w") as f:
+        json.dump(doc_metadata, f, indent=2)
+
+
+def _store_tables(
+    document_id: str,
+    file_path: str,
+    document_type: str,
+    metadata: Optional[Dict[str, Any]] = None
+):
+    """Keep typed columnar copies of structured sources for aggregate queries."""
+    if document_type not in STRUCTURED_TYPES:
+        return
+    try:
+        TableStore().save_document(document_id, file_path, document_type, metadata)
+    except Exception as e:
+        # Row chunks are still indexed; only analytical answers are unavailable
+        logger.warning(f"Could not store tables for {file_path}: {e}")
+
+
+def _store_faq(
+    document_id: str,
+    file_path: str,
+    document_type: str,
+    indexer: IndexBuilder
+):
+    """Embed the questions of curated Q&A sets for the FAQ fast path."""
+    if document_type not in QA_TYPES and document_type != "csv":
+        return
+    try:
+        records = read_qa_records(file_path)
+        if records:
+            FAQStore().save_document(document_id, file_path, records, indexer.encode_normalized)
+    except Exception as e:
+        # Questions are still answered through retrieval
+        logger.warning(f"Could not store FAQ questions for {file_path}: {e}")
+
+
 async def ingest_document(
     file_path: str,
     document_type: str,
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = None,
+    replaces: Optional[str] = None,
+    progress: Optional[JobProgress] = None
 ) -> Dict[str, Any]:
     """
     Ingest a document into the system.
     
     Args:
-        file_path: Path to document
-        document_type: Type (pdf, docx, txt, csv, excel)
+        file_path: Path to document, or URL for web pages
+        document_type: Type (pdf, docx, txt, csv, excel, html, json, qa, web)
         metadata: Additional metadata
+        replaces: ID of an existing document this one supersedes (e.g. a
+            corrected scheme document); it is deleted once the new one is indexed
+        progress: Optional progress handle when run as a background job
     
     Returns:
         Ingestion result with statistics
     """
+    progress = progress or NullProgress()
+    
     try:
         logger.info(f"Starting ingestion: {file_path} ({document_type})")
+        progress.set_stage("parsing")
         
-        # Process document based on type
-        chunks = []
+        file_path, document_type, metadata = _resolve_source(file_path, document_type, metadata)
         
-        if document_type in ["pdf", "docx", "txt"]:
-            processor = DocumentProcessor()
-            chunks = processor.process_document(file_path, document_type)
+        # Fingerprint before parsing so a concurrent edit is detected next reindex
+        fingerprint = file_fingerprint(file_path)
         
-        elif document_type in ["csv", "excel"]:
-            parser = StructuredDataParser()
-            chunks = parser.process_structured_data(file_path, document_type)
+        # Process document based on type
+        chunks = parse_document(file_path, document_type, progress)
         
-        else:
+        if chunks is None:
             return {
                 "success": False,
                 "message": f"Unsupported document type: {document_type}",
@@ -60,30 +274,27 @@ async def ingest_document(
                 "chunks_created": 0
             }
         
+        progress.check_cancelled()
+        
         # Add additional metadata to all chunks
         document_id = str(uuid.uuid4())
-        for chunk in chunks:
-            chunk["metadata"]["document_id"] = document_id
-            if metadata:
-                chunk["metadata"].update(metadata)
+        _attach_document_metadata(chunks, document_id, metadata)
         
-        # Save document metadata
-        doc_metadata = {
-            "document_id": document_id,
-            "file_path": file_path,
-            "document_type": document_type,
-            "chunks_count": len(chunks),
-            "metadata": metadata or {}
-        }
+        # Add to indices before recording the document, so a cancelled
+        # job leaves nothing behind
+        indexer = IndexBuilder()
+        embeddings = indexer.embed_chunks(chunks, progress)
+        index_stats = await indexer.add_chunks_to_indices(chunks, progress, embeddings)
         
-        settings.documents_path.mkdir(parents=True, exist_ok=True)
-        with open(settings.documents_path / f"{document_id}.json", "w") as f:
-            json.dump(doc_metadata, f, indent=2)
+        ChunkCache().save(document_id, fingerprint, chunks, embeddings)
+        _save_document_record(document_id, file_path, document_type, len(chunks), metadata, fingerprint)
+        _store_tables(document_id, file_path, document_type, metadata)
+        _store_faq(document_id, file_path, document_type, indexer)
         
-        # Add to indices
-        indexer = IndexBuilder()
-        index_stats = await indexer.add_chunks_to_indices(chunks)
+        if replaces:
+            delete_document(replaces)
         
+        progress.set_stage("done")
         logger.info(f"Ingestion complete: {len(chunks)} chunks, {index_stats}")
         
         return {
@@ -92,7 +303,10 @@ async def ingest_document(
             "chunks_created": len(chunks),
             "document_id": document_id
         }
-        
+    
+    except JobCancelled:
+        raise
+    
     except Exception as e:
         logger.error(f"Error during ingestion: {e}", exc_info=True)
         return {
@@ -102,69 +316,527 @@ async def ingest_document(
         }
 
 
-async def reindex_all(rebuild_faiss: bool = True, rebuild_bm25: bool = True) -> Dict[str, Any]:
+def _parse_item(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], Optional[str]]:
+    """Fingerprint and parse one batch item in a worker process."""
+    try:
+        item = {**item, "fingerprint": file_fingerprint(item["file_path"])}
+        return item, parse_document(item["file_path"], item["document_type"]), None
+    except Exception as e:
+        return item, None, str(e)
+
+
+def _parse_items(
+    items: List[Dict[str, Any]],
+    workers: int,
+    progress: JobProgress
+) -> Iterator[Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], Optional[str]]]:
+    """
+    Parse batch items in worker processes, yielding results as they finish.
+    
+    Each worker is a single-process pool fed one item at a time, so a file
+    that kills its parser (segfault, out of memory) fails alone: it is
+    reported as an error and the worker is replaced for the other files.
+    
+    Yields:
+        (item, chunks, error) as returned by _parse_item
+    """
+    # Spawned (not forked) workers: we may be running inside a job thread
+    context = multiprocessing.get_context("spawn")
+    queue = list(reversed(items))
+    executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(workers)]
+    running: Dict[Future, Tuple[int, Dict[str, Any]]] = {}
+    
+    def feed(slot: int):
+        if queue:
+            item = queue.pop()
+            running[executors[slot].submit(_parse_item, item)] = (slot, item)
+    
+    try:
+        for slot in range(workers):
+            feed(slot)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                progress.check_cancelled()
+                slot, item = running.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    logger.error(f"Parser process died on {item['file_path']}")
+                    executors[slot].shutdown(wait=False)
+                    executors[slot] = ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    yield item, None, "Parser process died (crash or out of memory)"
+                feed(slot)
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Load a bulk ingestion manifest.
+    
+    The manifest is a JSON list or JSONL file of objects with `file_path`
+    and optional `document_type` and `metadata`. Relative paths are
+    resolved against the manifest's directory.
+    
+    Args:
+        manifest_path: Path to manifest file
+    
+    Returns:
+        List of batch items
+    """
+    path = Path(manifest_path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix.lower() == ".jsonl":
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = json.load(f)
+    
+    items = []
+    for entry in entries:
+        file_path = Path(entry["file_path"])
+        if not file_path.is_absolute():
+            file_path = path.parent / file_path
+        items.append({
+            "file_path": str(file_path),
+            "document_type": entry.get("document_type") or detect_document_type(str(file_path)),
+            "metadata": entry.get("metadata") or {}
+        })
+    return items
+
+
+def collect_directory(
+    directory: str,
+    recursive: bool = True,
+    metadata: Optional[Dict[str, Any]] = None,
+    extensions: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    List supported files in a directory as batch items.
+    
+    Args:
+        directory: Directory to scan
+        recursive: Include subdirectories
+        metadata: Metadata applied to every file
+        extensions: Restrict to these extensions (e.g. [".pdf", ".csv"])
+    
+    Returns:
+        List of batch items, sorted by path
+    """
+    base = Path(directory)
+    pattern = "**/*" if recursive else "*"
+    allowed = {ext.lower() for ext in extensions} if extensions else None
+    
+    items = []
+    for file_path in sorted(base.glob(pattern)):
+        if not file_path.is_file():
+            continue
+        if allowed is not None and file_path.suffix.lower() not in allowed:
+            continue
+        document_type = detect_document_type(str(file_path))
+        if document_type is None:
+            continue
+        items.append({
+            "file_path": str(file_path),
+            "document_type": document_type,
+            "metadata": dict(metadata or {})
+        })
+    return items
+
+
+async def ingest_batch(
+    items: List[Dict[str, Any]],
+    progress: Optional[JobProgress] = None,
+    parse_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ingest many documents with one index update.
+    
+    Files are parsed in parallel worker processes; all resulting chunks are
+    then embedded once and committed to the indices in a single batch,
+    instead of one full index update per file. A file whose parser process
+    dies is reported in failures; the other files are still ingested.
+    
+    Args:
+        items: Batch items with file_path, document_type and metadata
+        progress: Optional progress handle when run as a background job
+        parse_workers: Parser processes (default: settings.ingest_parse_workers)
+    
+    Returns:
+        Bulk ingestion result with per-document outcomes
+    """
+    progress = progress or NullProgress()
+    failures = []
+    
+    try:
+        logger.info(f"Starting bulk ingestion of {len(items)} files")
+        progress.set_stage("parsing")
+        progress.set_files_total(len(items))
+        
+        documents = []
+        all_chunks = []
+        
+        # Web pages are fetched up front; workers only parse local files
+        local_items = []
+        for item in items:
+            try:
+                file_path, document_type, metadata = _resolve_source(
+                    item["file_path"], item["document_type"], item.get("metadata")
+                )
+            except Exception as e:
+                logger.warning(f"Skipping {item['file_path']}: {e}")
+                failures.append({"file_path": item["file_path"], "message": str(e)})
+                progress.file_parsed()
+                continue
+            local_items.append({**item, "file_path": file_path, "document_type": document_type, "metadata": metadata})
+        
+        workers = max(1, min(parse_workers or settings.ingest_parse_workers, len(local_items) or 1))
+        
+        for item, chunks, error in _parse_items(local_items, workers, progress):
+            progress.file_parsed()
+            
+            if error or not chunks:
+                reason = error or (
+                    f"Unsupported document type: {item['document_type']}" if chunks is None
+                    else "No chunks created from document"
+                )
+                logger.warning(f"Skipping {item['file_path']}: {reason}")
+                failures.append({"file_path": item["file_path"], "message": reason})
+                continue
+                    
+            document_id = str(uuid.uuid4())
+            _attach_document_metadata(chunks, document_id, item.get("metadata"))
+            all_chunks.extend(chunks)
+            documents.append({**item, "document_id": document_id, "chunks_count": len(chunks)})
+        
+        if not all_chunks:
+            return {
+                "success": False,
+                "message": "No chunks created from any document",
+                "documents_ingested": 0,
+                "chunks_created": 0,
+                "failures": failures
+            }
+        
+        # One embedding pass and one index commit for the whole batch
+        indexer = IndexBuilder()
+        embeddings = indexer.embed_chunks(all_chunks, progress)
+        index_stats = await indexer.add_chunks_to_indices(all_chunks, progress, embeddings)
+        
+        cache = ChunkCache()
+        offset = 0
+        for doc in documents:
+            count = doc["chunks_count"]
+            cache.save(
+                doc["document_id"], doc["fingerprint"],
+                all_chunks[offset:offset + count], embeddings[offset:offset + count]
+            )
+            offset += count
+            _save_document_record(
+                doc["document_id"], doc["file_path"], doc["document_type"],
+                count, doc.get("metadata"), doc["fingerprint"]
+            )
+            _store_tables(doc["document_id"], doc["file_path"], doc["document_type"], doc.get("metadata"))
+            _store_faq(doc["document_id"], doc["file_path"], doc["document_type"], indexer)
+        
+        progress.set_stage("done")
+        logger.info(f"Bulk ingestion complete: {len(documents)} documents, {len(all_chunks)} chunks, {index_stats}")
+        
+        return {
+            "success": True,
+            "message": f"Ingested {len(documents)} of {len(items)} documents",
+            "documents_ingested": len(documents),
+            "chunks_created": len(all_chunks),
+            "documents": [
+                {"document_id": d["document_id"], "file_path": d["file_path"], "chunks_created": d["chunks_count"]}
+                for d in documents
+            ],
+            "failures": failures
+        }
+    
+    except JobCancelled:
+        raise
+    
+    except Exception as e:
+        logger.error(f"Error during bulk ingestion: {e}", exc_info=True)
+        return {
+            "success": False,
+            "message": f"Error during bulk ingestion: {str(e)}",
+            "documents_ingested": 0,
+            "chunks_created": 0,
+            "failures": failures
+        }
+
+
+async def ingest_directory(
+    directory: Optional[str] = None,
+    manifest: Optional[str] = None,
+    recursive: bool = True,
+    metadata: Optional[Dict[str, Any]] = None,
+    progress: Optional[JobProgress] = None
+) -> Dict[str, Any]:
+    """
+    Bulk-ingest a directory or a manifest file.
+    
+    Args:
+        directory: Directory whose supported files are ingested
+        manifest: JSON/JSONL manifest listing files (alternative to directory)
+        recursive: Include subdirectories when scanning a directory
+        metadata: Metadata applied to every file (merged under manifest metadata)
+        progress: Optional progress handle when run as a background job
+    
+    Returns:
+        Bulk ingestion result
+    """
+    if manifest:
+        items = load_manifest(manifest)
+        for item in items:
+            item["metadata"] = {**(metadata or {}), **item["metadata"]}
+    elif directory:
+        items = collect_directory(directory, recursive=recursive, metadata=metadata)
+    else:
+        raise ValueError("Either directory or manifest is required")
+    
+    return await ingest_batch(items, progress)
+
+
+def delete_document(document_id: str) -> Dict[str, Any]:
+    """
+    Delete a document without rebuilding the indices.
+    
+    Its chunks are tombstoned (filtered at query time immediately) and its
+    record and chunk cache are removed. A compaction job is queued once
+    tombstones exceed settings.compaction_tombstone_ratio of the index.
+    
+    Args:
+        document_id: Document ID
+    
+    Returns:
+        Deletion result
+    """
+    record = settings.documents_path / f"{document_id}.json"
+    if not record.exists():
+        return {
+            "success": False,
+            "message": f"Document not found: {document_id}",
+            "document_id": document_id,
+            "chunks_removed": 0
+        }
+    
+    stats = IndexBuilder().tombstone_document(document_id)
+    
+    record.unlink()
+    ChunkCache().delete(document_id)
+    TableStore().delete_document(document_id)
+    FAQStore().delete_document(document_id)
+    
+    compaction_job_id = None
+    if stats["tombstone_ratio"] >= settings.compaction_tombstone_ratio:
+        # Imported here: the job queue itself imports this module
+        from backend.ingestion.job_queue import get_job_queue
+        compaction_job_id = get_job_queue().submit("compact", {})
+        logger.info(f"Tombstone ratio {stats['tombstone_ratio']:.2f}, queued compaction {compaction_job_id}")
+    
+    return {
+        "success": True,
+        "message": "Document deleted",
+        "document_id": document_id,
+        "chunks_removed": stats["chunks_removed"],
+        "compaction_job_id": compaction_job_id
+    }
+
+
+async def compact_indices(progress: Optional[JobProgress] = None) -> Dict[str, Any]:
     """
-    Rebuild indices from all stored documents.
+    Reclaim space held by deleted chunks.
     
     Args:
-        rebuild_faiss: Rebuild FAISS index
-        rebuild_bm25: Rebuild BM25 index
+        progress: Optional progress handle when run as a background job
+    
+    Returns:
+        Compaction result with statistics
+    """
+    try:
+        stats = await IndexBuilder().compact(progress)
+        (progress or NullProgress()).set_stage("done")
+        
+        return {
+            "success": True,
+            "message": f"Compaction removed {stats['chunks_removed']} chunks",
+            **stats
+        }
+    
+    except Exception as e:
+        logger.error(f"Error during compaction: {e}", exc_info=True)
+        return {
+            "success": False,
+            "message": f"Error during compaction: {str(e)}"
+        }
+
+
+async def reindex_all(
+    force: bool = False,
+    progress: Optional[JobProgress] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild the FAISS and BM25 indices from all stored documents.
+    
+    Unchanged source files (by size, mtime and content hash) reuse their
+    cached chunks and embeddings; only new or changed files are re-parsed
+    and re-embedded. Documents whose source file was deleted are dropped.
+    A changed file that parses to no chunks keeps its previously cached
+    chunks (or is dropped if there are none) and is reported in failures.
+    
+    Args:
+        force: Ignore the chunk cache and re-parse every document
+        progress: Optional progress handle when run as a background job
     
     Returns:
         Reindex result with statistics
     """
+    progress = progress or NullProgress()
+    
     try:
         logger.info("Starting reindexing...")
+        progress.set_stage("parsing")
+        
+        cache = ChunkCache()
+        indexer = IndexBuilder()
+        tables = TableStore()
+        faq = FAQStore()
         
-        # Load all document metadata
         all_chunks = []
+        embedding_parts = []
+        known_ids = set()
+        failures = []
+        reused = reparsed = dropped = 0
+        
+        def drop(document_id: str, doc_file: Path):
+            cache.delete(document_id)
+            tables.delete_document(document_id)
+            faq.delete_document(document_id)
+            doc_file.unlink()
         
         if settings.documents_path.exists():
-            for doc_file in settings.documents_path.glob("*.json"):
+            for doc_file in sorted(settings.documents_path.glob("*.json")):
+                progress.check_cancelled()
                 with open(doc_file, "r") as f:
                     doc_metadata = json.load(f)
                 
-                # Re-process document
+                document_id = doc_metadata["document_id"]
                 file_path = doc_metadata["file_path"]
-                document_type = doc_metadata["document_type"]
                 
-                if document_type in ["pdf", "docx", "txt"]:
-                    processor = DocumentProcessor()
-                    chunks = processor.process_document(file_path, document_type)
-                elif document_type in ["csv", "excel"]:
-                    parser = StructuredDataParser()
-                    chunks = parser.process_structured_data(file_path, document_type)
-                else:
+                # Source file removed: drop the document entirely
+                if not Path(file_path).exists():
+                    logger.info(f"Dropping deleted document {document_id}: {file_path}")
+                    drop(document_id, doc_file)
+                    dropped += 1
                     continue
                 
-                # Add metadata
-                for chunk in chunks:
-                    chunk["metadata"]["document_id"] = doc_metadata["document_id"]
-                    chunk["metadata"].update(doc_metadata.get("metadata", {}))
+                chunks, embeddings = (None, None) if force else cache.get_valid(document_id, file_path)
+                reparsed_now = chunks is None
+                
+                if chunks is None:
+                    # New or changed file: re-parse
+                    fingerprint = file_fingerprint(file_path)
+                    chunks = parse_document(file_path, doc_metadata["document_type"], progress)
+                    reparsed += 1
+                
+                if not chunks:
+                    # Unparseable now: keep the last good version, if any, until the file is fixed
+                    previous = cache.load(document_id)
+                    if previous is None or not previous.get("chunks"):
+                        logger.warning(f"Dropping {document_id}: {file_path} produced no chunks")
+                        failures.append({"file_path": file_path, "message": "No chunks extracted; document dropped"})
+                        drop(document_id, doc_file)
+                        dropped += 1
+                        continue
+                    
+                    logger.warning(f"{file_path} produced no chunks; keeping its previous version")
+                    failures.append({"file_path": file_path, "message": "No chunks extracted; previous version kept"})
+                    chunks = previous["chunks"]
+                    embeddings = previous["embeddings"] if previous.get("embedding_model") == settings.embedding_model else None
+                    fingerprint = doc_metadata.get("fingerprint")  # Retried on the next reindex
+                    reparsed_now = False
+                elif not reparsed_now:
+                    fingerprint = doc_metadata.get("fingerprint")
+                    # Touched but identical: refresh mtime so the next check is stat-only
+                    if not fingerprint or fingerprint.get("mtime") != os.stat(file_path).st_mtime:
+                        fingerprint = file_fingerprint(file_path)
+                        if embeddings is not None:
+                            cache.save(document_id, fingerprint, chunks, embeddings)
+                    reused += 1
+                
+                known_ids.add(document_id)
+                
+                # Add metadata (cheap, and picks up edits to the document record)
+                _attach_document_metadata(chunks, document_id, doc_metadata.get("metadata", {}))
+                
+                if embeddings is None or len(embeddings) != len(chunks):
+                    embeddings = indexer.embed_chunks(chunks, progress)
+                    cache.save(document_id, fingerprint, chunks, embeddings)
+                    progress.set_stage("parsing")
+                
+                if doc_metadata.get("fingerprint") != fingerprint or doc_metadata.get("chunks_count") != len(chunks):
+                    _save_document_record(
+                        document_id, file_path, doc_metadata["document_type"],
+                        len(chunks), doc_metadata.get("metadata"), fingerprint
+                    )
+                
+                if force or reparsed_now or not tables.has_document(document_id):
+                    _store_tables(document_id, file_path, doc_metadata["document_type"], doc_metadata.get("metadata"))
+                if force or reparsed_now or not faq.has_document(document_id):
+                    _store_faq(document_id, file_path, doc_metadata["document_type"], indexer)
                 
                 all_chunks.extend(chunks)
+                embedding_parts.append(embeddings)
+        
+        # Remove cache entries and tables for documents that no longer exist
+        for document_id in cache.document_ids():
+            if document_id not in known_ids:
+                cache.delete(document_id)
+        for entry in tables.catalog():
+            if entry["document_id"] not in known_ids:
+                tables.delete_document(entry["document_id"])
+        for document_id in faq.document_ids():
+            if document_id not in known_ids:
+                faq.delete_document(document_id)
+        
+        logger.info(f"Reindex plan: {reused} reused, {reparsed} re-parsed, {dropped} dropped")
         
         if not all_chunks:
             return {
                 "success": False,
                 "message": "No documents found to reindex",
                 "faiss_documents": 0,
-                "bm25_documents": 0
+                "bm25_documents": 0,
+                "documents_reused": reused,
+                "documents_reparsed": reparsed,
+                "documents_dropped": dropped,
+                "failures": failures
             }
         
-        # Rebuild indices
-        indexer = IndexBuilder()
-        stats = await indexer.build_indices(all_chunks)
+        # Rebuild indices from cached and freshly computed embeddings
+        stats = await indexer.build_indices(all_chunks, progress, np.vstack(embedding_parts))
         
+        progress.set_stage("done")
         logger.info(f"Reindexing complete: {stats}")
         
         return {
             "success": True,
             "message": "Reindexing completed successfully",
             "faiss_documents": stats["faiss_vectors"],
-            "bm25_documents": stats["bm25_documents"]
+            "bm25_documents": stats["bm25_documents"],
+            "documents_reused": reused,
+            "documents_reparsed": reparsed,
+            "documents_dropped": dropped,
+            "failures": failures
         }
-        
+    
+    except JobCancelled:
+        raise
+    
     except Exception as e:
         logger.error(f"Error during reindexing: {e}", exc_info=True)
         return {
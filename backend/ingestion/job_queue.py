@@ -0,0 +1,383 @@
+"""
+Background job queue for ingestion and reindexing.
+
+Jobs run on a local thread pool, each inside its own event loop, so long
+parsing/embedding work never blocks the API event loop serving queries.
+Job state is persisted in a SQLite table and survives restarts.
+
+Every queue (one per API worker process) owns the jobs it runs and keeps
+a heartbeat row alive; jobs are only failed or taken over once their
+owner's lease has expired, so several workers can share the job table.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+
+from backend.config import settings
+from backend.ingestion.progress import JobProgress, JobCancelled
+from backend.ingestion.ingestion_pipeline import (
+    ingest_document, ingest_directory, reindex_all, compact_indices
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Job types and the coroutine functions that execute them
+JOB_HANDLERS: Dict[str, Callable[..., Any]] = {
+    "ingest": ingest_document,
+    "bulk_ingest": ingest_directory,
+    "reindex": reindex_all,
+    "compact": compact_indices,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT
+)
+"""
+
+_WORKERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_workers (
+    owner TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+)
+"""
+
+# Seconds between heartbeats of a queue (also how often orphaned jobs are recovered)
+_HEARTBEAT_SECONDS = 10
+
+# A queue without a heartbeat for this long is dead; its jobs are taken over
+_LEASE_SECONDS = 60
+
+_PROCESS_STARTED = time.time()
+
+
+class JobQueue:
+    """
+    Persistent background job queue backed by a local worker pool.
+    """
+    
+    def __init__(self, db_path=None, max_workers: Optional[int] = None):
+        """
+        Initialize job queue.
+        
+        Args:
+            db_path: SQLite job table path (default: settings.jobs_db_path)
+            max_workers: Worker threads (default: settings.ingest_workers)
+        """
+        self.db_path = db_path or settings.jobs_db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.ingest_workers,
+            thread_name_prefix="ingest-worker"
+        )
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._jobs_lock = threading.Lock()  # Guards _futures/_progress
+        self._futures: Dict[str, Future] = {}
+        self._progress: Dict[str, JobProgress] = {}
+        self._stopped = threading.Event()
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_WORKERS_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        
+        self._heartbeat()
+        self._recover()
+        threading.Thread(target=self._heartbeat_loop, name="job-queue-heartbeat", daemon=True).start()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it."""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _update(self, job_id: str, **fields):
+        """Update columns of a job row."""
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        values = [
+            json.dumps(v, default=str) if name in ("params", "progress", "result") and v is not None else v
+            for name, v in fields.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*values, job_id))
+    
+    def _heartbeat(self):
+        """Renew this queue's lease."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO job_workers (owner, heartbeat_at) VALUES (?, ?)",
+                (self.owner, time.time())
+            )
+    
+    def _heartbeat_loop(self):
+        """Renew the lease, forward cancellations and take over orphaned jobs."""
+        while not self._stopped.wait(_HEARTBEAT_SECONDS) or self._futures:
+            try:
+                self._heartbeat()
+                self._poll_cancellations()
+                if not self._stopped.is_set():
+                    self._recover()
+            except Exception as e:
+                logger.warning(f"Job queue heartbeat failed: {e}")
+    
+    def _poll_cancellations(self):
+        """Stop own running jobs cancelled through another worker."""
+        with self._jobs_lock:
+            live = dict(self._progress)
+        if not live:
+            return
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT job_id FROM jobs WHERE cancel_requested = 1 AND job_id IN ({', '.join('?' * len(live))})",
+                list(live)
+            ).fetchall()
+        for row in rows:
+            live[row["job_id"]].cancel()
+    
+    def _owner_running(self, owner: str, heartbeat_at: float) -> bool:
+        """Whether a queue's process may still run (checked directly on this host)."""
+        if owner == self.owner:
+            return True
+        host, pid, _ = owner.rsplit(":", 2)
+        if host != socket.gethostname():
+            return True  # Only the lease tells
+        if int(pid) == os.getpid():
+            # Another queue of this process, or an earlier run that had our PID (container restart)
+            return heartbeat_at >= _PROCESS_STARTED
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+    
+    def _recover(self):
+        """
+        Take over the jobs of dead queues (including this server's previous run).
+        
+        Their running jobs are failed and their queued jobs resubmitted
+        here; jobs of queues with a live lease are left alone.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # Serialize claims between workers
+            leases = conn.execute("SELECT owner, heartbeat_at FROM job_workers").fetchall()
+            alive = {
+                row["owner"] for row in leases
+                if row["heartbeat_at"] >= now - _LEASE_SECONDS
+                and self._owner_running(row["owner"], row["heartbeat_at"])
+            }
+            for row in leases:
+                if row["owner"] not in alive:
+                    conn.execute("DELETE FROM job_workers WHERE owner = ?", (row["owner"],))
+            
+            orphaned = [
+                row for row in conn.execute(
+                    "SELECT job_id, job_type, status, params, owner FROM jobs "
+                    "WHERE status IN ('queued', 'running') ORDER BY created_at"
+                ).fetchall()
+                if row["owner"] not in alive
+            ]
+            for row in orphaned:
+                if row["status"] == "running":
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE job_id = ?",
+                        ("Interrupted by server restart", now, row["job_id"])
+                    )
+                else:
+                    conn.execute("UPDATE jobs SET owner = ? WHERE job_id = ?", (self.owner, row["job_id"]))
+        
+        for row in orphaned:
+            if row["status"] == "queued":
+                logger.info(f"Resubmitting queued job {row['job_id']} ({row['job_type']})")
+                self._dispatch(row["job_id"], row["job_type"], json.loads(row["params"]))
+    
+    def submit(self, job_type: str, params: Dict[str, Any]) -> str:
+        """
+        Submit a job for background execution.
+        
+        Args:
+            job_type: One of JOB_HANDLERS
+            params: Keyword arguments for the job handler
+        
+        Returns:
+            New job ID
+        """
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        
+        job_id = str(uuid.uuid4())
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, job_type, status, params, progress, created_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, job_type, "queued", json.dumps(params),
+                    json.dumps(JobProgress().to_dict()), time.time(), self.owner
+                )
+            )
+        
+        self._dispatch(job_id, job_type, params)
+        logger.info(f"Submitted {job_type} job {job_id}")
+        return job_id
+    
+    def _dispatch(self, job_id: str, job_type: str, params: Dict[str, Any]):
+        progress = JobProgress(on_update=lambda p: self._update(job_id, progress=p.to_dict()))
+        # Registered under the lock _run's cleanup takes, so a job finishing
+        # before submit() returns cannot leave its entries behind
+        with self._jobs_lock:
+            self._progress[job_id] = progress
+            self._futures[job_id] = self.executor.submit(self._run, job_id, job_type, params, progress)
+    
+    def _run(self, job_id: str, job_type: str, params: Dict[str, Any], progress: JobProgress):
+        """Execute a job on a worker thread with its own event loop."""
+        try:
+            progress.check_cancelled()
+            
+            self._update(job_id, status="running", started_at=time.time())
+            progress.set_stage("starting")
+            
+            handler = JOB_HANDLERS[job_type]
+            result = asyncio.run(handler(**params, progress=progress))
+            
+            status = "succeeded" if result.get("success", True) else "failed"
+            self._update(
+                job_id,
+                status=status,
+                result=result,
+                error=None if status == "succeeded" else result.get("message"),
+                progress=progress.to_dict(),
+                finished_at=time.time()
+            )
+            logger.info(f"Job {job_id} finished: {status}")
+        
+        except JobCancelled:
+            self._update(job_id, status="cancelled", progress=progress.to_dict(), finished_at=time.time())
+            logger.info(f"Job {job_id} cancelled")
+        
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            self._update(job_id, status="failed", error=str(e), progress=progress.to_dict(), finished_at=time.time())
+        
+        finally:
+            with self._jobs_lock:
+                self._futures.pop(job_id, None)
+                self._progress.pop(job_id, None)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, with live progress if it runs in this process."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        
+        job = self._row_to_dict(row)
+        live = self._progress.get(job_id)
+        if live is not None and job["status"] == "running":
+            job["progress"] = live.to_dict()
+        return job
+    
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """List most recent jobs."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+    
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job.
+        
+        Queued jobs are cancelled immediately; running jobs stop at their
+        next progress checkpoint, before anything is written to the indices.
+        """
+        job = self.get(job_id)
+        if job is None or job["status"] not in ("queued", "running"):
+            return job
+        
+        self._update(job_id, cancel_requested=1)
+        
+        progress = self._progress.get(job_id)
+        if progress is not None:
+            progress.cancel()
+        
+        future = self._futures.get(job_id)
+        if job["status"] == "queued" and (future is None or future.cancel()):
+            self._update(job_id, status="cancelled", finished_at=time.time())
+        
+        return self.get(job_id)
+    
+    def shutdown(self):
+        """
+        Stop accepting work; running jobs are left to finish.
+        
+        Queued jobs are released for another worker (or the next start) to
+        take over.
+        """
+        self._stopped.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET owner = NULL WHERE owner = ? AND status = 'queued'", (self.owner,)
+            )
+    
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for name in ("params", "progress", "result"):
+            job[name] = json.loads(job[name]) if job[name] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+
+# Global job queue instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+def shutdown_job_queue():
+    """Shut down the global job queue if it was started."""
+    global _job_queue
+    if _job_queue is not None:
+        _job_queue.shutdown()
+        _job_queue = None
@@ -0,0 +1,144 @@
+"""
+Progress reporting and cooperative cancellation for ingestion work.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Raised inside ingestion code when its job has been cancelled."""
+    pass
+
+
+class JobProgress:
+    """
+    Progress handle passed into the ingestion pipeline.
+    
+    Tracks pages parsed and chunks embedded, estimates time remaining,
+    and lets the pipeline check for cancellation between units of work.
+    """
+    
+    def __init__(
+        self,
+        on_update: Optional[Callable[["JobProgress"], None]] = None,
+        flush_interval: float = 0.5
+    ):
+        """
+        Initialize progress handle.
+        
+        Args:
+            on_update: Called (throttled) whenever progress changes
+            flush_interval: Minimum seconds between on_update calls
+        """
+        self.stage = "queued"
+        self.files_parsed = 0
+        self.files_total: Optional[int] = None
+        self.pages_parsed = 0
+        self.pages_total: Optional[int] = None
+        self.chunks_embedded = 0
+        self.chunks_total: Optional[int] = None
+        self._stage_started_at = time.time()
+        self._on_update = on_update
+        self._flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._cancel_event = threading.Event()
+    
+    def set_stage(self, stage: str):
+        """Enter a new pipeline stage (parsing, embedding, indexing, ...)."""
+        self.stage = stage
+        self._stage_started_at = time.time()
+        self._notify(force=True)
+    
+    def set_files_total(self, files: int):
+        """Set the number of files a bulk job will parse."""
+        self.files_total = files
+        self._notify(force=True)
+    
+    def file_parsed(self, count: int = 1):
+        """Record parsed files."""
+        self.files_parsed += count
+        self._notify()
+    
+    def add_pages_total(self, pages: int):
+        """Add pages discovered in a document to the running total."""
+        self.pages_total = (self.pages_total or 0) + pages
+        self._notify()
+    
+    def page_parsed(self, count: int = 1):
+        """Record parsed pages."""
+        self.pages_parsed += count
+        self._notify()
+    
+    def set_chunks_total(self, chunks: int):
+        """Set the number of chunks that will be embedded."""
+        self.chunks_total = chunks
+        self.chunks_embedded = 0
+        self._notify(force=True)
+    
+    def chunks_done(self, count: int):
+        """Record embedded chunks."""
+        self.chunks_embedded += count
+        self._notify()
+    
+    def cancel(self):
+        """Request cancellation; honoured at the next check_cancelled()."""
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel_event.is_set():
+            raise JobCancelled("Job cancelled")
+    
+    def eta_seconds(self) -> Optional[float]:
+        """Estimate seconds left in the current stage from its observed rate."""
+        if self.stage == "embedding":
+            done, total = self.chunks_embedded, self.chunks_total
+        elif self.stage == "parsing" and self.files_total:
+            done, total = self.files_parsed, self.files_total
+        elif self.stage == "parsing":
+            done, total = self.pages_parsed, self.pages_total
+        else:
+            return None
+        
+        if not total or not done:
+            return None
+        
+        elapsed = time.time() - self._stage_started_at
+        rate = done / elapsed if elapsed > 0 else 0
+        if rate <= 0:
+            return None
+        return round(max(total - done, 0) / rate, 1)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize progress for storage and API responses."""
+        return {
+            "stage": self.stage,
+            "files_parsed": self.files_parsed,
+            "files_total": self.files_total,
+            "pages_parsed": self.pages_parsed,
+            "pages_total": self.pages_total,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_total": self.chunks_total,
+            "eta_seconds": self.eta_seconds()
+        }
+    
+    def _notify(self, force: bool = False):
+        if self._on_update is None:
+            return
+        now = time.time()
+        if force or now - self._last_flush >= self._flush_interval:
+            self._last_flush = now
+            self._on_update(self)
+
+
+class NullProgress(JobProgress):
+    """Progress handle for direct (non-job) calls; never cancelled."""
+    
+    def __init__(self):
+        super().__init__(on_update=None)
@@ -0,0 +1,312 @@
+"""
+Incremental readers for large scraped sources (HTML tables, JSON/JSONL dumps).
+
+Files are read in fixed-size blocks and rows are yielded as soon as they
+are complete, so memory use does not grow with the file: HTML is fed to
+an event-based parser (no DOM), JSONL is read line by line, and a JSON
+array is decoded one element at a time.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+from html.parser import HTMLParser
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Source types read by these streaming readers
+STREAMED_TYPES = ("html", "json")
+
+# Characters read from the file per step
+_BLOCK_CHARS = 1 << 16
+
+# Tags whose text is never content
+_SKIP_TAGS = {"head", "script", "style", "noscript", "template", "svg"}
+
+# Tags that end a block of running text
+_BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "dl", "dt", "dd", "section", "article",
+    "header", "footer", "main", "aside", "nav", "blockquote", "pre", "hr",
+    "h1", "h2", "h3", "h4", "h5", "h6"
+}
+
+# Block tags whose text is a section title
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# Cell values treated as missing (pandas writes NaN/None into HTML exports)
+_MISSING_VALUES = {"", "nan", "none", "null"}
+
+
+def _column_names(header: List[str], width: int) -> List[str]:
+    """Unique column names, generated where the header is missing or blank."""
+    names = []
+    for position in range(width):
+        name = header[position] if position < len(header) else ""
+        name = name or f"column_{position + 1}"
+        if name in names:
+            name = f"{name}_{position + 1}"
+        names.append(name)
+    return names
+
+
+class _HTMLStreamParser(HTMLParser):
+    """
+    Collects table rows and running text as events while HTML is fed in.
+    
+    Only top-level tables are split into rows; the text of nested tables
+    belongs to the enclosing cell.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events: List[Tuple] = []
+        self._skip = 0
+        self._tables = 0
+        self._table_index = -1
+        self._caption: Optional[List[str]] = None
+        self._table_name: Optional[str] = None
+        self._columns: Optional[List[str]] = None
+        self._row: Optional[List[str]] = None
+        self._row_is_header = False
+        self._cell: Optional[List[str]] = None
+        self._text: List[str] = []
+        self._in_heading = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "table":
+            self._tables += 1
+            if self._tables == 1:
+                self._flush_text()
+                self._table_index += 1
+                self._table_name = None
+                self._columns = None
+        elif self._tables == 1:
+            if tag == "caption":
+                self._caption = []
+            elif tag == "tr":
+                self._end_row()
+                self._row = []
+                self._row_is_header = True
+            elif tag in ("td", "th"):
+                self._end_cell()
+                if self._row is None:
+                    self._row = []
+                    self._row_is_header = True
+                self._row_is_header = self._row_is_header and tag == "th"
+                self._cell = []
+        elif not self._tables and tag in _BLOCK_TAGS:
+            self._flush_text()
+            if tag in _HEADING_TAGS:
+                self._in_heading = True
+    
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "table":
+            if self._tables == 1:
+                self._end_row()
+            self._tables = max(self._tables - 1, 0)
+        elif self._tables == 1:
+            if tag in ("td", "th"):
+                self._end_cell()
+            elif tag == "tr":
+                self._end_row()
+            elif tag == "caption" and self._caption is not None:
+                self._table_name = " ".join("".join(self._caption).split()) or None
+                self._caption = None
+        elif not self._tables and tag in _BLOCK_TAGS:
+            self._flush_text()
+            if tag in _HEADING_TAGS:
+                self._in_heading = False
+    
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._cell is not None:
+            self._cell.append(data)
+        elif self._caption is not None:
+            self._caption.append(data)
+        elif not self._tables:
+            self._text.append(data)
+    
+    def close(self):
+        super().close()
+        self._end_row()
+        self._flush_text()
+    
+    def _end_cell(self):
+        if self._cell is not None and self._row is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+        self._cell = None
+    
+    def _end_row(self):
+        self._end_cell()
+        row, self._row = self._row, None
+        if not row:
+            return
+        
+        if self._row_is_header and self._columns is None:
+            self._columns = _column_names(row, len(row))
+            return
+        if self._columns is None:
+            self._columns = _column_names([], len(row))
+        elif self._row_is_header and row == self._columns[:len(row)]:
+            return  # Header repeated within a long table
+        
+        width = len(self._columns)
+        values = [None if value.lower() in _MISSING_VALUES else value for value in row[:width]]
+        values += [None] * (width - len(values))
+        self.events.append(("row", self._table_index, self._table_name, self._columns, values))
+    
+    def _flush_text(self):
+        text = " ".join("".join(self._text).split())
+        if text:
+            self.events.append(("heading" if self._in_heading else "text", text))
+        self._text = []
+
+
+def iter_html(file_path: str) -> Iterator[Tuple]:
+    """
+    Stream the content of an HTML page.
+    
+    Args:
+        file_path: Path to HTML file
+    
+    Yields:
+        ("row", table_index, table_name, columns, values) for each data row
+        of a top-level table (values are strings, None where missing; the
+        table name is its caption, if any), ("heading", text) for each h1-h6
+        and ("text", text) for each block of other text outside tables, in
+        document order
+    """
+    parser = _HTMLStreamParser()
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            block = f.read(_BLOCK_CHARS)
+            if not block:
+                break
+            parser.feed(block)
+            yield from parser.events
+            parser.events = []
+    parser.close()
+    yield from parser.events
+
+
+def iter_json_records(file_path: str) -> Iterator[Any]:
+    """
+    Stream the records of a JSON or JSONL file.
+    
+    A .json file holding an array yields its elements one at a time; any
+    other JSON value is yielded whole.
+    
+    Args:
+        file_path: Path to .json or .jsonl file
+    
+    Yields:
+        Decoded records
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        if Path(file_path).suffix.lower() == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        
+        buffer = f.read(_BLOCK_CHARS).lstrip()
+        if not buffer.startswith("["):
+            yield json.loads(buffer + f.read())
+            return
+        
+        decoder = json.JSONDecoder()
+        position = 1
+        exhausted = False
+        while True:
+            # Skip separators, reading on when the buffer runs out
+            while position < len(buffer) and buffer[position] in ", \t\r\n":
+                position += 1
+            if position >= len(buffer) or not exhausted and len(buffer) - position < _BLOCK_CHARS // 2:
+                block = f.read(max(_BLOCK_CHARS, len(buffer) - position))
+                exhausted = not block
+                buffer = buffer[position:] + block
+                position = 0
+                if not buffer:
+                    raise ValueError(f"Unterminated JSON array in {file_path}")
+                continue
+            if buffer[position] == "]":
+                return
+            
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                end = len(buffer)
+            if end >= len(buffer) and not exhausted:
+                # The record may run past the buffer: read more and decode again
+                block = f.read(max(_BLOCK_CHARS, len(buffer) - position))
+                exhausted = not block
+                buffer = buffer[position:] + block
+                position = 0
+                continue
+            yield record
+            position = end
+
+
+def flatten_record(record: Any, prefix: str = "") -> Dict[str, Optional[str]]:
+    """
+    Flatten a JSON record into a row of text values.
+    
+    Nested objects become dotted columns ("funding.amount"), lists of
+    scalars are joined with ", " and other lists are kept as JSON text.
+    
+    Args:
+        record: Decoded JSON record
+        prefix: Column prefix of a nested object
+    
+    Returns:
+        {column: value}, None where the value is null
+    """
+    if not isinstance(record, dict):
+        record = {"value": record}
+    
+    row: Dict[str, Optional[str]] = {}
+    for key, value in record.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            row.update(flatten_record(value, f"{column}."))
+        elif isinstance(value, list):
+            if all(not isinstance(item, (dict, list)) for item in value):
+                row[column] = ", ".join(str(item) for item in value if item is not None) or None
+            else:
+                row[column] = json.dumps(value, ensure_ascii=False)
+        elif value is None or isinstance(value, str) and value.strip().lower() in _MISSING_VALUES:
+            row[column] = None
+        else:
+            row[column] = str(value)
+    return row
+
+
+def iter_table_rows(file_path: str, document_type: str) -> Iterator[Tuple[int, Optional[str], Dict[str, Optional[str]]]]:
+    """
+    Stream the table rows of an HTML page or JSON/JSONL dump.
+    
+    Args:
+        file_path: Path to file
+        document_type: html or json
+    
+    Yields:
+        (table index within the file, table name or None, {column: value})
+    """
+    if document_type == "html":
+        for event in iter_html(file_path):
+            if event[0] == "row":
+                _, table_index, table_name, columns, values = event
+                yield table_index, table_name, dict(zip(columns, values))
+    elif document_type == "json":
+        for record in iter_json_records(file_path):
+            yield 0, None, flatten_record(record)
+    else:
+        raise ValueError(f"Not a streamed document type: {document_type}")
@@ -1,17 +1,33 @@
 """
-Structured data parser for CSV and Excel files.
+Structured data parser for CSV and Excel files, HTML tables, JSON/JSONL
+record dumps and Q&A sets.
+
+Row chunks only reference their source row by (table_id, row_index); the
+row values themselves live column-wise in the table store and are looked
+up when sources are returned. HTML and JSON sources are parsed row by row
+rather than loaded whole, but the chunks of a document are still collected
+in a list (and embedded and indexed together), so ingestion memory grows
+with the number of rows.
 """
 
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Mapping, Optional
 import logging
 from pathlib import Path
 import pandas as pd
 
+from backend.retriever.filters import derive_year
+from backend.ingestion.chunker import TextChunker
+from backend.ingestion.faq_store import read_qa_records
+from backend.ingestion.stream_readers import flatten_record, iter_html, iter_json_records
+
 logger = logging.getLogger(__name__)
 
+# Text blocks of an HTML page buffered before they are chunked
+_TEXT_BUFFER_BLOCKS = 256
+
 
 class StructuredDataParser:
-    """Parse structured data (CSV, Excel) into text chunks."""
+    """Parse structured data (CSV, Excel, HTML tables, JSON, Q&A sets) into text chunks."""
     
     def __init__(self):
         """Initialize structured data parser."""
@@ -36,14 +52,16 @@ class StructuredDataParser:
                 # Convert row to natural language text
                 row_text = self._row_to_text(row, df.columns)
                 
+                metadata = {
+                    "document": Path(file_path).name,
+                    "type": "csv",
+                    "row_index": int(idx)
+                }
+                self._add_row_year(metadata, row)
+                
                 chunks.append({
                     "content": row_text,
-                    "metadata": {
-                        "document": Path(file_path).name,
-                        "type": "csv",
-                        "row_index": int(idx),
-                        "structured_data": row.to_dict()
-                    }
+                    "metadata": metadata
                 })
             
             logger.info(f"Processed CSV: {len(chunks)} rows from {file_path}")
@@ -67,15 +85,16 @@ class StructuredDataParser:
         chunks = []
         
         try:
+            excel_file = pd.ExcelFile(file_path)
             if sheet_name:
                 df = pd.read_excel(file_path, sheet_name=sheet_name)
-                chunks.extend(self._process_dataframe(df, Path(file_path).name, sheet_name))
+                sheet_index = excel_file.sheet_names.index(sheet_name)
+                chunks.extend(self._process_dataframe(df, Path(file_path).name, sheet_name, sheet_index))
             else:
                 # Process all sheets
-                excel_file = pd.ExcelFile(file_path)
-                for sheet in excel_file.sheet_names:
+                for sheet_index, sheet in enumerate(excel_file.sheet_names):
                     df = pd.read_excel(file_path, sheet_name=sheet)
-                    chunks.extend(self._process_dataframe(df, Path(file_path).name, sheet))
+                    chunks.extend(self._process_dataframe(df, Path(file_path).name, sheet, sheet_index))
             
             logger.info(f"Processed Excel: {len(chunks)} rows from {file_path}")
             
@@ -84,7 +103,13 @@ class StructuredDataParser:
         
         return chunks
     
-    def _process_dataframe(self, df: pd.DataFrame, document_name: str, sheet_name: str = None) -> List[Dict[str, Any]]:
+    def _process_dataframe(
+        self,
+        df: pd.DataFrame,
+        document_name: str,
+        sheet_name: str = None,
+        sheet_index: int = 0
+    ) -> List[Dict[str, Any]]:
         """Process DataFrame into chunks."""
         chunks = []
         
@@ -95,8 +120,9 @@ class StructuredDataParser:
                 "document": document_name,
                 "type": "excel",
                 "row_index": int(idx),
-                "structured_data": row.to_dict()
+                "sheet_index": sheet_index
             }
+            self._add_row_year(metadata, row)
             
             if sheet_name:
                 metadata["sheet_name"] = sheet_name
@@ -108,6 +134,102 @@ class StructuredDataParser:
         
         return chunks
     
+    def iter_html_chunks(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream an HTML page into chunks.
+        
+        Args:
+            file_path: Path to HTML file
+        
+        Yields:
+            One chunk per table row as it is parsed, and the text outside
+            tables (page titles, notes, articles) chunked by heading like a
+            TXT file; text is chunked at each heading and table and every
+            _TEXT_BUFFER_BLOCKS blocks, so it is never buffered to the end
+        """
+        document = Path(file_path).name
+        chunker = TextChunker()
+        text_blocks = []
+        row_counts: Dict[int, int] = {}
+        
+        def text_chunks() -> Iterator[Dict[str, Any]]:
+            for piece in chunker.chunk_blocks(text_blocks):
+                metadata = {"document": document, "type": "html"}
+                if piece["section"]:
+                    metadata["section"] = piece["section"]
+                yield {"content": piece["content"], "metadata": metadata}
+            text_blocks.clear()
+        
+        for event in iter_html(file_path):
+            if event[0] in ("heading", "text"):
+                if event[0] == "heading" or len(text_blocks) >= _TEXT_BUFFER_BLOCKS:
+                    yield from text_chunks()
+                text_blocks.append(event)
+                continue
+            if text_blocks:
+                yield from text_chunks()
+            
+            _, table_index, table_name, columns, values = event
+            row_index = row_counts.get(table_index, 0)
+            row_counts[table_index] = row_index + 1
+            chunk = self._row_chunk(document, "html", dict(zip(columns, values)), row_index, table_index, table_name)
+            if chunk:
+                yield chunk
+        
+        yield from text_chunks()
+    
+    def iter_json_chunks(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a JSON/JSONL record dump into chunks.
+        
+        Args:
+            file_path: Path to .json (array of records) or .jsonl file
+        
+        Yields:
+            One chunk per record as it is decoded
+        """
+        document = Path(file_path).name
+        for row_index, record in enumerate(iter_json_records(file_path)):
+            chunk = self._row_chunk(document, "json", flatten_record(record), row_index, 0, None)
+            if chunk:
+                yield chunk
+    
+    def _row_chunk(
+        self,
+        document_name: str,
+        data_type: str,
+        row: Mapping[str, Optional[str]],
+        row_index: int,
+        sheet_index: int,
+        sheet_name: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Row chunk of a streamed table (None if the row is empty)."""
+        row_text = ". ".join(f"{column}: {value}" for column, value in row.items() if value is not None)
+        if not row_text:
+            return None
+        
+        metadata = {
+            "document": document_name,
+            "type": data_type,
+            "row_index": row_index,
+            "sheet_index": sheet_index
+        }
+        self._add_row_year(metadata, row)
+        
+        if sheet_name:
+            metadata["sheet_name"] = sheet_name
+        
+        return {
+            "content": row_text,
+            "metadata": metadata
+        }
+    
+    def _add_row_year(self, metadata: Dict[str, Any], row: Mapping[str, Any]):
+        """Record the year of a row's year/date column for filtering."""
+        year = derive_year({}, row)
+        if year is not None:
+            metadata["year"] = year
+    
     def _row_to_text(self, row: pd.Series, columns: pd.Index) -> str:
         """
         Convert DataFrame row to natural language text.
@@ -133,13 +255,63 @@ class StructuredDataParser:
         
         return ". ".join(text_parts)
     
+    def process_qa(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Process a JSON/JSONL Q&A set.
+        
+        Args:
+            file_path: Path to file with question/answer or term/definition records
+        
+        Returns:
+            List of chunks (one per Q&A pair) with metadata
+        """
+        chunks = []
+        
+        try:
+            for record in read_qa_records(file_path):
+                metadata = {
+                    "document": Path(file_path).name,
+                    "type": "qa",
+                    "faq_id": record["faq_id"]
+                }
+                if record["category"]:
+                    metadata["section"] = record["category"]
+                    metadata["category"] = record["category"]
+                
+                chunks.append({
+                    "content": f"Question: {record['question']}\nAnswer: {record['answer']}",
+                    "metadata": metadata
+                })
+            
+            logger.info(f"Processed Q&A set: {len(chunks)} pairs from {file_path}")
+            
+        except Exception as e:
+            logger.error(f"Error processing Q&A set: {e}")
+        
+        return chunks
+    
+    def _collect_streamed(self, file_path: str, data_type: str) -> List[Dict[str, Any]]:
+        """All chunks of a streamed HTML/JSON source, for indexing (held in memory)."""
+        chunks = []
+        
+        try:
+            stream = self.iter_html_chunks(file_path) if data_type == "html" else self.iter_json_chunks(file_path)
+            chunks.extend(stream)
+            
+            logger.info(f"Processed {data_type.upper()}: {len(chunks)} chunks from {file_path}")
+            
+        except Exception as e:
+            logger.error(f"Error processing {data_type.upper()}: {e}")
+        
+        return chunks
+    
     def process_structured_data(self, file_path: str, data_type: str) -> List[Dict[str, Any]]:
         """
         Process structured data file.
         
         Args:
             file_path: Path to file
-            data_type: Type (csv, excel)
+            data_type: Type (csv, excel, html, json)
         
         Returns:
             List of chunks with metadata
@@ -148,6 +320,8 @@ class StructuredDataParser:
             return self.process_csv(file_path)
         elif data_type == "excel":
             return self.process_excel(file_path)
+        elif data_type in ("html", "json"):
+            return self._collect_streamed(file_path, data_type)
         else:
             logger.error(f"Unsupported structured data type: {data_type}")
             return []
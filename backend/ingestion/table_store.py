@@ -0,0 +1,483 @@
+"""
+Columnar store for structured (CSV/Excel/HTML/JSON) sources.
+
+Each sheet of a structured document is kept as a typed Parquet table so
+aggregate and filter questions can be answered with vectorized pandas
+operations instead of retrieving thousands of row chunks. The untyped
+source rows are kept column-wise next to it; row chunks in the index only
+carry a (table_id, row_index) reference into them.
+
+HTML tables and JSON/JSONL record dumps are streamed into Parquet in row
+batches, with column types fixed by the first batch, so the table store
+holds one batch of a large scraped file at a time (its row chunks are
+still indexed together).
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.config import settings
+from backend.ingestion.stream_readers import STREAMED_TYPES, iter_table_rows
+
+logger = logging.getLogger(__name__)
+
+# Share of non-null values that must parse for a column to be typed
+_TYPE_THRESHOLD = 0.7
+
+# Tables kept in memory by the query-side store
+_CACHE_SIZE = 32
+
+# Rows typed and written per batch when streaming HTML/JSON tables
+_STREAM_BATCH_ROWS = 5000
+
+# Rows per Parquet row group; a source row is read with its row group only
+_ROW_GROUP_ROWS = 5000
+
+_CURRENCY_RE = re.compile(r"(us\$|usd|inr|rs\.?|₹|\$|€|£)", re.IGNORECASE)
+_AMOUNT_RE = re.compile(
+    r"^(-?\d+(?:\.\d+)?)\s*(k|thousand|m|mn|million|b|bn|billion|cr|crore|crores|l|lac|lakh|lakhs)?$",
+    re.IGNORECASE
+)
+_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mn": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "l": 1e5, "lac": 1e5, "lakh": 1e5, "lakhs": 1e5
+}
+
+
+def parse_amount(value: Any) -> float:
+    """
+    Parse a numeric or money-like value ("$1,200,000", "Rs 124.5 crore", "$1.39M").
+    
+    Returns:
+        Parsed number, or NaN if the value is not numeric
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    
+    text = _CURRENCY_RE.sub("", str(value)).replace(",", "").strip()
+    match = _AMOUNT_RE.match(text)
+    if not match:
+        return np.nan
+    
+    number = float(match.group(1))
+    suffix = (match.group(2) or "").lower()
+    return number * _MULTIPLIERS.get(suffix, 1.0)
+
+
+def infer_column_kinds(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Decide the type of each column from the data.
+    
+    Args:
+        df: Raw DataFrame as read from the source
+    
+    Returns:
+        {column: kind}, kind being "native" (already numeric or datetime),
+        "number" (money and counts), "date" or "string"
+    """
+    kinds = {}
+    for column in df.columns:
+        series = df[column]
+        
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            kinds[column] = "native"
+            continue
+        
+        non_null = series.dropna()
+        if non_null.empty:
+            kinds[column] = "string"
+            continue
+        
+        numbers = non_null.map(parse_amount)
+        if numbers.notna().mean() >= _TYPE_THRESHOLD:
+            kinds[column] = "number"
+            continue
+        
+        kinds[column] = "string"
+        if "date" in str(column).strip().lower():
+            dates = pd.to_datetime(non_null.astype(str), errors="coerce", dayfirst=True, format="mixed")
+            if dates.notna().mean() >= _TYPE_THRESHOLD:
+                kinds[column] = "date"
+    
+    return kinds
+
+
+def apply_column_kinds(df: pd.DataFrame, kinds: Dict[str, str]) -> pd.DataFrame:
+    """
+    Convert columns to the kinds chosen by infer_column_kinds.
+    
+    Args:
+        df: Raw DataFrame
+        kinds: {column: kind}
+    
+    Returns:
+        Typed copy of the DataFrame
+    """
+    typed = pd.DataFrame(index=df.index)
+    
+    for column in df.columns:
+        series = df[column]
+        name = str(column).strip() or "column"
+        kind = kinds.get(column, "string")
+        
+        if kind == "native":
+            typed[name] = series
+        elif kind == "number":
+            typed[name] = series.map(parse_amount).astype("float64")
+        elif kind == "date":
+            typed[name] = pd.to_datetime(series.astype("string"), errors="coerce", dayfirst=True, format="mixed")
+        else:
+            typed[name] = series.astype("string").str.strip()
+    
+    return typed
+
+
+def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give text columns real types where the data allows it.
+    
+    Money and count columns become float, date columns become datetime;
+    everything else stays as string.
+    
+    Args:
+        df: Raw DataFrame as read from CSV/Excel
+    
+    Returns:
+        Typed copy of the DataFrame
+    """
+    return apply_column_kinds(df, infer_column_kinds(df))
+
+
+def _source_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Source values as read, with mixed-type columns stored as strings."""
+    rows = df.copy()
+    rows.columns = [str(c) for c in rows.columns]
+    for column in rows.columns:
+        if rows[column].dtype == object:
+            rows[column] = rows[column].astype("string")
+    return rows
+
+
+def read_tables(file_path: str, document_type: str) -> List[Tuple[Optional[str], pd.DataFrame]]:
+    """
+    Read the raw tables of a structured file.
+    
+    Returns:
+        List of (sheet_name, DataFrame); sheet_name is None for CSV
+    """
+    if document_type == "csv":
+        return [(None, pd.read_csv(file_path))]
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    return list(sheets.items())
+
+
+class _StreamedTable:
+    """
+    One table of a streamed source, written to Parquet in row batches.
+    """
+    
+    def __init__(self, root: Path, table_id: str, sheet_name: Optional[str]):
+        self.table_id = table_id
+        self.sheet_name = sheet_name
+        self.rows = 0
+        self.columns: Optional[List[str]] = None
+        self.dtypes: Optional[pd.Series] = None
+        self._kinds: Optional[Dict[str, str]] = None
+        self._batch: List[Dict[str, Optional[str]]] = []
+        self._files = [root / f"{table_id}.rows.parquet", root / f"{table_id}.parquet"]
+        self._writers: Optional[List[pq.ParquetWriter]] = None
+    
+    def add(self, row: Dict[str, Optional[str]]):
+        """Queue a row, writing a batch when enough rows are queued."""
+        self._batch.append(row)
+        if len(self._batch) >= _STREAM_BATCH_ROWS:
+            self._flush()
+    
+    def _flush(self):
+        if not self._batch:
+            return
+        if self.columns is None:
+            # Columns and their types are fixed by the first batch
+            self.columns = list(dict.fromkeys(column for row in self._batch for column in row))
+        
+        source = pd.DataFrame.from_records(self._batch, columns=self.columns).astype("string")
+        if self._kinds is None:
+            self._kinds = infer_column_kinds(source)
+        typed = apply_column_kinds(source, self._kinds)
+        
+        frames = [source, typed]
+        if self._writers is None:
+            self.dtypes = typed.dtypes
+            tables = [pa.Table.from_pandas(frame, preserve_index=False) for frame in frames]
+            self._writers = [
+                pq.ParquetWriter(path.with_suffix(".tmp"), table.schema)
+                for path, table in zip(self._files, tables)
+            ]
+        else:
+            tables = [
+                pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False)
+                for frame, writer in zip(frames, self._writers)
+            ]
+        
+        for writer, table in zip(self._writers, tables):
+            writer.write_table(table)
+        self.rows += len(source)
+        self._batch = []
+    
+    def close(self):
+        """Write the remaining rows and move the finished files into place."""
+        self._flush()
+        for writer, path in zip(self._writers or [], self._files):
+            writer.close()
+            os.replace(path.with_suffix(".tmp"), path)
+        self._writers = None
+    
+    def abort(self):
+        """Discard the partially written files."""
+        for writer, path in zip(self._writers or [], self._files):
+            writer.close()
+            path.with_suffix(".tmp").unlink(missing_ok=True)
+        self._writers = None
+
+
+class TableStore:
+    """
+    Parquet tables plus a JSON catalog entry per table.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Initialize table store.
+        
+        Args:
+            root: Table directory (default: settings.table_store_path)
+        """
+        self.root = root or settings.table_store_path
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[str, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._catalog: Optional[List[Dict[str, Any]]] = None
+        self._catalog_mtime: Optional[float] = None
+    
+    @staticmethod
+    def table_id(document_id: str, sheet_index: int = 0) -> str:
+        """Table ID for a sheet of a document."""
+        return f"{document_id}-{sheet_index}"
+    
+    def save_document(
+        self,
+        document_id: str,
+        file_path: str,
+        document_type: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Store all tables of a structured document, replacing earlier versions.
+        
+        Args:
+            document_id: Document ID
+            file_path: Path to CSV/Excel/HTML/JSON file
+            document_type: csv, excel, html or json
+            metadata: Document metadata recorded in the catalog
+        
+        Returns:
+            Catalog entries of the stored tables
+        """
+        self.delete_document(document_id)
+        
+        if document_type in STREAMED_TYPES:
+            tables = self._write_streamed(document_id, file_path, document_type)
+        else:
+            tables = []
+            for sheet_index, (sheet_name, df) in enumerate(read_tables(file_path, document_type)):
+                table_id = self.table_id(document_id, sheet_index)
+                typed = coerce_types(df)
+                
+                self._write(_source_rows(df), self.root / f"{table_id}.rows.parquet")
+                self._write(typed, self.root / f"{table_id}.parquet")
+                tables.append((table_id, sheet_name, len(typed), typed.dtypes))
+        
+        entries = []
+        for table_id, sheet_name, rows, dtypes in tables:
+            entry = {
+                "table_id": table_id,
+                "document_id": document_id,
+                "document": Path(file_path).name,
+                "sheet_name": sheet_name,
+                "rows": rows,
+                "columns": [{"name": c, "dtype": str(dtype)} for c, dtype in dtypes.items()],
+                "metadata": metadata or {}
+            }
+            with open(self.root / f"{table_id}.json", "w") as f:
+                json.dump(entry, f, indent=2, default=str)
+            entries.append(entry)
+        
+        logger.info(f"Stored {len(entries)} tables for {Path(file_path).name}")
+        return entries
+    
+    def _write_streamed(
+        self,
+        document_id: str,
+        file_path: str,
+        document_type: str
+    ) -> List[Tuple[str, Optional[str], int, pd.Series]]:
+        """Stream the tables of an HTML/JSON source into Parquet, batch by batch."""
+        tables: Dict[int, _StreamedTable] = {}
+        try:
+            for sheet_index, sheet_name, row in iter_table_rows(file_path, document_type):
+                table = tables.get(sheet_index)
+                if table is None:
+                    table = tables[sheet_index] = _StreamedTable(
+                        self.root, self.table_id(document_id, sheet_index), sheet_name
+                    )
+                table.add(row)
+            for table in tables.values():
+                table.close()
+        except Exception:
+            for table in tables.values():
+                table.abort()
+            self.delete_document(document_id)
+            raise
+        
+        return [(table.table_id, table.sheet_name, table.rows, table.dtypes) for table in tables.values()]
+    
+    @staticmethod
+    def _write(df: pd.DataFrame, parquet_file: Path):
+        tmp_file = parquet_file.with_suffix(".tmp")
+        df.to_parquet(tmp_file, index=False, row_group_size=_ROW_GROUP_ROWS)
+        os.replace(tmp_file, parquet_file)
+    
+    def delete_document(self, document_id: str):
+        """Remove all tables of a document."""
+        for path in self.root.glob(f"{document_id}-*"):
+            path.unlink(missing_ok=True)
+    
+    def has_document(self, document_id: str) -> bool:
+        """Whether tables (including source rows) are stored for a document."""
+        return any(self.root.glob(f"{document_id}-*.rows.parquet"))
+    
+    def catalog(self) -> List[Dict[str, Any]]:
+        """Catalog entries of all stored tables (re-read when the directory changes)."""
+        mtime = self.root.stat().st_mtime
+        with self._lock:
+            if self._catalog is None or mtime != self._catalog_mtime:
+                entries = []
+                for path in sorted(self.root.glob("*.json")):
+                    try:
+                        with open(path, "r") as f:
+                            entries.append(json.load(f))
+                    except Exception as e:
+                        logger.warning(f"Skipping unreadable table catalog {path.name}: {e}")
+                self._catalog = entries
+                self._catalog_mtime = mtime
+            return self._catalog
+    
+    def load(self, table_id: str) -> Optional[pd.DataFrame]:
+        """Load a typed table, served from memory while the file is unchanged."""
+        return self._read(f"{table_id}.parquet")
+    
+    def modified(self, table_id: str) -> Optional[float]:
+        """Modification time of a typed table (None if it does not exist)."""
+        try:
+            return (self.root / f"{table_id}.parquet").stat().st_mtime
+        except OSError:
+            return None
+    
+    def row(self, table_id: str, row_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild one source row as a dict.
+        
+        Args:
+            table_id: Table ID
+            row_index: Row position in the source sheet
+        
+        Returns:
+            {column: value} with missing values as None, or None if unavailable
+        """
+        return self.rows(table_id, [row_index]).get(row_index)
+    
+    def rows(self, table_id: str, row_indices: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Rebuild source rows as dicts, reading only the row groups holding them.
+        
+        Args:
+            table_id: Table ID
+            row_indices: Row positions in the source sheet
+        
+        Returns:
+            {row_index: {column: value}} with missing values as None; rows
+            that are unavailable are left out
+        """
+        try:
+            parquet_file = pq.ParquetFile(self.root / f"{table_id}.rows.parquet")
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.debug(f"No source rows for {table_id}: {e}")
+            return {}
+        
+        # First row of each row group
+        starts = [0]
+        for group in range(parquet_file.num_row_groups):
+            starts.append(starts[-1] + parquet_file.metadata.row_group(group).num_rows)
+        
+        wanted: Dict[int, List[int]] = {}
+        for row_index in set(row_indices):
+            if 0 <= row_index < starts[-1]:
+                group = int(np.searchsorted(starts, row_index, side="right")) - 1
+                wanted.setdefault(group, []).append(row_index)
+        
+        records = {}
+        for group, indices in wanted.items():
+            table = parquet_file.read_row_group(group)
+            for row_index in indices:
+                records[row_index] = table.slice(row_index - starts[group], 1).to_pylist()[0]
+        return records
+    
+    def _read(self, file_name: str) -> Optional[pd.DataFrame]:
+        parquet_file = self.root / file_name
+        try:
+            mtime = parquet_file.stat().st_mtime
+        except OSError:
+            return None
+        
+        with self._lock:
+            cached = self._tables.get(file_name)
+            if cached is not None and cached[0] == mtime:
+                self._tables.move_to_end(file_name)
+                return cached[1]
+        
+        df = pd.read_parquet(parquet_file)
+        
+        with self._lock:
+            self._tables[file_name] = (mtime, df)
+            self._tables.move_to_end(file_name)
+            while len(self._tables) > _CACHE_SIZE:
+                self._tables.popitem(last=False)
+        return df
+
+
+# Global table store instance
+_table_store: Optional[TableStore] = None
+
+
+def get_table_store() -> TableStore:
+    """Get or create global table store instance."""
+    global _table_store
+    if _table_store is None:
+        _table_store = TableStore()
+    return _table_store
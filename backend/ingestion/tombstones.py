@@ -0,0 +1,77 @@
+"""
+Tombstone store for deleted chunks.
+Deleted chunks stay in the on-disk indices until compaction, and are
+filtered out at query time using this list of chunk IDs.
+"""
+
+from typing import Iterable, Optional, Set
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+class TombstoneStore:
+    """
+    Persistent set of deleted chunk IDs, stored next to the FAISS index.
+    """
+    
+    def __init__(self, index_path: Optional[Path] = None):
+        """
+        Initialize tombstone store.
+        
+        Args:
+            index_path: Index directory (default: settings.faiss_index_path)
+        """
+        self.path = (index_path or settings.faiss_index_path) / "tombstones.json"
+    
+    def load(self) -> Set[str]:
+        """Load tombstoned chunk IDs."""
+        if not self.path.exists():
+            return set()
+        try:
+            with open(self.path, "r") as f:
+                return set(json.load(f))
+        except Exception as e:
+            logger.warning(f"Error reading tombstones: {e}")
+            return set()
+    
+    def add(self, chunk_ids: Iterable[str]) -> Set[str]:
+        """
+        Tombstone chunk IDs.
+        
+        Returns:
+            Full tombstone set after the update
+        """
+        with _lock:
+            tombstones = self.load()
+            tombstones.update(chunk_ids)
+            self._write(tombstones)
+        return tombstones
+    
+    def clear(self):
+        """Remove all tombstones (after compaction or a full rebuild)."""
+        with _lock:
+            self.path.unlink(missing_ok=True)
+    
+    def mtime(self) -> Optional[float]:
+        """Modification time of the tombstone file, or None if absent."""
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+    
+    def _write(self, tombstones: Set[str]):
+        # Write-then-rename so readers never see a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(sorted(tombstones), f)
+        os.replace(tmp_file, self.path)
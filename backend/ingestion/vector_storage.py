@@ -0,0 +1,256 @@
+"""
+Vector storage modes for the dense index.
+
+The FAISS index can keep embeddings as exact float32 vectors or in a
+compressed form to fit more chunks in the same RAM budget:
+
+    flat  float32, exact                       4 bytes per dimension
+    fp16  half-precision scalar quantizer      2 bytes per dimension
+    sq8   8-bit scalar quantizer (trained)     1 byte per dimension
+    pq    product quantizer (trained)          1 byte per subquantizer
+    hnsw  float32 plus an HNSW graph           faster, approximate search
+
+Independently, the metric is either "l2" (raw embeddings, L2 distance) or
+"cosine" (L2-normalized embeddings, inner product), where search scores
+are cosine similarities that can be compared against a fixed threshold.
+
+All modes are wrapped in an IndexIDMap2 with chunk positions as IDs, so
+tombstone filtering and reconstruction work the same way for every mode.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+import time
+
+import faiss
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+STORAGE_MODES = ("flat", "fp16", "sq8", "pq", "hnsw")
+METRICS = ("l2", "cosine")
+
+# PQ trains 256 centroids per subquantizer; below this it falls back to sq8
+_MIN_PQ_TRAINING = 1024
+
+# Upper bound on vectors used to train quantizers
+_MAX_TRAINING = 65536
+
+
+def _pq_subquantizers(dimension: int) -> int:
+    """Largest subquantizer count <= the configured one that divides the dimension."""
+    m = max(1, min(settings.faiss_pq_subquantizers, dimension))
+    while dimension % m:
+        m -= 1
+    return m
+
+
+def _faiss_metric(metric: str) -> int:
+    return faiss.METRIC_INNER_PRODUCT if metric == "cosine" else faiss.METRIC_L2
+
+
+def _base(index: faiss.Index) -> faiss.Index:
+    return faiss.downcast_index(index.index) if hasattr(index, "id_map") else index
+
+
+def prepare_vectors(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Vectors as stored/searched for a metric (a normalized copy for cosine).
+    
+    Args:
+        vectors: Embedding matrix
+        metric: "l2" or "cosine"
+    
+    Returns:
+        Contiguous float32 matrix; the input is never modified
+    """
+    vectors = np.array(vectors, dtype='float32', order='C', copy=True)
+    if metric == "cosine":
+        faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _training_sample(vectors: np.ndarray) -> np.ndarray:
+    if len(vectors) <= _MAX_TRAINING:
+        return vectors
+    rng = np.random.default_rng(0)
+    return vectors[rng.choice(len(vectors), _MAX_TRAINING, replace=False)]
+
+
+def create_index(
+    dimension: int,
+    vectors: np.ndarray,
+    mode: Optional[str] = None,
+    metric: Optional[str] = None
+) -> faiss.Index:
+    """
+    Create an empty (trained) dense index for a storage mode and metric.
+    
+    Args:
+        dimension: Embedding dimension
+        vectors: Embeddings the index will hold, used to train quantizers
+        mode: One of STORAGE_MODES (default: settings.faiss_storage)
+        metric: One of METRICS (default: settings.faiss_metric)
+    
+    Returns:
+        IndexIDMap2 ready for add_with_ids (of vectors passed through prepare_vectors)
+    """
+    mode = mode or settings.faiss_storage
+    metric = metric or settings.faiss_metric
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown FAISS storage mode: {mode}")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown FAISS metric: {metric}")
+    faiss_metric = _faiss_metric(metric)
+    
+    if mode == "pq" and len(vectors) < _MIN_PQ_TRAINING:
+        logger.warning(f"Only {len(vectors)} vectors to train PQ, using sq8 storage instead")
+        mode = "sq8"
+    
+    if mode == "flat":
+        base = faiss.IndexFlat(dimension, faiss_metric)
+    elif mode == "fp16":
+        base = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16, faiss_metric)
+    elif mode == "sq8":
+        base = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, faiss_metric)
+    elif mode == "pq":
+        # A single inverted list keeps the search exhaustive over PQ codes,
+        # and unlike IndexPQ it honours ID selectors (metadata filters)
+        base = faiss.IndexIVFPQ(
+            faiss.IndexFlat(dimension, faiss_metric), dimension, 1, _pq_subquantizers(dimension), 8, faiss_metric
+        )
+    else:
+        base = faiss.IndexHNSWFlat(dimension, settings.faiss_hnsw_m, faiss_metric)
+        base.hnsw.efSearch = settings.faiss_hnsw_ef_search
+    
+    index = faiss.IndexIDMap2(base)
+    if not index.is_trained:
+        index.train(_training_sample(prepare_vectors(vectors, metric)))
+    
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        # Needed to reconstruct vectors by position (compaction, evaluation)
+        ivf.make_direct_map()
+    
+    return index
+
+
+def empty_like(index: faiss.Index) -> faiss.Index:
+    """
+    Empty copy of an index that keeps its storage mode and trained quantizer.
+    
+    Re-adding vectors reconstructed from the original index reproduces
+    the same codes, so compaction does not lose accuracy.
+    """
+    clone = faiss.clone_index(index)
+    clone.reset()
+    return clone
+
+
+def storage_mode(index: faiss.Index) -> str:
+    """Storage mode of an index built by create_index."""
+    base = _base(index)
+    if isinstance(base, faiss.IndexScalarQuantizer):
+        return "fp16" if base.sq.qtype == faiss.ScalarQuantizer.QT_fp16 else "sq8"
+    if isinstance(base, faiss.IndexHNSW):
+        return "hnsw"
+    if faiss.try_extract_index_ivf(base) is not None:
+        return "pq"
+    return "flat"
+
+
+def index_metric(index: faiss.Index) -> str:
+    """Metric of an index: "cosine" for inner-product indices, else "l2"."""
+    return "cosine" if _base(index).metric_type == faiss.METRIC_INNER_PRODUCT else "l2"
+
+
+def bytes_per_vector(index: faiss.Index) -> int:
+    """Bytes of vector storage per vector (excluding the ID map)."""
+    base = _base(index)
+    if isinstance(base, faiss.IndexHNSW):
+        # Stored vectors plus the level-0 neighbour list
+        storage = faiss.downcast_index(base.storage)
+        return int(storage.sa_code_size()) + 4 * int(base.hnsw.nb_neighbors(0))
+    return int(base.sa_code_size())
+
+
+def search_parameters(
+    index: faiss.Index,
+    selector: Optional[faiss.IDSelector] = None
+) -> Optional[faiss.SearchParameters]:
+    """
+    Search parameters for an index, optionally restricted to selected IDs.
+    
+    Returns:
+        Parameters to pass to index.search, or None if defaults apply
+    """
+    base = _base(index)
+    if isinstance(base, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=settings.faiss_hnsw_ef_search)
+    if selector is None:
+        return None
+    if faiss.try_extract_index_ivf(base) is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=1)
+    return faiss.SearchParameters(sel=selector)
+
+
+def evaluate_recall(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    modes: Sequence[str] = STORAGE_MODES,
+    metric: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Measure recall@k of each storage mode against the exact index.
+    
+    Recall@k is the share of the exact top-k neighbours that the
+    compressed index also returns in its top-k, averaged over queries.
+    
+    Args:
+        vectors: Corpus embeddings
+        queries: Query embeddings
+        k: Neighbours compared per query
+        modes: Storage modes to evaluate
+        metric: One of METRICS (default: settings.faiss_metric)
+    
+    Returns:
+        One row per mode with recall, memory and latency figures
+    """
+    metric = metric or settings.faiss_metric
+    vectors = prepare_vectors(vectors, metric)
+    queries = prepare_vectors(queries, metric)
+    dimension = vectors.shape[1]
+    ids = np.arange(len(vectors), dtype='int64')
+    k = min(k, len(vectors))
+    
+    exact = faiss.IndexFlat(dimension, _faiss_metric(metric))
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    
+    results = []
+    for mode in modes:
+        start = time.perf_counter()
+        index = create_index(dimension, vectors, mode, metric)
+        index.add_with_ids(vectors, ids)
+        build_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        _, found = index.search(queries, k, params=search_parameters(index))
+        query_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+        
+        hits = [len(set(t) & set(f)) for t, f in zip(truth, found)]
+        results.append({
+            "mode": mode,
+            "actual_mode": storage_mode(index),
+            "recall_at_k": float(np.mean(hits)) / k if hits else 0.0,
+            "bytes_per_vector": bytes_per_vector(index),
+            "index_bytes": len(faiss.serialize_index(index)),
+            "build_seconds": round(build_seconds, 3),
+            "query_ms": round(query_ms, 3)
+        })
+    
+    return results
@@ -0,0 +1,181 @@
+"""
+Token-budgeted packing of retrieved chunks into the LLM prompt.
+
+Chunks of the same document overlap (consecutive chunks of a section
+share up to CHUNK_OVERLAP_TOKENS of whole sentences), so when two context
+chunks share a span it is kept only once. If the context is still over
+CONTEXT_TOKEN_BUDGET, chunks are compressed to their most query-relevant
+sentences: every chunk keeps its best sentence (so each cited source
+still has content), then the best remaining sentences of all chunks are
+added while they fit. Sentences keep their original order, with dropped
+stretches marked by "...".
+"""
+
+from typing import Any, Dict, List, Optional
+import logging
+import math
+import re
+
+from backend.config import settings
+from backend.retriever.analyzer import analyze
+from backend.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends: Latin punctuation and the Devanagari danda / double danda
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?\u0964\u0965])\s+")
+
+# Sentences longer than this (tables, unpunctuated text) are split into windows
+_MAX_SENTENCE_WORDS = 60
+
+# Shared spans are searched among at most this many leading/trailing words
+_MAX_OVERLAP_WORDS = 200
+
+_GAP = " ... "
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count of text for budgeting.
+    
+    About four UTF-8 bytes per token: four characters of English, one to
+    two characters of Indic script (three bytes each), in line with the
+    BPE tokenizers of the supported LLMs.
+    """
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, breaking overlong ones into word windows."""
+    sentences = []
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        words = sentence.split()
+        for start in range(0, len(words), _MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[start:start + _MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def _overlap_words(first: List[str], second: List[str]) -> int:
+    """Length of the longest suffix of first that is a prefix of second."""
+    longest = min(len(first), len(second) - 1, _MAX_OVERLAP_WORDS)
+    for size in range(longest, settings.context_min_overlap_words - 1, -1):
+        if first[-size] == second[0] and first[-size:] == second[:size]:
+            return size
+    return 0
+
+
+def remove_overlaps(chunks: List[Dict[str, Any]]) -> int:
+    """
+    Drop spans a chunk shares with another chunk of the same document.
+    
+    The span is removed from whichever chunk it starts (the later window of
+    the document); chunks are modified in place.
+    
+    Returns:
+        Number of words removed
+    """
+    removed = 0
+    words = [chunk.get("content", "").split() for chunk in chunks]
+    for i, chunk in enumerate(chunks):
+        document = chunk.get("metadata", {}).get("document")
+        for j, other in enumerate(chunks):
+            if i == j or other.get("metadata", {}).get("document") != document:
+                continue
+            size = _overlap_words(words[j], words[i])
+            if size:
+                words[i] = words[i][size:]
+                removed += size
+                chunk["content"] = " ".join(words[i])
+    return removed
+
+
+def _compressible(chunk: Dict[str, Any]) -> bool:
+    # Computed tables are already minimal and must stay intact
+    return chunk.get("metadata", {}).get("type") != "table_result"
+
+
+def pack_context(
+    query: str,
+    chunks: List[Dict[str, Any]],
+    budget_tokens: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pack context chunks into a token budget.
+    
+    Args:
+        query: Query the sentences are scored against (translated, if
+            translation is on)
+        chunks: Reranked context chunks, best first
+        budget_tokens: Context token budget (default: settings.context_token_budget)
+    
+    Returns:
+        Copies of the chunks, same order and count, with packed content
+    """
+    budget = budget_tokens or settings.context_token_budget
+    packed = [{**chunk, "content": chunk.get("content", "")} for chunk in chunks]
+    before = sum(estimate_tokens(chunk["content"]) for chunk in packed)
+    
+    removed = remove_overlaps(packed)
+    tokens = sum(estimate_tokens(chunk["content"]) for chunk in packed)
+    if tokens > budget:
+        tokens = _compress(query, packed, budget)
+    
+    metrics = get_metrics()
+    metrics.observe("context.tokens", tokens)
+    if before:
+        metrics.observe("context.packed_ratio", tokens / before)
+    logger.info(f"Packed context: ~{before} → ~{tokens} tokens ({removed} overlapping words removed)")
+    return packed
+
+
+def _compress(query: str, chunks: List[Dict[str, Any]], budget: int) -> int:
+    """Keep the most query-relevant sentences of each chunk; returns the tokens kept."""
+    sentences = [split_sentences(chunk["content"]) if _compressible(chunk) else [] for chunk in chunks]
+    terms = [[set(analyze(sentence)) for sentence in chunk_sentences] for chunk_sentences in sentences]
+    
+    # Query terms weighted by rarity within the context (IDF over sentences)
+    query_terms = set(analyze(query))
+    total = sum(len(chunk_terms) for chunk_terms in terms) or 1
+    weights = {}
+    for term in query_terms:
+        frequency = sum(term in sentence_terms for chunk_terms in terms for sentence_terms in chunk_terms)
+        if frequency:
+            weights[term] = math.log(1 + total / frequency)
+    
+    used = sum(estimate_tokens(chunk["content"]) for chunk in chunks if not _compressible(chunk))
+    selected = [set() for _ in chunks]
+    candidates = []
+    for chunk_rank, chunk_terms in enumerate(terms):
+        if not chunk_terms:
+            continue
+        scores = [sum(weights.get(term, 0.0) for term in sentence_terms) for sentence_terms in chunk_terms]
+        best = max(range(len(scores)), key=lambda position: (scores[position], -position))
+        selected[chunk_rank].add(best)
+        used += estimate_tokens(sentences[chunk_rank][best])
+        candidates += [
+            (-score, chunk_rank, position)
+            for position, score in enumerate(scores)
+            if position != best
+        ]
+    
+    # Best sentences overall; ties go to higher-ranked chunks and earlier sentences
+    for _, chunk_rank, position in sorted(candidates):
+        cost = estimate_tokens(sentences[chunk_rank][position]) + 1
+        if used + cost <= budget:
+            selected[chunk_rank].add(position)
+            used += cost
+    
+    for chunk, chunk_sentences, positions in zip(chunks, sentences, selected):
+        if not chunk_sentences:
+            continue
+        positions = sorted(positions)
+        content = chunk_sentences[positions[0]]
+        for previous, position in zip(positions, positions[1:]):
+            content += (" " if position == previous + 1 else _GAP) + chunk_sentences[position]
+        if positions[0] > 0:
+            content = "... " + content
+        if positions[-1] < len(chunk_sentences) - 1:
+            content += " ..."
+        chunk["content"] = content
+    
+    return used
@@ -1,22 +1,26 @@
 """
-Gemini and Groq LLM client for answer generation.
+Gemini, Groq and OpenAI-compatible LLM client for answer generation.
 Supports auto-switching based on API key format.
 """
 
 from typing import Dict, List, Any, Optional
+import asyncio
 import logging
 import os
+import time
+import httpx
 import google.generativeai as genai
 from groq import Groq
 from backend.config import settings
 from backend.llm.prompt_templates import build_system_prompt, build_user_prompt
+from backend.utils.admission import OverloadedError, stage_limiter
 
 logger = logging.getLogger(__name__)
 
 
 class LLMClient:
     """
-    Unified Client for Google Gemini and Groq API.
+    Unified Client for Google Gemini, Groq and OpenAI-compatible APIs.
     """
     
     def __init__(self):
@@ -29,9 +33,25 @@ class LLMClient:
     def configure(self):
         """Configure API based on Key."""
         api_key = settings.gemini_api_key.strip()
+        provider = settings.llm_provider.lower()
         
         try:
-            if api_key.startswith("gsk_"):
+            if provider == "openai":
+                # OPENAI-COMPATIBLE PROVIDER (self-hosted models, load-test mock)
+                self.provider = "openai"
+                self.base_url = settings.llm_base_url.rstrip("/")
+                self.client = httpx.AsyncClient(
+                    timeout=settings.llm_timeout_seconds,
+                    headers={"Authorization": f"Bearer {api_key}"}
+                )
+                if "gemini" in settings.gemini_model.lower():
+                    self.model_name = "mock-llm"
+                else:
+                    self.model_name = settings.gemini_model
+                
+                logger.info(f"OpenAI-compatible provider configured at {self.base_url} with model: {self.model_name}")
+                
+            elif provider == "groq" or (provider == "auto" and api_key.startswith("gsk_")):
                 # GROQ PROVIDER
                 self.provider = "groq"
                 self.client = Groq(api_key=api_key)
@@ -64,14 +84,31 @@ class LLMClient:
         query: str,
         context_chunks: List[Dict[str, Any]],
         language: str = "en",
-        deterministic: bool = False
+        deterministic: bool = False,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None
     ) -> str:
         """
         Generate answer using configured provider.
+        
+        Args:
+            query: User query
+            context_chunks: Retrieved chunks cited as sources
+            language: Answer language
+            deterministic: Use deterministic temperature
+            max_tokens: Answer length cap (default: settings.llm_max_tokens)
+            timeout: Seconds the call may take, capped at settings.llm_timeout_seconds
+        
+        Raises:
+            asyncio.TimeoutError: The provider did not answer in time
         """
         if not self.configured:
             self.configure()
         
+        max_tokens = max_tokens or settings.llm_max_tokens
+        timeout = min(timeout, settings.llm_timeout_seconds) if timeout else settings.llm_timeout_seconds
+        give_up_at = time.monotonic() + timeout
+        
         try:
             # Build prompts
             system_prompt = build_system_prompt(language)
@@ -88,19 +125,43 @@ class LLMClient:
             
             logger.info(f"Generating answer via {self.provider} (temp={temperature}, lang={language})")
             
+            # Provider calls count against the LLM concurrency limit; the
+            # blocking SDK calls run on its thread pool
+            limiter = stage_limiter("llm")
+            
             if self.provider == "groq":
                 # GROQ GENERATION
-                chat_completion = self.client.chat.completions.create(
+                chat_completion = await asyncio.wait_for(limiter.run(
+                    self.client.chat.completions.create,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
                     model=self.model_name,
                     temperature=temperature,
-                    max_tokens=settings.llm_max_tokens,
-                )
+                    max_tokens=max_tokens,
+                    timeout=timeout,
+                ), timeout)
                 answer = chat_completion.choices[0].message.content
                 
+            elif self.provider == "openai":
+                # OPENAI-COMPATIBLE GENERATION
+                async with limiter.slot():
+                    response = await asyncio.wait_for(self.client.post(
+                        f"{self.base_url}/chat/completions",
+                        json={
+                            "model": self.model_name,
+                            "messages": [
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": user_prompt}
+                            ],
+                            "temperature": temperature,
+                            "max_tokens": max_tokens
+                        }
+                    ), give_up_at - time.monotonic())
+                response.raise_for_status()
+                answer = response.json()["choices"][0]["message"]["content"]
+                
             else:
                 # GEMINI GENERATION
                 # Auto-healing logic for Gemini models
@@ -116,22 +177,29 @@ class LLMClient:
                 last_error = None
                 
                 for model_name in models_to_try:
+                    left = give_up_at - time.monotonic()
+                    if left <= 0:
+                        raise asyncio.TimeoutError()
                     try:
                         if model_name != primary_model:
                             logger.info(f"Falling back to model: {model_name}")
                             model_instance = genai.GenerativeModel(model_name)
                         else:
                             model_instance = self.model
-
-                        response = model_instance.generate_content(
+                        
+                        response = await asyncio.wait_for(limiter.run(
+                            model_instance.generate_content,
                             full_prompt,
                             generation_config=genai.GenerationConfig(
                                 temperature=temperature,
-                                max_output_tokens=settings.llm_max_tokens,
-                            )
-                        )
+                                max_output_tokens=max_tokens,
+                            ),
+                            request_options={"timeout": left}
+                        ), left)
                         answer = response.text
                         break # Success
+                    except (OverloadedError, asyncio.TimeoutError):
+                        raise
                     except Exception as e:
                         logger.warning(f"Model {model_name} failed: {e}")
                         last_error = e
@@ -139,7 +207,7 @@ class LLMClient:
                 else:
                     # If loop finishes without break
                     raise last_error
-
+            
             logger.info(f"Answer generated: {len(answer)} characters")
             return answer
             
@@ -0,0 +1,315 @@
+"""
+Local stand-in for an OpenAI/Groq-compatible chat completions API.
+
+Lets the full query pipeline be load-tested without spending hosted LLM
+quota. Time to first token follows a configurable latency distribution,
+output is produced at a fixed token rate (optionally streamed as
+server-sent events), and errors or provider-side concurrency limits can be
+injected.
+
+Run it and point the backend at it with LLM_PROVIDER=openai:
+
+    python -m backend.llm.mock_server --port 8100 --latency lognormal:400,0.5 \\
+        --tokens-per-second 80 --error-rate 0.01
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+_FILLER = (
+    "The scheme supports eligible startups through funding, mentoring and compliance relief "
+    "as described in the cited documents"
+).split()
+
+
+class LatencyDistribution:
+    """
+    Random delay parsed from a spec string (all values in milliseconds):
+        
+        fixed:200            always 200 ms
+        uniform:100,500      uniform between 100 and 500 ms
+        normal:300,50        mean 300 ms, standard deviation 50 ms
+        lognormal:300,0.5    median 300 ms, log-space sigma 0.5 (long tail)
+        exponential:300      mean 300 ms
+    """
+    
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+    
+    def __init__(self, spec: str, rng: Optional[random.Random] = None):
+        """
+        Initialize latency distribution.
+        
+        Args:
+            spec: Distribution spec, e.g. "lognormal:300,0.5"
+            rng: Random generator (seeded for reproducible runs)
+        """
+        kind, _, params = spec.partition(":")
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind} (expected one of {', '.join(self.KINDS)})")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self.rng = rng or random.Random()
+    
+    def sample(self) -> float:
+        """Delay in seconds."""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = self.rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            ms = p[0] * self.rng.lognormvariate(0.0, p[1])
+        else:
+            ms = self.rng.expovariate(1.0 / p[0])
+        return max(ms, 0.0) / 1000
+
+
+class MockConfig:
+    """
+    Behaviour of the mock server.
+    """
+    
+    def __init__(
+        self,
+        latency: str = "lognormal:300,0.5",
+        tokens_per_second: float = 80.0,
+        output_tokens: int = 150,
+        error_rate: float = 0.0,
+        error_codes: Optional[List[int]] = None,
+        max_concurrency: int = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize mock configuration.
+        
+        Args:
+            latency: Time-to-first-token distribution (see LatencyDistribution)
+            tokens_per_second: Output token rate (0 for instant output)
+            output_tokens: Mean completion length, capped by the request's max_tokens
+            error_rate: Share of requests answered with an injected error
+            error_codes: HTTP status codes used for injected errors
+            max_concurrency: Requests in flight before answering 429 (0 = unlimited)
+            seed: Random seed for reproducible runs
+        """
+        self.rng = random.Random(seed)
+        self.latency = LatencyDistribution(latency, self.rng)
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.error_codes = error_codes or [429, 500, 503]
+        self.max_concurrency = max_concurrency
+
+
+class MockStats:
+    """
+    Request counters exposed at /stats.
+    """
+    
+    def __init__(self):
+        self.requests = 0
+        self.completed = 0
+        self.streamed = 0
+        self.rejected = 0
+        self.errors: Dict[int, int] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started_at = time.time()
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "streamed": self.streamed,
+            "rejected": self.rejected,
+            "errors": {str(code): n for code, n in self.errors.items()},
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "uptime_seconds": round(time.time() - self.started_at, 1)
+        }
+
+
+def _error(status_code: int, message: str) -> JSONResponse:
+    headers = {"Retry-After": "1"} if status_code == 429 else None
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": "mock_error", "code": status_code}},
+        headers=headers
+    )
+
+
+def _completion_words(messages: List[Dict[str, Any]], n_tokens: int) -> List[str]:
+    """Deterministic answer text of n_tokens words that cites the first source."""
+    words = ["Based", "on", "the", "provided", "documents,"]
+    while len(words) < n_tokens - 3:
+        words.extend(_FILLER)
+    words = words[:max(n_tokens - 3, 1)]
+    words.extend(["[Source", "1]."])
+    return words
+
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """
+    Build the mock chat completions app.
+    
+    Args:
+        config: Mock behaviour (default: MockConfig())
+    
+    Returns:
+        FastAPI app serving /v1/chat/completions (and Groq's /openai/v1 path)
+    """
+    config = config or MockConfig()
+    stats = MockStats()
+    app = FastAPI(title="Mock LLM")
+    
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.requests += 1
+        
+        if config.max_concurrency and stats.in_flight >= config.max_concurrency:
+            stats.rejected += 1
+            return _error(429, "Mock concurrency limit reached")
+        
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            first_token_delay = config.latency.sample()
+            
+            if config.rng.random() < config.error_rate:
+                code = config.rng.choice(config.error_codes)
+                await asyncio.sleep(first_token_delay * 0.1)
+                stats.errors[code] = stats.errors.get(code, 0) + 1
+                return _error(code, "Injected mock error")
+            
+            messages = body.get("messages", [])
+            max_tokens = int(body.get("max_tokens") or config.output_tokens)
+            n_tokens = max(4, min(max_tokens, int(config.output_tokens * config.rng.uniform(0.75, 1.25))))
+            words = _completion_words(messages, n_tokens)
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+            token_delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+            
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = body.get("model", "mock-llm")
+            created = int(time.time())
+            
+            if body.get("stream"):
+                stats.in_flight += 1  # Held until the stream finishes
+                stats.streamed += 1
+                return StreamingResponse(
+                    _stream(words, first_token_delay, token_delay, completion_id, model, created),
+                    media_type="text/event-stream"
+                )
+            
+            await asyncio.sleep(first_token_delay + token_delay * len(words))
+            stats.completed += 1
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop" if len(words) < max_tokens else "length"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(words),
+                    "total_tokens": prompt_tokens + len(words)
+                }
+            }
+        finally:
+            stats.in_flight -= 1
+    
+    async def _stream(words, first_token_delay, token_delay, completion_id, model, created):
+        try:
+            await asyncio.sleep(first_token_delay)
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else f" {word}"},
+                        "finish_reason": None
+                    }]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+            stats.completed += 1
+        finally:
+            stats.in_flight -= 1
+    
+    app.add_api_route("/v1/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/openai/v1/chat/completions", chat_completions, methods=["POST"])
+    
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock-llm", "object": "model", "owned_by": "mock"}]}
+    
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    @app.get("/stats")
+    async def get_stats():
+        return stats.as_dict()
+    
+    return app
+
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Groq-compatible LLM server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:300,0.5", help="Time-to-first-token distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Output token rate (0 = instant)")
+    parser.add_argument("--output-tokens", type=int, default=150, help="Mean completion length in tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with an injected error")
+    parser.add_argument("--error-codes", default="429,500,503", help="Comma-separated status codes for injected errors")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="In-flight requests before answering 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    args = parser.parse_args()
+    
+    config = MockConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        error_codes=[int(c) for c in args.error_codes.split(",")],
+        max_concurrency=args.max_concurrency,
+        seed=args.seed
+    )
+    logger.info(f"Mock LLM listening on {args.host}:{args.port} (latency {args.latency})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
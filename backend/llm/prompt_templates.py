@@ -4,6 +4,7 @@ Enforces all core rules: context-only, citations, multilingual, refusal policy.
 """
 
 from typing import Dict, List, Any
+from functools import lru_cache
 
 
 def get_citation_format(language: str) -> str:
@@ -17,10 +18,14 @@ def get_citation_format(language: str) -> str:
     return citation_formats.get(language, "Source")
 
 
+@lru_cache(maxsize=None)
 def build_system_prompt(language: str = "en") -> str:
     """
     Build system prompt enforcing all StartupSaarthi rules.
     
+    Cached per language: the prompt depends on nothing else, and an
+    identical prefix lets providers reuse their prompt cache.
+    
     Args:
         language: Detected language code
     
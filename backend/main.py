@@ -7,11 +7,13 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import MutableHeaders
 import logging
 import time
 
 from backend.config import settings
 from backend.api import user_routes, admin_routes
+from backend.ingestion.job_queue import get_job_queue, shutdown_job_queue
 
 # Configure logging
 logging.basicConfig(
@@ -40,15 +42,35 @@ app.add_middleware(
 
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time to response headers."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    logger.info(f"{request.method} {request.url.path} - {process_time:.3f}s")
-    return response
+class ProcessTimeMiddleware:
+    """
+    Add processing time to response headers.
+    
+    Plain ASGI rather than @app.middleware("http"), which hides client
+    disconnects from endpoints (queries cancel their work on disconnect).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        
+        async def send_with_process_time(message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                MutableHeaders(scope=message).append("X-Process-Time", str(process_time))
+                logger.info(f"{scope['method']} {scope['path']} - {process_time:.3f}s")
+            await send(message)
+        
+        await self.app(scope, receive, send_with_process_time)
+
+
+app.add_middleware(ProcessTimeMiddleware)
 
 
 # Exception handlers
@@ -72,6 +94,18 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
+@app.on_event("startup")
+async def start_background_jobs():
+    """Start the ingestion worker pool, resuming jobs left queued by a restart."""
+    get_job_queue()
+
+
+@app.on_event("shutdown")
+async def shutdown_background_jobs():
+    """Stop the ingestion worker pool on shutdown."""
+    shutdown_job_queue()
+
+
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
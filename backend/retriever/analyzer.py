@@ -0,0 +1,193 @@
+"""
+Text analyzer shared by BM25 indexing and querying.
+
+Text is NFC-normalized and case-folded, split on anything that is not a
+letter, digit or Indic combining mark (so punctuation never sticks to a
+token), stripped of English/Hindi/Tamil/Telugu stopwords and lightly
+stemmed: English plurals and possessives, and the most common inflection
+suffixes of Hindi, Tamil and Telugu. Tokens are mapped to integer IDs
+through a vocabulary stored with the BM25 index.
+"""
+
+from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+import re
+import unicodedata
+
+# Recorded with each BM25 index; indices built with another version need a reindex
+ANALYZER_VERSION = 1
+
+# Letters/digits, plus Indic blocks (which include combining vowel signs)
+# minus the danda punctuation marks
+_TOKEN_RE = re.compile(r"(?:[^\W_]|[\u0900-\u0963\u0966-\u0DFF])+")
+_INDIC_CHARS_RE = re.compile(r"[\u0900-\u0DFF]")
+
+# Zero-width (non-)joiners only affect rendering
+_INVISIBLE = dict.fromkeys([0x200B, 0x200C, 0x200D, 0xFEFF])
+
+ENGLISH_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "of", "in", "on", "at", "to", "for", "from", "by",
+    "with", "about", "as", "into", "than", "then", "so", "if", "is", "are", "was", "were",
+    "be", "been", "being", "am", "do", "does", "did", "has", "have", "had", "will", "would",
+    "shall", "should", "can", "could", "may", "might", "this", "that", "these", "those",
+    "there", "their", "they", "them", "he", "she", "his", "her", "its", "we", "our", "you",
+    "your", "i", "me", "my", "what", "which", "who", "whom", "how", "when", "where", "why",
+    "any", "all", "also", "such", "s"
+})
+
+INDIC_STOPWORDS = frozenset({
+    # Hindi
+    "क्या", "है", "हैं", "के", "की", "का", "को", "में", "से", "लिए", "और", "कैसे", "कौन", "कब", "यह",
+    "वह", "पर", "भी", "तो", "हो", "था", "थे", "कर", "करें", "एक", "ये", "वे", "इस", "उस", "जो",
+    # Tamil
+    "என்ன", "எப்படி", "எந்த", "ஒரு", "மற்றும்", "இந்த", "அந்த", "உள்ள", "ஆகும்", "என்று",
+    # Telugu
+    "ఏమిటి", "ఎలా", "ఏ", "ఒక", "మరియు", "ఈ", "ఆ", "కోసం", "లో", "కి", "ఉంది", "అని"
+})
+
+STOPWORDS = ENGLISH_STOPWORDS | INDIC_STOPWORDS
+
+# Inflection suffixes, longest first; only stripped if the stem keeps _MIN_STEM characters
+_HINDI_SUFFIXES = sorted([
+    "ाएंगी", "ाएंगे", "ाऊंगी", "ाऊंगा", "ाइयाँ", "ाइयों", "ाइयां",
+    "ाएगी", "ाएगा", "ाओगी", "ाओगे", "ेंगी", "ेंगे", "ूंगी", "ूंगा", "ातीं", "ियाँ", "ियों", "ियां",
+    "ाकर", "ाइए", "ाईं", "ाया", "ेगी", "ेगा", "ोगी", "ोगे", "ाने", "ाना", "ाते", "ाती",
+    "ाता", "तीं", "ाओं", "ाएं", "ुओं", "ुएं", "ुआं",
+    "ाओ", "िए", "ाई", "ाए", "ीं", "ाँ", "ां", "ों", "ें",
+    "ो", "े", "ू", "ु", "ी", "ि", "ा"
+], key=len, reverse=True)
+
+_TAMIL_SUFFIXES = sorted([
+    "களுக்கு", "களின்", "களில்", "களை", "கள்", "த்திற்கு", "த்தில்", "த்தின்", "த்தை",
+    "ுக்கு", "க்கு", "ில்", "ின்", "ிடம்", "ும்", "ாக", "ை"
+], key=len, reverse=True)
+
+_TELUGU_SUFFIXES = sorted([
+    "లకు", "లను", "ల్లో", "లలో", "లతో", "యొక్క", "లు", "లో", "ను", "కు", "కి", "తో", "గా", "ని"
+], key=len, reverse=True)
+
+_MIN_STEM = 2
+
+
+def _strip_suffix(token: str, suffixes: List[str]) -> str:
+    for suffix in suffixes:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def _stem_tamil(token: str) -> str:
+    stemmed = _strip_suffix(token, _TAMIL_SUFFIXES)
+    # Plural "-ங்கள்" comes from a "-ம்" singular (திட்டம் → திட்டங்கள்)
+    if stemmed != token and token[len(stemmed):].startswith("கள") and stemmed.endswith("ங்"):
+        stemmed = stemmed[:-2] + "ம்"
+    return stemmed
+
+
+def _stem_english(token: str) -> str:
+    """S-stemmer: plural forms only, so stems stay real words."""
+    if len(token) <= 3 or not token.isascii():
+        return token
+    if token.endswith("ies") and not token.endswith(("eies", "aies")):
+        return token[:-3] + "y"
+    if token.endswith("es") and not token.endswith(("aes", "ees", "oes")):
+        return token[:-1]
+    if token.endswith("s") and not token.endswith(("us", "ss")):
+        return token[:-1]
+    return token
+
+
+@lru_cache(maxsize=200000)
+def stem(token: str) -> str:
+    """
+    Light stem of a normalized token.
+    
+    Args:
+        token: Case-folded, NFC-normalized token
+    
+    Returns:
+        Stemmed token (unchanged for scripts without stemming rules)
+    """
+    first = ord(token[0])
+    if 0x0900 <= first <= 0x097F:
+        return _strip_suffix(token, _HINDI_SUFFIXES)
+    if 0x0B80 <= first <= 0x0BFF:
+        return _stem_tamil(token)
+    if 0x0C00 <= first <= 0x0C7F:
+        return _strip_suffix(token, _TELUGU_SUFFIXES)
+    return _stem_english(token)
+
+
+def normalize(text: str) -> str:
+    """NFC-normalize and case-fold text, dropping zero-width joiners."""
+    return unicodedata.normalize("NFC", text).translate(_INVISIBLE).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized, non-stopword tokens (without stemming).
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Tokens in order
+    """
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Analyze text into BM25 terms.
+    
+    Args:
+        text: Raw text (chunk content or query)
+    
+    Returns:
+        Normalized, stemmed, non-stopword terms in order
+    """
+    return [stem(token) for token in tokenize(text)]
+
+
+def is_indic(token: str) -> bool:
+    """Whether a token contains Indic script characters."""
+    return _INDIC_CHARS_RE.search(token) is not None
+
+
+class Vocabulary:
+    """
+    Term <-> integer ID mapping of a BM25 index.
+    
+    Indexing IDs instead of strings keeps the pickled index small, and
+    query terms that are not in the vocabulary can be dropped before
+    scoring since they match no document.
+    """
+    
+    def __init__(self, terms: Optional[Iterable[str]] = None):
+        """
+        Initialize vocabulary.
+        
+        Args:
+            terms: Terms in ID order
+        """
+        self.terms: List[str] = list(terms or [])
+        self.ids: Dict[str, int] = {term: i for i, term in enumerate(self.terms)}
+    
+    def __len__(self) -> int:
+        return len(self.terms)
+    
+    def add(self, terms: Iterable[str]) -> List[int]:
+        """IDs of terms, adding unknown ones."""
+        ids = []
+        for term in terms:
+            term_id = self.ids.get(term)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.ids[term] = term_id
+                self.terms.append(term)
+            ids.append(term_id)
+        return ids
+    
+    def lookup(self, terms: Iterable[str]) -> List[int]:
+        """IDs of known terms; unknown terms are skipped."""
+        return [self.ids[term] for term in terms if term in self.ids]
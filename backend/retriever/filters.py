@@ -0,0 +1,159 @@
+"""
+Metadata filters for retrieval.
+
+At index time every filterable field gets a bitmap per distinct value
+(bit i set = chunk i has that value). A query's filters are evaluated by
+OR-ing the bitmaps of the requested values within a field and AND-ing
+across fields, so filtering costs a few vector ops regardless of how many
+chunks match.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+import logging
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Chunk metadata fields that can be filtered on
+FILTER_FIELDS = ("type", "document", "year", "category", "sheet_name")
+
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+# Type aliases accepted in filters
+_TYPE_ALIASES = {"xlsx": "excel", "xls": "excel", "md": "txt", "text": "txt", "htm": "html", "jsonl": "json"}
+
+
+def normalize_value(field: str, value: Any) -> Optional[str]:
+    """Normalize a metadata or filter value for bitmap lookup."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    if field == "type":
+        text = _TYPE_ALIASES.get(text, text)
+    return text
+
+
+def derive_year(metadata: Dict[str, Any], row: Optional[Mapping[str, Any]] = None) -> Optional[int]:
+    """
+    Infer the year a chunk refers to.
+    
+    Uses, in order: an explicit "year" value, a "year" or date column of a
+    structured row, and a year in the document name (e.g. startup_funding2021.csv).
+    
+    Args:
+        metadata: Chunk metadata
+        row: Structured row values (default: inline "structured_data" of older chunks)
+    
+    Returns:
+        Four-digit year, or None if none can be inferred
+    """
+    candidates = [metadata.get("year")]
+    
+    if row is None:
+        row = metadata.get("structured_data") or {}
+    candidates.extend(value for column, value in row.items() if str(column).strip().lower() == "year")
+    candidates.extend(value for column, value in row.items() if "date" in str(column).lower())
+    
+    candidates.append(metadata.get("document"))
+    
+    for candidate in candidates:
+        if candidate is None:
+            continue
+        match = _YEAR_RE.search(str(candidate))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _field_value(field: str, metadata: Dict[str, Any]) -> Optional[str]:
+    value = derive_year(metadata) if field == "year" else metadata.get(field)
+    return normalize_value(field, value)
+
+
+def build_filter_index(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build per-field value bitmaps for a list of chunks.
+    
+    Args:
+        chunks: Chunks in index order
+    
+    Returns:
+        {"size": n, "fields": {field: {value: packed uint8 bitmap}}}
+    """
+    size = len(chunks)
+    positions: Dict[str, Dict[str, List[int]]] = {field: {} for field in FILTER_FIELDS}
+    
+    for i, chunk in enumerate(chunks):
+        metadata = chunk.get("metadata", {})
+        for field in FILTER_FIELDS:
+            value = _field_value(field, metadata)
+            if value is not None:
+                positions[field].setdefault(value, []).append(i)
+    
+    fields = {}
+    for field, values in positions.items():
+        fields[field] = {}
+        for value, ids in values.items():
+            mask = np.zeros(size, dtype=bool)
+            mask[ids] = True
+            fields[field][value] = np.packbits(mask, bitorder="little")
+    
+    return {"size": size, "fields": fields}
+
+
+def normalize_filters(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, tuple]]:
+    """
+    Canonicalize query filters: known fields only, values as sorted tuples.
+    
+    Args:
+        filters: {field: value or list of values}
+    
+    Returns:
+        Normalized filters, or None if nothing is filtered
+    """
+    if not filters:
+        return None
+    
+    normalized = {}
+    for field, values in filters.items():
+        if field not in FILTER_FIELDS or values is None:
+            continue
+        if not isinstance(values, (list, tuple, set)):
+            values = [values]
+        values = {normalize_value(field, v) for v in values} - {None}
+        if values:
+            normalized[field] = tuple(sorted(values))
+    
+    return normalized or None
+
+
+def evaluate_filters(filter_index: Dict[str, Any], filters: Dict[str, tuple]) -> np.ndarray:
+    """
+    Evaluate normalized filters to a packed bitmap of matching chunks.
+    
+    Args:
+        filter_index: Output of build_filter_index
+        filters: Output of normalize_filters
+    
+    Returns:
+        Packed uint8 bitmap (little bit order)
+    """
+    n_bytes = (filter_index["size"] + 7) // 8
+    result = None
+    
+    for field, values in filters.items():
+        bitmaps = filter_index["fields"].get(field, {})
+        field_bits = np.zeros(n_bytes, dtype=np.uint8)
+        for value in values:
+            if value in bitmaps:
+                np.bitwise_or(field_bits, bitmaps[value], out=field_bits)
+        result = field_bits if result is None else np.bitwise_and(result, field_bits, out=result)
+    
+    if result is None:
+        return np.full(n_bytes, 0xFF, dtype=np.uint8)
+    return result
@@ -2,8 +2,10 @@
 Hybrid retriever combining FAISS (dense) and BM25 (sparse) retrieval.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 import logging
+import threading
+from contextlib import contextmanager
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import faiss
@@ -11,9 +13,107 @@ import pickle
 from rank_bm25 import BM25Okapi
 
 from backend.config import settings
+from backend.ingestion.index_store import IndexStore, IndexGeneration
+from backend.ingestion.vector_storage import search_parameters, index_metric, prepare_vectors
+from backend.retriever.filters import build_filter_index, evaluate_filters, normalize_filters
+from backend.retriever.query_expansion import TermDictionary
+from backend.retriever.analyzer import ANALYZER_VERSION, Vocabulary, analyze
+from backend.utils.admission import OverloadedError, stage_limiter
 
 logger = logging.getLogger(__name__)
 
+# Evaluated filter combinations kept per snapshot
+_BITMAP_CACHE_SIZE = 256
+
+
+def _unit_norm(embeddings: np.ndarray) -> np.ndarray:
+    """Per row, whether a raw embedding is a unit vector (the model normalizes its output)."""
+    return np.abs(np.linalg.norm(embeddings, axis=1) - 1.0) < 1e-3
+
+
+class IndexSnapshot:
+    """
+    In-memory view of one index generation.
+    
+    Snapshots are never modified once published; queries hold a reference
+    (acquire) for their duration, and a replaced snapshot is released once
+    the last in-flight query using it finishes.
+    """
+    
+    def __init__(
+        self,
+        generation: Optional[str] = None,
+        faiss_index: Optional[faiss.Index] = None,
+        bm25_index: Optional[BM25Okapi] = None,
+        chunk_metadata: Optional[List[Dict[str, Any]]] = None,
+        tombstones: Optional[Set[str]] = None,
+        tombstone_mtime: Optional[float] = None,
+        filter_index: Optional[Dict[str, Any]] = None,
+        term_dictionary: Optional[TermDictionary] = None,
+        bm25_vocabulary: Optional[Vocabulary] = None
+    ):
+        self.generation = generation
+        self.faiss_index = faiss_index
+        self.bm25_index = bm25_index
+        self.bm25_vocabulary = bm25_vocabulary  # None for legacy indices of whitespace tokens
+        self.chunk_metadata = chunk_metadata or []
+        self.tombstones = tombstones or set()  # Chunk IDs deleted but not yet compacted
+        self.tombstone_mtime = tombstone_mtime
+        self.refs = 0
+        self.retired = False
+        
+        self.deleted_mask = np.fromiter(
+            (meta["chunk_id"] in self.tombstones for meta in self.chunk_metadata),
+            dtype=bool,
+            count=len(self.chunk_metadata)
+        )
+        
+        self.live_bitmap = None  # Packed bitmap of non-deleted chunks; None if nothing is deleted
+        if self.deleted_mask.any():
+            self.live_bitmap = np.packbits(~self.deleted_mask, bitorder="little")
+        
+        self.filter_index = filter_index or build_filter_index(self.chunk_metadata)
+        self.term_dictionary = term_dictionary  # Cross-lingual BM25 expansions (None for legacy indices)
+        self._bitmap_cache: Dict[Any, np.ndarray] = {}
+    
+    def with_tombstones(self, tombstones: Set[str], tombstone_mtime: Optional[float]) -> "IndexSnapshot":
+        """Copy of this snapshot (sharing the indices) with a new tombstone set."""
+        return IndexSnapshot(
+            self.generation,
+            self.faiss_index,
+            self.bm25_index,
+            self.chunk_metadata,
+            tombstones,
+            tombstone_mtime,
+            self.filter_index,
+            self.term_dictionary,
+            self.bm25_vocabulary
+        )
+    
+    def allowed_bitmap(self, filters: Optional[Dict[str, tuple]]) -> Optional[np.ndarray]:
+        """
+        Packed bitmap of chunks a query may return (matching filters, not deleted).
+        
+        Args:
+            filters: Normalized filters (see normalize_filters)
+        
+        Returns:
+            Packed uint8 bitmap, or None if every chunk is allowed
+        """
+        if not filters:
+            return self.live_bitmap
+        
+        key = tuple(sorted(filters.items()))
+        bitmap = self._bitmap_cache.get(key)
+        if bitmap is None:
+            bitmap = evaluate_filters(self.filter_index, filters)
+            if self.live_bitmap is not None:
+                np.bitwise_and(bitmap, self.live_bitmap, out=bitmap)
+            if len(self._bitmap_cache) >= _BITMAP_CACHE_SIZE:
+                self._bitmap_cache.pop(next(iter(self._bitmap_cache)), None)
+            self._bitmap_cache[key] = bitmap
+        return bitmap
+
 
 class HybridRetriever:
     """
@@ -23,40 +123,40 @@ class HybridRetriever:
     def __init__(self):
         """Initialize retriever with embedding model and indices."""
         self.embedding_model = None
-        self.faiss_index = None
-        self.bm25_index = None
-        self.chunk_metadata = []  # Stores metadata for each chunk
         self.loaded = False
+        self._snapshot = IndexSnapshot()
+        self._lock = threading.Lock()
+        self._loading = False  # A newer generation is being loaded in the background
+        self._pointer_mtime = None
+    
+    @property
+    def faiss_index(self) -> Optional[faiss.Index]:
+        return self._snapshot.faiss_index
+    
+    @property
+    def bm25_index(self) -> Optional[BM25Okapi]:
+        return self._snapshot.bm25_index
+    
+    @property
+    def chunk_metadata(self) -> List[Dict[str, Any]]:
+        return self._snapshot.chunk_metadata
+    
+    @property
+    def generation(self) -> Optional[str]:
+        """Name of the index generation currently serving queries."""
+        return self._snapshot.generation
     
     def load_indices(self):
         """Load FAISS and BM25 indices from storage."""
         try:
             # Load embedding model
-            logger.info(f"Loading embedding model: {settings.embedding_model}")
-            self.embedding_model = SentenceTransformer(settings.embedding_model)
-            
-            # Load FAISS index
-            if settings.faiss_index_path.exists():
-                faiss_index_file = settings.faiss_index_path / "index.faiss"
-                metadata_file = settings.faiss_index_path / "metadata.pkl"
-                
-                if faiss_index_file.exists() and metadata_file.exists():
-                    self.faiss_index = faiss.read_index(str(faiss_index_file))
-                    with open(metadata_file, "rb") as f:
-                        self.chunk_metadata = pickle.load(f)
-                    logger.info(f"Loaded FAISS index with {self.faiss_index.ntotal} vectors")
-                else:
-                    logger.warning(f"FAISS index files not found at {settings.faiss_index_path}")
-            else:
-                 logger.warning(f"FAISS index directory not found: {settings.faiss_index_path}")
+            if self.embedding_model is None:
+                logger.info(f"Loading embedding model: {settings.embedding_model}")
+                self.embedding_model = SentenceTransformer(settings.embedding_model)
             
-            # Load BM25 index
-            if settings.bm25_index_path.exists():
-                with open(settings.bm25_index_path, "rb") as f:
-                    bm25_data = pickle.load(f)
-                    self.bm25_index = bm25_data["index"]
-                    # BM25 should use same metadata as FAISS
-                logger.info(f"Loaded BM25 index with {len(self.bm25_index.doc_freqs)} documents")
+            store = IndexStore()
+            self._pointer_mtime = store.pointer_mtime()
+            self._swap(self._load_generation(store.current()))
             
             self.loaded = True
             logger.info("Hybrid retriever loaded successfully")
@@ -65,113 +165,526 @@ class HybridRetriever:
             logger.error(f"Error loading indices: {e}", exc_info=True)
             raise
     
-    async def retrieve_dense(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+    def _load_generation(self, generation: Optional[IndexGeneration]) -> IndexSnapshot:
+        """Read a committed generation into a new snapshot."""
+        if generation is None:
+            logger.warning(f"No index generation found at {settings.faiss_index_path}")
+            return IndexSnapshot()
+        
+        faiss_index = None
+        bm25_index = None
+        bm25_vocabulary = None
+        chunk_metadata = []
+        
+        # Load FAISS index
+        if generation.faiss_file.exists() and generation.metadata_file.exists():
+            faiss_index = faiss.read_index(str(generation.faiss_file))
+            with open(generation.metadata_file, "rb") as f:
+                chunk_metadata = pickle.load(f)
+            logger.info(f"Loaded FAISS index with {faiss_index.ntotal} vectors ({generation.name})")
+        else:
+            logger.warning(f"FAISS index files not found in {generation.path}")
+        
+        # Load BM25 index
+        if generation.bm25_file.exists():
+            with open(generation.bm25_file, "rb") as f:
+                bm25_data = pickle.load(f)
+                bm25_index = bm25_data["index"]
+                # BM25 should use same metadata as FAISS
+            if "vocabulary" in bm25_data:
+                bm25_vocabulary = Vocabulary(bm25_data["vocabulary"])
+                if bm25_data.get("analyzer") != ANALYZER_VERSION:
+                    logger.warning("BM25 index was built with another analyzer version; reindex for best results")
+            logger.info(f"Loaded BM25 index with {len(bm25_index.doc_freqs)} documents")
+        
+        # Filter bitmaps are written with the generation (built here for legacy indices)
+        filter_index = None
+        if generation.filters_file.exists():
+            with open(generation.filters_file, "rb") as f:
+                filter_index = pickle.load(f)
+        
+        term_dictionary = TermDictionary.load(generation.terms_file)
+        
+        tombstone_store = generation.tombstones()
+        tombstone_mtime = tombstone_store.mtime()
+        
+        return IndexSnapshot(
+            generation.name,
+            faiss_index,
+            bm25_index,
+            chunk_metadata,
+            tombstone_store.load(),
+            tombstone_mtime,
+            filter_index,
+            term_dictionary,
+            bm25_vocabulary
+        )
+    
+    def _swap(self, snapshot: IndexSnapshot):
+        """Publish a new snapshot; the old one is released when its last query ends."""
+        with self._lock:
+            old = self._snapshot
+            self._snapshot = snapshot
+            old.retired = True
+            if old.refs == 0:
+                self._release(old)
+        if old.generation != snapshot.generation:
+            logger.info(f"Swapped index generation {old.generation} → {snapshot.generation}")
+    
+    @staticmethod
+    def _release(snapshot: IndexSnapshot):
+        if snapshot.generation is not None:
+            logger.debug(f"Released snapshot of index generation {snapshot.generation}")
+    
+    @contextmanager
+    def acquire(self) -> Iterator[IndexSnapshot]:
+        """Pin the current snapshot for the duration of a query."""
+        with self._lock:
+            snapshot = self._snapshot
+            snapshot.refs += 1
+        try:
+            yield snapshot
+        finally:
+            with self._lock:
+                snapshot.refs -= 1
+                if snapshot.retired and snapshot.refs == 0:
+                    self._release(snapshot)
+    
+    def refresh(self):
+        """
+        Pick up index changes made since the last query.
+        
+        A newly committed generation is loaded on a background thread while
+        the current one keeps serving, then swapped in. New tombstones for
+        the current generation are applied immediately.
+        """
+        store = IndexStore()
+        pointer_mtime = store.pointer_mtime()
+        if pointer_mtime != self._pointer_mtime:
+            with self._lock:
+                start = not self._loading and store.current_name() != self._snapshot.generation
+                if start:
+                    self._loading = True
+                else:
+                    self._pointer_mtime = pointer_mtime
+            if start:
+                threading.Thread(
+                    target=self._load_in_background,
+                    args=(pointer_mtime,),
+                    name="index-loader",
+                    daemon=True
+                ).start()
+        
+        self.refresh_tombstones()
+    
+    def _load_in_background(self, pointer_mtime: Optional[float]):
+        try:
+            self._swap(self._load_generation(IndexStore().current()))
+            self._pointer_mtime = pointer_mtime
+        except Exception as e:
+            # Keep serving the current generation; retried on the next query
+            logger.error(f"Error loading new index generation: {e}", exc_info=True)
+        finally:
+            self._loading = False
+    
+    def refresh_tombstones(self):
+        """Apply chunk deletions recorded since the current generation was loaded."""
+        snapshot = self._snapshot
+        if snapshot.generation is None:
+            return
+        
+        generation = IndexStore().current()
+        if generation is None or generation.name != snapshot.generation:
+            return
+        
+        tombstone_store = generation.tombstones()
+        mtime = tombstone_store.mtime()
+        if mtime == snapshot.tombstone_mtime:
+            return
+        
+        tombstones = tombstone_store.load()
+        self._swap(snapshot.with_tombstones(tombstones, mtime))
+        logger.info(f"Applied {len(tombstones)} tombstoned chunks")
+    
+    @staticmethod
+    def _search_params(snapshot: IndexSnapshot, bitmap: Optional[np.ndarray]):
+        """FAISS search parameters restricted to the chunks of an allowed bitmap."""
+        selector = None
+        if bitmap is not None:
+            selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+        return search_parameters(snapshot.faiss_index, selector)
+    
+    @staticmethod
+    def _dense_results(
+        snapshot: IndexSnapshot,
+        metric: str,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        unit_norm: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Results for one row of a FAISS search, and how many were dropped.
+        
+        Results carry a cosine "dense_similarity" on cosine indices, and on
+        L2 indices when the embedding model outputs unit vectors (unit_norm),
+        where it follows from the squared distance as 1 - d/2.
+        """
+        # Cosine similarities allow dropping clearly irrelevant neighbours
+        # before fusion and cross-encoder reranking
+        results = []
+        dropped = 0
+        for idx, distance in zip(indices, distances):
+            if metric == "cosine" and distance < settings.dense_min_similarity:
+                dropped += 1
+                continue
+            if 0 <= idx < len(snapshot.chunk_metadata):
+                metadata = snapshot.chunk_metadata[idx]
+                result = {
+                    "chunk_id": metadata["chunk_id"],
+                    "content": metadata["content"],
+                    "metadata": metadata.get("metadata", {}),
+                    "dense_score": float(distance)
+                }
+                # Comparable across queries, used for rerank pruning
+                if metric == "cosine":
+                    result["dense_similarity"] = float(distance)
+                elif unit_norm:
+                    result["dense_similarity"] = 1.0 - float(distance) / 2
+                results.append(result)
+        return results, dropped
+    
+    async def retrieve_dense(
+        self,
+        query: str,
+        top_k: int,
+        snapshot: Optional[IndexSnapshot] = None,
+        filters: Optional[Dict[str, tuple]] = None,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
         """
         Dense retrieval using FAISS vector search.
         
         Args:
             query: Query string
             top_k: Number of results to retrieve
+            snapshot: Index snapshot pinned by the caller (default: current)
+            filters: Normalized metadata filters (see normalize_filters)
+            query_embedding: Raw embedding of the query, if already computed
         
         Returns:
-            List of retrieval results with chunk_id, content, metadata, and score
+            List of retrieval results with chunk_id, content, metadata, and
+            dense_score: cosine similarity (higher is better) for cosine
+            indices, L2 distance (lower is better) otherwise
         """
-        if not self.loaded or self.faiss_index is None:
+        snapshot = snapshot or self._snapshot
+        if not self.loaded or snapshot.faiss_index is None:
             logger.warning("FAISS index not loaded, returning empty results")
             return []
         
         try:
-            # Encode query
-            query_embedding = self.embedding_model.encode([query], convert_to_numpy=True)
+            # Filters and deletions are applied inside the FAISS search as an
+            # ID selector, so excluded vectors are skipped rather than scored
+            bitmap = snapshot.allowed_bitmap(filters)
+            if bitmap is not None and not bitmap.any():
+                return []
+            params = self._search_params(snapshot, bitmap)
             
-            # Search FAISS index
-            distances, indices = self.faiss_index.search(query_embedding, top_k)
+            # Encode query (normalized for cosine indices)
+            metric = index_metric(snapshot.faiss_index)
+            if query_embedding is None:
+                embedding = await stage_limiter("encoder").run(self.embedding_model.encode, [query], convert_to_numpy=True)
+            else:
+                embedding = np.asarray(query_embedding).reshape(1, -1)
+            query_vector = prepare_vectors(embedding, metric)
             
-            # Build results
-            results = []
-            for idx, distance in zip(indices[0], distances[0]):
-                if idx < len(self.chunk_metadata):
-                    metadata = self.chunk_metadata[idx]
-                    results.append({
-                        "chunk_id": metadata["chunk_id"],
-                        "content": metadata["content"],
-                        "metadata": metadata.get("metadata", {}),
-                        "dense_score": float(distance)
-                    })
+            # Search FAISS index
+            distances, indices = snapshot.faiss_index.search(query_vector, top_k, params=params)
+            results, dropped = self._dense_results(
+                snapshot, metric, indices[0], distances[0], _unit_norm(embedding)[0]
+            )
             
-            logger.info(f"Dense retrieval: {len(results)} results")
+            logger.info(f"Dense retrieval: {len(results)} results ({dropped} below similarity threshold)")
             return results
             
+        except OverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Error in dense retrieval: {e}", exc_info=True)
             return []
     
-    async def retrieve_sparse(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+    async def retrieve_dense_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        snapshot: Optional[IndexSnapshot] = None,
+        filters: Optional[List[Optional[Dict[str, tuple]]]] = None,
+        query_embeddings: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Dense retrieval for several queries: one encode call, and one
+        multi-row FAISS search per distinct filter combination.
+        
+        Args:
+            queries: Query strings
+            top_k: Number of results to retrieve per query
+            snapshot: Index snapshot pinned by the caller (default: current)
+            filters: Normalized metadata filters per query (default: none)
+            query_embeddings: Raw embeddings per query, None where not yet computed
+        
+        Returns:
+            Results per query, as returned by retrieve_dense
+        """
+        snapshot = snapshot or self._snapshot
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not self.loaded or snapshot.faiss_index is None:
+            logger.warning("FAISS index not loaded, returning empty results")
+            return batch_results
+        filters = filters or [None] * len(queries)
+        
+        # Queries with the same filters share one search (and selector)
+        groups: Dict[Any, List[int]] = {}
+        for row, query_filters in enumerate(filters):
+            key = tuple(sorted(query_filters.items())) if query_filters else None
+            groups.setdefault(key, []).append(row)
+        
+        try:
+            metric = index_metric(snapshot.faiss_index)
+            embeddings = list(query_embeddings or [None] * len(queries))
+            missing = [row for row, embedding in enumerate(embeddings) if embedding is None]
+            if missing:
+                encoded = await stage_limiter("encoder").run(
+                    self.embedding_model.encode, [queries[row] for row in missing], convert_to_numpy=True
+                )
+                for row, embedding in zip(missing, encoded):
+                    embeddings[row] = embedding
+            query_vectors = prepare_vectors(np.vstack(embeddings), metric)
+            unit_norm = _unit_norm(np.vstack(embeddings))
+            
+            dropped = 0
+            for rows in groups.values():
+                bitmap = snapshot.allowed_bitmap(filters[rows[0]])
+                if bitmap is not None and not bitmap.any():
+                    continue
+                params = self._search_params(snapshot, bitmap)
+                distances, indices = snapshot.faiss_index.search(query_vectors[rows], top_k, params=params)
+                for row, row_indices, row_distances in zip(rows, indices, distances):
+                    batch_results[row], row_dropped = self._dense_results(
+                        snapshot, metric, row_indices, row_distances, unit_norm[row]
+                    )
+                    dropped += row_dropped
+            
+            total = sum(len(results) for results in batch_results)
+            logger.info(
+                f"Batch dense retrieval: {total} results for {len(queries)} queries "
+                f"in {len(groups)} searches ({dropped} below similarity threshold)"
+            )
+            return batch_results
+            
+        except OverloadedError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in batch dense retrieval: {e}", exc_info=True)
+            return [[] for _ in queries]
+    
+    async def retrieve_sparse(
+        self,
+        query: str,
+        top_k: int,
+        snapshot: Optional[IndexSnapshot] = None,
+        filters: Optional[Dict[str, tuple]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Sparse retrieval using BM25 keyword matching.
         
         Args:
             query: Query string
             top_k: Number of results to retrieve
+            snapshot: Index snapshot pinned by the caller (default: current)
+            filters: Normalized metadata filters (see normalize_filters)
         
         Returns:
             List of retrieval results with chunk_id, content, metadata, and score
         """
-        if not self.loaded or self.bm25_index is None:
+        snapshot = snapshot or self._snapshot
+        if not self.loaded or snapshot.bm25_index is None:
             logger.warning("BM25 index not loaded, returning empty results")
             return []
         
         try:
-            # Tokenize query (simple whitespace tokenization)
-            query_tokens = query.lower().split()
-            
-            # Get BM25 scores
-            scores = self.bm25_index.get_scores(query_tokens)
-            
-            # Get top-k indices
-            top_indices = np.argsort(scores)[::-1][:top_k]
-            
-            # Build results
-            results = []
-            for idx in top_indices:
-                if idx < len(self.chunk_metadata):
-                    metadata = self.chunk_metadata[idx]
-                    results.append({
-                        "chunk_id": metadata["chunk_id"],
-                        "content": metadata["content"],
-                        "metadata": metadata.get("metadata", {}),
-                        "sparse_score": float(scores[idx])
-                    })
-            
+            results = await stage_limiter("bm25").run(self._score_sparse, query, top_k, snapshot, filters)
             logger.info(f"Sparse retrieval: {len(results)} results")
             return results
             
+        except OverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Error in sparse retrieval: {e}", exc_info=True)
             return []
     
-    async def retrieve_hybrid(self, query: str, top_k: int = 20) -> Dict[str, Any]:
+    def _score_sparse(
+        self,
+        query: str,
+        top_k: int,
+        snapshot: IndexSnapshot,
+        filters: Optional[Dict[str, tuple]]
+    ) -> List[Dict[str, Any]]:
+        """Analyze the query and score it against the BM25 index (blocking)."""
+        # Analyze the query exactly like the indexed chunks
+        if snapshot.bm25_vocabulary is not None:
+            query_terms = analyze(query)
+        else:
+            query_terms = query.lower().split()
+        
+        # Indic terms are expanded with English vocabulary terms, so an
+        # untranslated query can still match the (mostly English) corpus
+        if snapshot.term_dictionary is not None and settings.cross_lingual_mode in ("expand", "both"):
+            expansions = snapshot.term_dictionary.expand(query, self._encode_terms)
+            if expansions:
+                logger.info(f"Expanded query with {len(expansions)} English terms: {expansions}")
+                query_terms += expansions
+        
+        # Terms outside the vocabulary match nothing and are not scored
+        if snapshot.bm25_vocabulary is not None:
+            query_tokens = snapshot.bm25_vocabulary.lookup(query_terms)
+        else:
+            query_tokens = query_terms
+        if not query_tokens:
+            return []
+        
+        # Get BM25 scores, only for allowed chunks when filtering
+        bitmap = snapshot.allowed_bitmap(filters)
+        if bitmap is None:
+            candidates = None
+            scores = snapshot.bm25_index.get_scores(query_tokens)
+        else:
+            n_docs = len(snapshot.bm25_index.doc_len)
+            candidates = np.flatnonzero(np.unpackbits(bitmap, count=n_docs, bitorder="little"))
+            if len(candidates) == 0:
+                return []
+            scores = np.asarray(snapshot.bm25_index.get_batch_scores(query_tokens, candidates.tolist()))
+        
+        # Get top-k indices
+        top = np.argsort(scores)[::-1][:top_k]
+        top_indices = top if candidates is None else candidates[top]
+        top_scores = scores[top]
+        
+        # Build results
+        results = []
+        for idx, score in zip(top_indices, top_scores):
+            if idx < len(snapshot.chunk_metadata):
+                metadata = snapshot.chunk_metadata[idx]
+                results.append({
+                    "chunk_id": metadata["chunk_id"],
+                    "content": metadata["content"],
+                    "metadata": metadata.get("metadata", {}),
+                    "sparse_score": float(score)
+                })
+        
+        return results
+    
+    def _score_sparse_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        snapshot: IndexSnapshot,
+        filters: List[Optional[Dict[str, tuple]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Score several queries against the BM25 index (blocking, one thread hop)."""
+        batch_results = []
+        for query, query_filters in zip(queries, filters):
+            try:
+                batch_results.append(self._score_sparse(query, top_k, snapshot, query_filters))
+            except Exception as e:
+                logger.error(f"Error in sparse retrieval: {e}", exc_info=True)
+                batch_results.append([])
+        return batch_results
+    
+    def _encode_terms(self, terms: List[str]) -> np.ndarray:
+        """Normalized embeddings of query terms (for term expansion)."""
+        return self.embedding_model.encode(terms, convert_to_numpy=True, normalize_embeddings=True)
+    
+    async def retrieve_hybrid(
+        self,
+        query: str,
+        top_k: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Perform hybrid retrieval (both dense and sparse).
         
         Args:
             query: Query string
             top_k: Number of results to retrieve from each method
+            filters: Metadata filters, {field: value or list of values};
+                values within a field are OR-ed, fields are AND-ed
+            query_embedding: Raw embedding of the query, if already computed
         
         Returns:
             Dictionary with dense_results and sparse_results lists
         """
         if not self.loaded:
             self.load_indices()
+        else:
+            self.refresh()
         
-        # Retrieve from both methods
-        dense_results = await self.retrieve_dense(query, top_k)
-        sparse_results = await self.retrieve_sparse(query, top_k)
+        filters = normalize_filters(filters)
+        
+        # Retrieve from both methods against the same generation
+        with self.acquire() as snapshot:
+            dense_results = await self.retrieve_dense(query, top_k, snapshot, filters, query_embedding)
+            sparse_results = await self.retrieve_sparse(query, top_k, snapshot, filters)
         
         return {
             "dense_results": dense_results,
             "sparse_results": sparse_results
         }
+    
+    
+    async def retrieve_hybrid_batch(
+        self,
+        queries: List[str],
+        top_k: int = 20,
+        filters: Optional[List[Optional[Dict[str, Any]]]] = None,
+        query_embeddings: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Hybrid retrieval for a batch of queries.
+        
+        All queries are encoded in one call and searched with multi-row
+        FAISS searches; BM25 scoring runs in one worker thread hop.
+        
+        Args:
+            queries: Query strings
+            top_k: Number of results to retrieve from each method per query
+            filters: Metadata filters per query (see retrieve_hybrid)
+            query_embeddings: Raw embeddings per query, None where not yet computed
+        
+        Returns:
+            Dictionary with dense_results and sparse_results per query
+        """
+        if not self.loaded:
+            self.load_indices()
+        else:
+            self.refresh()
+        
+        filters = [normalize_filters(query_filters) for query_filters in (filters or [None] * len(queries))]
+        
+        # Retrieve from both methods against the same generation
+        with self.acquire() as snapshot:
+            dense_results = await self.retrieve_dense_batch(queries, top_k, snapshot, filters, query_embeddings)
+            if not self.loaded or snapshot.bm25_index is None:
+                logger.warning("BM25 index not loaded, returning empty results")
+                sparse_results = [[] for _ in queries]
+            else:
+                sparse_results = await stage_limiter("bm25").run(
+                    self._score_sparse_batch, queries, top_k, snapshot, filters
+                )
+        
+        return [
+            {"dense_results": dense, "sparse_results": sparse}
+            for dense, sparse in zip(dense_results, sparse_results)
+        ]
 
 
 # Global retriever instance
@@ -0,0 +1,217 @@
+"""
+Offline cross-lingual query expansion for BM25.
+
+At index time the English BM25 vocabulary is embedded with the
+multilingual embedding model and stored with the index generation as a
+term dictionary. Hindi, Tamil and Telugu query terms are mapped to their
+nearest English vocabulary terms in-process, so sparse retrieval can match
+an English corpus without calling an external translation service.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import logging
+import pickle
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from backend.config import settings
+from backend.retriever.analyzer import ENGLISH_STOPWORDS, is_indic, stem, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Encodes texts into L2-normalized embeddings
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+# English vocabulary terms eligible as expansions
+_TERM_RE = re.compile(r"^[a-z]{3,}$")
+
+# Expansions of unseen query terms kept in memory
+_MEMO_SIZE = 10000
+
+
+def expandable_terms(query: str) -> List[str]:
+    """Indic-script content words of a query (analyzer tokens, unstemmed), without duplicates."""
+    return list(dict.fromkeys(token for token in tokenize(query) if is_indic(token)))
+
+
+def english_vocabulary(idf: Dict[str, float], max_terms: int) -> List[str]:
+    """
+    Clean English terms of a BM25 vocabulary.
+    
+    Args:
+        idf: BM25 IDF per vocabulary token
+        max_terms: Maximum number of terms kept (the most common ones)
+    
+    Returns:
+        Sorted list of at most max_terms terms
+    """
+    terms = [t for t in idf if _TERM_RE.match(t) and t not in ENGLISH_STOPWORDS]
+    terms.sort(key=lambda t: (idf[t], t))
+    return sorted(terms[:max_terms])
+
+
+class TermDictionary:
+    """
+    English vocabulary embeddings plus precomputed Indic → English expansions.
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        terms: List[str],
+        embeddings: np.ndarray,
+        entries: Optional[Dict[str, List[Tuple[str, float]]]] = None
+    ):
+        """
+        Initialize term dictionary.
+        
+        Args:
+            model: Embedding model the vectors come from
+            terms: English vocabulary terms
+            embeddings: Normalized term embeddings (float16), one row per term
+            entries: Precomputed expansions {indic term: [(english term, similarity)]}
+        """
+        self.model = model
+        self.terms = terms
+        self.embeddings = embeddings
+        self.entries = entries or {}
+        self._matrix = embeddings.astype('float32')
+        self._memo: "OrderedDict[str, List[Tuple[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def build(
+        cls,
+        idf: Dict[str, float],
+        encode: EncodeFn,
+        previous: Optional["TermDictionary"] = None
+    ) -> "TermDictionary":
+        """
+        Build the dictionary for a BM25 vocabulary.
+        
+        Embeddings of terms already in the previous generation's dictionary
+        are reused, so incremental ingestion only embeds new terms.
+        
+        Args:
+            idf: BM25 IDF per vocabulary token
+            encode: Function embedding a list of texts (normalized)
+            previous: Dictionary of the previous generation, if any
+        
+        Returns:
+            New term dictionary
+        """
+        terms = english_vocabulary(idf, settings.query_expansion_max_terms)
+        if previous is not None and previous.model != settings.embedding_model:
+            previous = None
+        
+        known = {term: i for i, term in enumerate(previous.terms)} if previous is not None else {}
+        missing = [term for term in terms if term not in known]
+        
+        if terms:
+            new_vectors = encode(missing).astype('float16') if missing else None
+            new_rows = {term: i for i, term in enumerate(missing)}
+            embeddings = np.vstack([
+                new_vectors[new_rows[term]] if term in new_rows else previous.embeddings[known[term]]
+                for term in terms
+            ])
+        else:
+            embeddings = np.zeros((0, 0), dtype='float16')
+        
+        dictionary = cls(settings.embedding_model, terms, embeddings)
+        
+        # Indic terms that occur in the corpus itself are resolved up front
+        indic = sorted(t for t in idf if is_indic(t))
+        if indic and terms:
+            dictionary.entries = dict(zip(indic, dictionary._nearest(encode(indic))))
+        
+        logger.info(
+            f"Term dictionary built: {len(terms)} English terms ({len(missing)} embedded), "
+            f"{len(dictionary.entries)} Indic entries"
+        )
+        return dictionary
+    
+    def _nearest(self, vectors: np.ndarray) -> List[List[Tuple[str, float]]]:
+        """Nearest English terms above the similarity threshold for each vector."""
+        n = settings.query_expansion_terms
+        similarities = vectors.astype('float32') @ self._matrix.T
+        expansions = []
+        for row in similarities:
+            k = min(n, len(row))
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            expansions.append([
+                (self.terms[i], round(float(row[i]), 4))
+                for i in top if row[i] >= settings.query_expansion_min_similarity
+            ])
+        return expansions
+    
+    def expand(self, query: str, encode: EncodeFn) -> List[str]:
+        """
+        English BM25 terms for the Indic terms of a query.
+        
+        Args:
+            query: Query text
+            encode: Function embedding a list of texts (normalized), used
+                for terms not seen before
+        
+        Returns:
+            Expansion terms (empty if the query has no Indic terms)
+        """
+        terms = expandable_terms(query)
+        if not terms or not self.terms:
+            return []
+        
+        found: Dict[str, List[Tuple[str, float]]] = {}
+        unseen = []
+        with self._lock:
+            for term in terms:
+                if stem(term) in self.entries:
+                    found[term] = self.entries[stem(term)]
+                elif term in self._memo:
+                    self._memo.move_to_end(term)
+                    found[term] = self._memo[term]
+                else:
+                    unseen.append(term)
+        
+        if unseen:
+            nearest = self._nearest(encode(unseen))
+            with self._lock:
+                for term, expansion in zip(unseen, nearest):
+                    found[term] = expansion
+                    self._memo[term] = expansion
+                while len(self._memo) > _MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        
+        expansions = []
+        for term in terms:
+            for english, _ in found[term]:
+                if english not in expansions:
+                    expansions.append(english)
+        return expansions
+    
+    def save(self, path: Path):
+        """Write the dictionary to a pickle file."""
+        with open(path, "wb") as f:
+            pickle.dump({
+                "model": self.model,
+                "terms": self.terms,
+                "embeddings": self.embeddings,
+                "entries": self.entries
+            }, f)
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional["TermDictionary"]:
+        """Read a dictionary written by save, or None if missing or unreadable."""
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            return cls(data["model"], data["terms"], data["embeddings"], data.get("entries"))
+        except Exception as e:
+            logger.warning(f"Could not load term dictionary {path}: {e}")
+            return None
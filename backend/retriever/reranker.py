@@ -2,13 +2,77 @@
 Cross-encoder reranker for final result ranking.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+import time
 from sentence_transformers import CrossEncoder
 
+from backend.config import settings
+from backend.retriever.analyzer import analyze
+from backend.utils.admission import OverloadedError, stage_limiter
+
 logger = logging.getLogger(__name__)
 
 
+def _terms(text: str) -> set:
+    return set(analyze(text))
+
+
+def select_candidates(
+    query: str,
+    results: List[Dict[str, Any]],
+    top_k: int
+) -> List[Dict[str, Any]]:
+    """
+    Cheap first-stage pruning of fused results before cross-encoder scoring.
+    
+    The first top_k results (in RRF order) are always kept. Beyond them a
+    candidate is dropped if:
+    - its RRF score is below settings.rerank_rrf_ratio of the best one
+      (only bites when the leaders were found by both retrievers);
+    - it was found by dense search alone and its cosine similarity trails
+      the best by more than settings.rerank_dense_gap (needs a cosine
+      index, or an embedding model that outputs unit vectors);
+    - it was found by dense search alone and shares no BM25 term with the
+      query, provided some candidate does (cross-lingual matches share none).
+    At most settings.rerank_max_pairs candidates are returned.
+    
+    Args:
+        query: Query used for retrieval (translated, if translation is on)
+        results: Fused results sorted by RRF score
+        top_k: Results the reranker must return
+    
+    Returns:
+        Candidates to score, in RRF order
+    """
+    if len(results) <= top_k:
+        return list(results)
+    
+    top_rrf = results[0].get("rrf_score", 0.0)
+    similarities = [r["dense_similarity"] for r in results if "dense_similarity" in r]
+    top_similarity = max(similarities) if similarities else None
+    
+    query_terms = _terms(query)
+    overlaps = [len(query_terms & _terms(r.get("content", ""))) for r in results]
+    lexical_signal = any(overlaps)
+    
+    candidates = list(results[:top_k])
+    for result, overlap in zip(results[top_k:], overlaps[top_k:]):
+        if len(candidates) >= settings.rerank_max_pairs:
+            break
+        if result.get("rrf_score", 0.0) < top_rrf * settings.rerank_rrf_ratio:
+            continue
+        dense_only = "sparse_score" not in result
+        if dense_only and top_similarity is not None and "dense_similarity" in result:
+            if result["dense_similarity"] < top_similarity - settings.rerank_dense_gap:
+                continue
+        if dense_only and lexical_signal and overlap == 0:
+            continue
+        candidates.append(result)
+    
+    return candidates
+
+
 class Reranker:
     """
     Cross-encoder reranker for improving retrieval quality.
@@ -64,7 +128,7 @@ class Reranker:
             pairs = [[query, result["content"]] for result in results]
             
             # Get cross-encoder scores (batch inference)
-            scores = self.model.predict(pairs, show_progress_bar=False)
+            scores = await stage_limiter("reranker").run(self.model.predict, pairs, show_progress_bar=False)
             
             # Add scores to results
             for result, score in zip(results, scores):
@@ -84,6 +148,172 @@ class Reranker:
             logger.error(f"Error during reranking: {e}", exc_info=True)
             # Fallback: return original results
             return results[:top_k]
+    
+    async def rerank_adaptive(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        top_k: int = 5,
+        retrieval_query: Optional[str] = None,
+        budget_ms: Optional[float] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Rerank with a per-query number of cross-encoder pairs.
+        
+        Candidates surviving select_candidates are scored in RRF order, in
+        batches. Scoring stops when a batch places nothing in the current
+        top-k (later candidates rank lower on both retrievers), or when the
+        next batch would exceed the latency budget. Unscored candidates only
+        fill the result if fewer than top_k were scored.
+        
+        Args:
+            query: Original query string
+            results: Fused results sorted by RRF score
+            top_k: Number of top results to return
+            retrieval_query: Query used for retrieval (default: query)
+            budget_ms: Cross-encoder time budget (default: settings.rerank_budget_ms)
+        
+        Returns:
+            (reranked results, stats with candidates, pairs_scored and stop_reason)
+        """
+        stats = {"candidates": len(results), "pairs_scored": 0, "stop_reason": "exhausted"}
+        if not results:
+            return [], stats
+        
+        if not self.loaded:
+            self.load_model()
+        
+        candidates = select_candidates(retrieval_query or query, results, top_k)
+        stats["after_pruning"] = len(candidates)
+        
+        budget = (budget_ms if budget_ms is not None else settings.rerank_budget_ms) / 1000
+        batch_size = max(settings.rerank_batch_size, 1)
+        scored: List[Dict[str, Any]] = []
+        start = time.perf_counter()
+        
+        try:
+            position = 0
+            while position < len(candidates):
+                # The first batch always covers top_k so there is something to return
+                size = max(batch_size, top_k) if not scored else batch_size
+                batch = candidates[position:position + size]
+                
+                if scored:
+                    elapsed = time.perf_counter() - start
+                    if elapsed + elapsed / len(scored) * len(batch) > budget:
+                        stats["stop_reason"] = "budget"
+                        break
+                
+                kth_best = None
+                if len(scored) >= top_k:
+                    kth_best = sorted((r["rerank_score"] for r in scored), reverse=True)[top_k - 1]
+                
+                scores = await stage_limiter("reranker").run(
+                    self.model.predict, [[query, r["content"]] for r in batch], show_progress_bar=False
+                )
+                for result, score in zip(batch, scores):
+                    result["rerank_score"] = float(score)
+                scored.extend(batch)
+                position += len(batch)
+                
+                if kth_best is not None and max(float(s) for s in scores) <= kth_best:
+                    stats["stop_reason"] = "converged"
+                    break
+        
+        except OverloadedError as e:
+            # Saturated cross-encoder: keep what was scored, RRF order otherwise
+            logger.warning(f"Reranking skipped: {e}")
+            stats["stop_reason"] = "overloaded"
+            if not scored:
+                return results[:top_k], stats
+        except Exception as e:
+            logger.error(f"Error during reranking: {e}", exc_info=True)
+            stats["stop_reason"] = "error"
+            if not scored:
+                return results[:top_k], stats
+        
+        stats["pairs_scored"] = len(scored)
+        stats["seconds"] = time.perf_counter() - start
+        
+        reranked = sorted(scored, key=lambda x: x["rerank_score"], reverse=True)[:top_k]
+        if len(reranked) < top_k:
+            reranked += [r for r in candidates if "rerank_score" not in r][:top_k - len(reranked)]
+        
+        logger.info(
+            f"Reranked {stats['pairs_scored']} of {len(results)} candidates "
+            f"({stats['after_pruning']} after pruning, stop: {stats['stop_reason']}) → top {len(reranked)}"
+        )
+        return reranked, stats
+    
+    async def rerank_batch(
+        self,
+        queries: List[str],
+        results: List[List[Dict[str, Any]]],
+        top_k: int = 5,
+        retrieval_queries: Optional[List[str]] = None
+    ) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Rerank the results of several queries with one cross-encoder call.
+        
+        Candidates are pruned per query as in rerank_adaptive (when enabled),
+        then the pairs of all queries are scored together. There is no early
+        stopping: one large predict uses the model better than many small
+        batches, which is the point of batching queries.
+        
+        Args:
+            queries: Original query strings
+            results: Fused results per query, sorted by RRF score
+            top_k: Number of top results to return per query
+            retrieval_queries: Queries used for retrieval (default: queries)
+        
+        Returns:
+            (reranked results per query, stats per query as in rerank_adaptive)
+        """
+        retrieval_queries = retrieval_queries or queries
+        if settings.rerank_adaptive:
+            candidates = [
+                select_candidates(retrieval_query, query_results, top_k)
+                for retrieval_query, query_results in zip(retrieval_queries, results)
+            ]
+        else:
+            candidates = [list(query_results) for query_results in results]
+        stats = [
+            {"candidates": len(query_results), "after_pruning": len(query_candidates), "pairs_scored": 0, "stop_reason": "batch"}
+            for query_results, query_candidates in zip(results, candidates)
+        ]
+        
+        pairs = [[query, r["content"]] for query, query_candidates in zip(queries, candidates) for r in query_candidates]
+        if not pairs:
+            return [[] for _ in queries], stats
+        
+        if not self.loaded:
+            self.load_model()
+        
+        try:
+            scores = await stage_limiter("reranker").run(self.model.predict, pairs, show_progress_bar=False)
+        except OverloadedError as e:
+            # Saturated cross-encoder: RRF order for the whole batch
+            logger.warning(f"Batch reranking skipped: {e}")
+            for query_stats in stats:
+                query_stats["stop_reason"] = "overloaded"
+            return [query_results[:top_k] for query_results in results], stats
+        except Exception as e:
+            logger.error(f"Error during batch reranking: {e}", exc_info=True)
+            for query_stats in stats:
+                query_stats["stop_reason"] = "error"
+            return [query_results[:top_k] for query_results in results], stats
+        
+        reranked = []
+        position = 0
+        for query_candidates, query_stats in zip(candidates, stats):
+            for result in query_candidates:
+                result["rerank_score"] = float(scores[position])
+                position += 1
+            query_stats["pairs_scored"] = len(query_candidates)
+            reranked.append(sorted(query_candidates, key=lambda x: x["rerank_score"], reverse=True)[:top_k])
+        
+        logger.info(f"Batch reranked {len(pairs)} pairs for {len(queries)} queries")
+        return reranked, stats
 
 
 # Global reranker instance
@@ -26,6 +26,8 @@ def reciprocal_rank_fusion(
     
     Returns:
         Fused and re-ranked list of results, sorted by RRF score descending.
+        Each result keeps the score fields of every retriever that found it
+        and records in rrf_hits how many retrievers that was.
     """
     
     if not retrieval_results:
@@ -33,6 +35,7 @@ def reciprocal_rank_fusion(
     
     # Dictionary to accumulate RRF scores
     rrf_scores: Dict[str, float] = {}
+    rrf_hits: Dict[str, int] = {}
     document_map: Dict[str, Dict[str, Any]] = {}
     
     # Process each retriever's results
@@ -50,9 +53,14 @@ def reciprocal_rank_fusion(
             # Accumulate score
             if chunk_id in rrf_scores:
                 rrf_scores[chunk_id] += rrf_contribution
+                rrf_hits[chunk_id] += 1
+                document_map[chunk_id].update(
+                    (key, value) for key, value in result.items() if key.endswith(("_score", "_similarity"))
+                )
             else:
                 rrf_scores[chunk_id] = rrf_contribution
-                document_map[chunk_id] = result
+                rrf_hits[chunk_id] = 1
+                document_map[chunk_id] = result.copy()
     
     # Sort by RRF score descending
     sorted_chunk_ids = sorted(
@@ -64,8 +72,9 @@ def reciprocal_rank_fusion(
     # Build final ranked list
     fused_results = []
     for chunk_id in sorted_chunk_ids:
-        result = document_map[chunk_id].copy()
+        result = document_map[chunk_id]
         result["rrf_score"] = rrf_scores[chunk_id]
+        result["rrf_hits"] = rrf_hits[chunk_id]
         fused_results.append(result)
     
     logger.info(f"RRF fusion: {len(retrieval_results)} retrievers → {len(fused_results)} unique results")
@@ -0,0 +1,496 @@
+"""
+Aggregate and filter queries over the columnar table store.
+
+A heuristic planner maps questions like "total funding raised by fintech
+startups in 2020" onto a table, a measure column, row filters and an
+optional group-by, executes them with vectorized pandas operations and
+renders the result as a compact table for the LLM prompt.
+
+Planning only uses per-table profiles (column roles and the filter
+vocabulary), built once per table version; tables whose catalog columns
+cannot hold the requested measure are skipped without being read, and
+only the tables that are actually queried are loaded.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.ingestion.table_store import TableStore, get_table_store
+
+logger = logging.getLogger(__name__)
+
+
+# Aggregate intents, checked in order
+_AGGREGATES: List[Tuple[str, re.Pattern]] = [
+    ("mean", re.compile(r"\b(average|avg|mean)\b")),
+    ("sum", re.compile(r"\b(total|sum|overall|combined|aggregate)\b")),
+    ("count", re.compile(r"\b(how many|number of|count of|count)\b")),
+    ("max", re.compile(r"\b(top \d+|top|highest|largest|biggest|maximum|max|most)\b")),
+    ("min", re.compile(r"\b(lowest|smallest|least|minimum|min)\b")),
+]
+
+_TOP_N_RE = re.compile(r"\btop (\d+)\b")
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+_GROUP_RE = re.compile(r"\b(?:by|per|each|across|for each)\s+([a-z][a-z ]{1,30}?)(?:\s+(?:in|for|during|of|from|with)\b|[?.,]|$)")
+_WISE_RE = re.compile(r"\b([a-z]+)[- ]wise\b")
+_TOP_GROUP_RE = re.compile(r"\b(?:top|bottom)\s+(?:\d+\s+)?([a-z]+)\s+by\b")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that never act as row filters
+_STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "by", "per", "each", "and", "or", "with",
+    "what", "which", "who", "how", "many", "much", "is", "are", "was", "were", "did", "do", "does",
+    "total", "sum", "average", "avg", "mean", "count", "number", "top", "highest", "lowest", "largest",
+    "smallest", "maximum", "minimum", "max", "min", "most", "least", "overall", "combined",
+    "startup", "startups", "company", "companies", "funding", "funded", "raised", "amount",
+    "list", "show", "give", "me", "all", "from", "during", "year", "between", "across", "wise",
+    "biggest", "bottom", "aggregate", "received", "secured", "invested"
+}
+
+# Question words that constrain nothing; every other query word must be used by the plan
+_QUESTION_WORDS = {
+    "please", "tell", "find", "get", "there", "have", "has", "had", "been", "be", "their", "they",
+    "them", "it", "its", "that", "this", "these", "those", "than", "at", "as", "about", "i", "we",
+    "you", "can", "could", "would", "should", "will", "any", "some", "based", "according", "data",
+    "dataset", "table", "rows", "records", "entries", "so", "far", "till", "until", "ever", "got",
+    "get", "ones", "where", "when", "whose", "value", "values", "name", "names"
+}
+
+# Words ignored when matching the question to column names
+_FUNCTION_WORDS = {"a", "an", "the", "of", "in", "on", "for", "to", "by", "and", "or", "is", "are", "was"}
+
+# Query words and the column-name words they refer to
+_MEASURE_SYNONYMS = {
+    "funding": {"amount", "funding", "raised", "investment", "usd", "inr"},
+    "raised": {"amount", "funding", "raised", "investment", "usd"},
+    "investment": {"amount", "funding", "investment", "usd"},
+    "valuation": {"valuation"},
+    "employees": {"employees", "employes", "employee"},
+    "revenue": {"revenue"},
+    "rating": {"rating"},
+    "layoffs": {"layoff"},
+    "cost": {"cost"},
+}
+
+# Group-by words and the column-name words they refer to
+_GROUP_SYNONYMS = {
+    "sector": {"sector", "industry", "vertical"},
+    "industry": {"industry", "sector", "vertical"},
+    "vertical": {"vertical", "industry", "sector"},
+    "city": {"city", "location", "headquarter", "hq"},
+    "location": {"location", "city", "headquarter", "hq"},
+    "round": {"round", "stage", "series"},
+    "stage": {"stage", "round", "series"},
+    "investor": {"investor", "investors"},
+}
+
+# Categorical columns with more distinct values than this are not scanned for filter terms
+_MAX_CATEGORIES = 2000
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def detect_aggregate(query: str) -> Optional[str]:
+    """
+    Detect an aggregate intent in a query.
+    
+    Returns:
+        One of sum, mean, count, max, min, or None for non-analytical queries
+    """
+    text = query.lower()
+    for op, pattern in _AGGREGATES:
+        if pattern.search(text):
+            return op
+    return None
+
+
+def is_analytical_query(query: str) -> bool:
+    """Whether a query asks for an aggregate that the table store may answer."""
+    return settings.enable_table_analytics and detect_aggregate(query) is not None
+
+
+def _lowered(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.lower().str.strip()
+
+
+class _TableProfile:
+    """Column roles and filter vocabulary of one table (kept without the DataFrame)."""
+    
+    def __init__(self, df: pd.DataFrame):
+        self.numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        self.dates = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+        self.text = [c for c in df.columns if c not in self.numeric and c not in self.dates]
+        self.terms: Dict[str, Set[str]] = {}
+        
+        for column in self.text:
+            uniques = _lowered(df[column]).dropna().unique()
+            if len(uniques) > _MAX_CATEGORIES:
+                continue
+            terms = set()
+            for value in uniques:
+                terms.add(value)
+                terms.update(part.strip() for part in re.split(r"[,/&|>]", value) if part.strip())
+            self.terms[column] = {t for t in terms if len(t) >= 3 and t not in _STOPWORDS}
+
+
+# table_id -> (table file mtime, profile)
+_profiles: Dict[str, Tuple[float, _TableProfile]] = {}
+_profiles_lock = threading.Lock()
+
+
+def _profile(store: TableStore, table_id: str) -> Optional[_TableProfile]:
+    """Profile of a table, rebuilt only when its file changes."""
+    mtime = store.modified(table_id)
+    if mtime is None:
+        return None
+    with _profiles_lock:
+        cached = _profiles.get(table_id)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    df = store.load(table_id)
+    if df is None or df.empty:
+        return None
+    profile = _TableProfile(df)
+    with _profiles_lock:
+        _profiles[table_id] = (mtime, profile)
+    return profile
+
+
+def _numeric_columns(entry: Dict[str, Any]) -> List[str]:
+    """Numeric columns of a table according to its catalog entry."""
+    return [
+        column["name"] for column in entry.get("columns", [])
+        if re.match(r"(u?int|float|Int|UInt|Float)", str(column.get("dtype", "")))
+    ]
+
+
+def _column_words(column: str) -> Set[str]:
+    return set(_tokens(column))
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def _pick_measure(query_tokens: Set[str], numeric: List[str]) -> Tuple[Optional[str], int]:
+    """
+    Pick the numeric column the question is about.
+    
+    Ties go to the column with the fewest words the query does not mention,
+    so "valuation" picks "Valuation ($B)" over "Entry Valuation($B)".
+    """
+    wanted = set(query_tokens) - _FUNCTION_WORDS
+    for token in query_tokens:
+        wanted |= _MEASURE_SYNONYMS.get(token, set())
+    
+    best, best_key = None, (0, 0)
+    for column in numeric:
+        words = _column_words(column)
+        if words & {"no", "id", "rank", "index", "unnamed", "sr", "s"} and len(words) <= 2:
+            continue
+        key = (len(words & wanted), -len(words - wanted))
+        if key[0] and (best is None or key > best_key):
+            best, best_key = column, key
+    return best, best_key[0]
+
+
+def _pick_group(query: str, profile: _TableProfile) -> Tuple[Optional[str], Set[str]]:
+    """
+    Pick the group-by column from "by sector", "per city", "state-wise", ...
+    
+    Returns:
+        (column or None, query words naming it)
+    """
+    text = query.lower()
+    phrases = [m.group(1).strip() for m in _GROUP_RE.finditer(text)]
+    phrases += [m.group(1) for m in _WISE_RE.finditer(text)]
+    phrases += [m.group(1) for m in _TOP_GROUP_RE.finditer(text)]
+    
+    for phrase in phrases:
+        words = {_singular(w) for w in _tokens(phrase) if w not in _STOPWORDS}
+        for column in profile.text:
+            column_words = {_singular(w) for w in _column_words(column)}
+            named = {w for w in words if column_words & _GROUP_SYNONYMS.get(w, {w})}
+            if named:
+                return column, named
+    return None, set()
+
+
+def _uncovered_words(
+    query: str,
+    entry: Dict[str, Any],
+    measure: Optional[str],
+    group_words: Set[str],
+    filters: Dict[str, List[str]],
+    years: List[int]
+) -> Set[str]:
+    """
+    Query words the plan does not use (as measure, group, filter, year,
+    top-N or table name); a plan that ignores a word ("unicorns", "common
+    mistakes") answers a different question.
+    """
+    used = {str(year) for year in years}
+    top_match = _TOP_N_RE.search(query.lower())
+    if top_match:
+        used.add(top_match.group(1))
+    used |= set(_tokens(entry.get("document", "")))
+    used |= group_words
+    for terms in filters.values():
+        for term in terms:
+            used.update(term.split())
+    if measure is not None:
+        measure_words = _column_words(measure)
+        used |= measure_words
+        used |= {word for word, synonyms in _MEASURE_SYNONYMS.items() if synonyms & measure_words}
+    used = {_singular(word) for word in used}
+    
+    ignored = _STOPWORDS | _FUNCTION_WORDS | _QUESTION_WORDS
+    return {word for word in _tokens(query) if word not in ignored and _singular(word) not in used}
+
+
+def _match_filters(query: str, profile: _TableProfile, exclude: Optional[str]) -> Dict[str, List[str]]:
+    """Find categorical values mentioned in the query, per column."""
+    words = _tokens(query)
+    grams = set()
+    for n in (1, 2, 3):
+        for i in range(len(words) - n + 1):
+            gram = " ".join(words[i:i + n])
+            if n > 1 or gram not in _STOPWORDS:
+                grams.add(gram)
+    
+    matches = {}
+    for column, terms in profile.terms.items():
+        if column == exclude:
+            continue
+        hits = sorted(terms & grams)
+        if hits:
+            matches[column] = hits
+    return matches
+
+
+def _document_year(entry: Dict[str, Any]) -> Optional[int]:
+    match = _YEAR_RE.search(entry.get("document", ""))
+    return int(match.group(1)) if match else None
+
+
+def _plan_table(query: str, entry: Dict[str, Any], profile: _TableProfile, op: str) -> Optional[Dict[str, Any]]:
+    """Plan a query against one table; None if the table does not fit."""
+    query_tokens = set(_tokens(query))
+    years = [int(y) for y in _YEAR_RE.findall(query)]
+    
+    measure, measure_score = _pick_measure(query_tokens, profile.numeric)
+    if op != "count" and measure is None:
+        return None
+    
+    group, group_words = _pick_group(query, profile)
+    filters = _match_filters(query, profile, exclude=group)
+    
+    # For counts the numeric column is irrelevant to how well the table fits
+    score = (2 * measure_score if op != "count" else 0) + len(filters) + (2 if group else 0)
+    score += len(query_tokens & set(_tokens(entry.get("document", ""))))
+    
+    year_filter = None
+    if years:
+        document_year = _document_year(entry)
+        year_columns = [c for c in profile.numeric if _column_words(c) == {"year"}]
+        if profile.dates:
+            year_filter = ("date", profile.dates[0])
+            score += 1
+        elif year_columns:
+            year_filter = ("year", year_columns[0])
+            score += 1
+        elif document_year is not None:
+            if document_year not in years:
+                return None
+            score += 2
+        else:
+            return None
+    
+    if score < 2:
+        return None
+    
+    uncovered = _uncovered_words(query, entry, measure if op != "count" else None, group_words, filters, years)
+    if uncovered:
+        logger.debug(f"Table {entry['table_id']} does not cover {sorted(uncovered)}")
+        return None
+    
+    return {
+        "op": op,
+        "measure": measure,
+        "group": group,
+        "filters": filters,
+        "years": years,
+        "year_filter": year_filter,
+        "score": score
+    }
+
+
+def _execute(df: pd.DataFrame, profile: _TableProfile, plan: Dict[str, Any], top_n: int) -> Tuple[pd.DataFrame, int]:
+    """Run a plan with vectorized masks and group-bys."""
+    mask = np.ones(len(df), dtype=bool)
+    
+    # A term found in several columns (e.g. Industry and SubVertical) may match any of them
+    columns_by_term: Dict[str, List[str]] = {}
+    for column, terms in plan["filters"].items():
+        for term in terms:
+            columns_by_term.setdefault(term, []).append(column)
+    
+    for term, columns in columns_by_term.items():
+        pattern = rf"(?:^|\b){re.escape(term)}(?:\b|$)"
+        term_mask = np.zeros(len(df), dtype=bool)
+        for column in columns:
+            term_mask |= _lowered(df[column]).str.contains(pattern, regex=True, na=False).to_numpy()
+        mask &= term_mask
+    
+    if plan["year_filter"] is not None:
+        kind, column = plan["year_filter"]
+        values = df[column].dt.year if kind == "date" else df[column]
+        mask &= values.isin(plan["years"]).to_numpy()
+    
+    rows = df[mask]
+    matched = len(rows)
+    op, measure, group = plan["op"], plan["measure"], plan["group"]
+    
+    if group:
+        grouped = rows.groupby(group, dropna=True)
+        if op == "count" or measure is None:
+            result = grouped.size().rename("count")
+        else:
+            # "Top/lowest sectors by funding" ranks groups by their total
+            result = grouped[measure].agg("mean" if op == "mean" else "sum")
+        result = result.sort_values(ascending=op == "min").head(top_n).reset_index()
+        return result, matched
+    
+    if op in ("max", "min") and measure is not None:
+        label_columns = [c for c in profile.text if c not in plan["filters"]][:2]
+        ranked = rows.nlargest(top_n, measure) if op == "max" else rows.nsmallest(top_n, measure)
+        return ranked[label_columns + [measure]], matched
+    
+    if op == "count" or measure is None:
+        return pd.DataFrame({"count": [matched]}), matched
+    
+    values = rows[measure]
+    return pd.DataFrame({
+        f"{op}({measure})": [values.agg(op)],
+        "rows_with_value": [int(values.notna().sum())]
+    }), matched
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return ""
+        return f"{value:,.0f}" if abs(value) >= 1000 or float(value).is_integer() else f"{value:,.2f}"
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def format_table(df: pd.DataFrame) -> str:
+    """Render a DataFrame as a compact pipe-separated table."""
+    lines = [" | ".join(str(c) for c in df.columns)]
+    for row in df.itertuples(index=False):
+        lines.append(" | ".join(_format_value(v) for v in row))
+    return "\n".join(lines)
+
+
+def _describe(entry: Dict[str, Any], plan: Dict[str, Any], matched: int) -> str:
+    parts = [f"Table: {entry['document']}" + (f" (sheet {entry['sheet_name']})" if entry.get("sheet_name") else "")]
+    conditions = [f"{column} matches {' or '.join(terms)}" for column, terms in plan["filters"].items()]
+    if plan["year_filter"] is not None:
+        conditions.append(f"{plan['year_filter'][1]} in {', '.join(map(str, plan['years']))}")
+    if conditions:
+        parts.append("Filter: " + "; ".join(conditions))
+    operation = plan["op"] if plan["measure"] is None else f"{plan['op']} of {plan['measure']}"
+    if plan["group"]:
+        operation += f" grouped by {plan['group']}"
+    parts.append(f"Computed: {operation} over {matched} of {entry['rows']} rows")
+    return "\n".join(parts)
+
+
+def answer_from_tables(
+    query: str,
+    store: Optional[TableStore] = None,
+    max_tables: int = 2
+) -> List[Dict[str, Any]]:
+    """
+    Answer an aggregate/filter question from the table store.
+    
+    Args:
+        query: User query (English)
+        store: Table store (default: global store)
+        max_tables: Maximum tables to report on
+    
+    Returns:
+        Context chunks holding compact result tables (empty if no table fits)
+    """
+    op = detect_aggregate(query)
+    if op is None:
+        return []
+    
+    store = store or get_table_store()
+    top_match = _TOP_N_RE.search(query.lower())
+    top_n = int(top_match.group(1)) if top_match else settings.analytics_max_rows
+    
+    query_tokens = set(_tokens(query))
+    
+    candidates = []
+    for entry in store.catalog():
+        # Only tables that have a column for the measure can answer non-count questions
+        if op != "count" and _pick_measure(query_tokens, _numeric_columns(entry))[0] is None:
+            continue
+        profile = _profile(store, entry["table_id"])
+        if profile is None:
+            continue
+        plan = _plan_table(query, entry, profile, op)
+        if plan is not None:
+            candidates.append((plan["score"], entry, profile, plan))
+    
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    
+    chunks = []
+    reported = set()
+    for _, entry, profile, plan in candidates:
+        if len(chunks) >= max_tables:
+            break
+        # The same file uploaded twice holds the same answer
+        source = (entry["document"], entry.get("sheet_name"))
+        if source in reported:
+            continue
+        df = store.load(entry["table_id"])
+        if df is None:
+            continue
+        try:
+            result, matched = _execute(df, profile, plan, min(top_n, settings.analytics_max_rows))
+        except Exception as e:
+            logger.warning(f"Table query failed on {entry['table_id']}: {e}")
+            continue
+        if matched == 0:
+            continue
+        reported.add(source)
+        
+        content = _describe(entry, plan, matched) + "\n" + format_table(result)
+        chunks.append({
+            "chunk_id": f"table:{entry['table_id']}",
+            "content": content,
+            "metadata": {
+                "document": entry["document"],
+                "document_id": entry["document_id"],
+                "type": "table_result",
+                "table_id": entry["table_id"],
+                "sheet_name": entry.get("sheet_name"),
+                "rows_matched": matched
+            }
+        })
+    
+    logger.info(f"Table analytics: {len(chunks)} results from {len(candidates)} candidate tables ({op})")
+    return chunks
@@ -0,0 +1,302 @@
+"""
+Admission control and per-stage concurrency limits for the query pipeline.
+
+Each stage (the query itself, query encoding, BM25 scoring, cross-encoder
+reranking, table analytics and LLM calls) has a concurrency limit and a
+bounded wait queue. Batch requests are admitted by a limiter of their
+own, so a long batch neither takes interactive query slots nor inflates
+their service time estimate.
+Blocking inference runs on a per-stage thread pool sized to the limit, so
+the event loop stays responsive and a burst of queries cannot start more
+parallel model calls than the CPU can serve. Requests that find a full
+queue, or wait longer than the queue timeout, are rejected immediately
+with an OverloadedError (HTTP 503 with Retry-After) instead of piling up
+until every request times out.
+
+Before queues fill up, degradation_tier() lets the query graph shed
+optional work, so admitted queries get a slightly worse answer quickly.
+Besides queue lengths, it watches the recent latency of the pre-LLM part
+of interactive queries; LLM time is left out, since it depends on the
+provider and answer length rather than on local load.
+"""
+
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+import asyncio
+import functools
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from backend.config import settings
+from backend.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages with their own limits
+STAGES = ("query", "batch", "encoder", "bm25", "reranker", "analytics", "llm")
+
+# Weight of the newest observation in the service time average
+_EWMA_ALPHA = 0.2
+
+# Percentile of recent pre-LLM latency compared against its SLO
+_LATENCY_PERCENTILE = 0.9
+
+# Latency samples kept per window, at most
+_LATENCY_MAX_SAMPLES = 1024
+
+# Load-shedding tiers of the query graph; each tier includes the ones below
+DEGRADE_NONE = 0
+DEGRADE_SKIP_TRANSLATION = 1
+DEGRADE_SKIP_RERANK = 2  # Cross-encoder skipped, RRF order used
+DEGRADE_REDUCE_RETRIEVAL = 3  # Fewer retrieval candidates
+DEGRADE_TRIM_CONTEXT = 4  # Fewer and shorter chunks sent to the LLM
+
+
+class OverloadedError(Exception):
+    """
+    A stage is saturated and the request was not admitted.
+    """
+    
+    def __init__(self, stage: str, retry_after: int):
+        """
+        Initialize overload error.
+        
+        Args:
+            stage: Stage that rejected the request
+            retry_after: Suggested client back-off in seconds
+        """
+        super().__init__(f"Server overloaded ({stage}), retry in {retry_after}s")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class StageLimiter:
+    """
+    Concurrency limit with a bounded wait queue for one pipeline stage.
+    """
+    
+    def __init__(self, name: str, concurrency: int, max_queue: int, queue_timeout: float):
+        """
+        Initialize stage limiter.
+        
+        Args:
+            name: Stage name (used in metrics and thread names)
+            concurrency: Maximum calls running at once
+            max_queue: Maximum calls waiting for a slot; more are rejected
+            queue_timeout: Maximum seconds a call waits for a slot
+        """
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.service_seconds = 0.0  # Moving average of slot hold time
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking work of this stage (one thread per slot)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix=f"stage-{self.name}"
+            )
+        return self._executor
+    
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain."""
+        backlog = (self.waiting + self.active) / self.concurrency
+        return max(1, math.ceil(backlog * self.service_seconds))
+    
+    def _reject(self) -> OverloadedError:
+        get_metrics().increment(f"admission.{self.name}.rejected")
+        return OverloadedError(self.name, self.retry_after())
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one slot of the stage, waiting in the bounded queue if needed.
+        
+        Raises:
+            OverloadedError: Queue full or queue timeout exceeded
+        """
+        metrics = get_metrics()
+        metrics.observe(f"admission.{self.name}.queue_depth", self.waiting)
+        start = time.perf_counter()
+        if not self._semaphore.locked():
+            # Free slot: taken without suspending, so a burst arriving in one
+            # event loop tick cannot overshoot the limit
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            raise self._reject()
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                self.waiting -= 1
+        
+        acquired = time.perf_counter()
+        metrics.observe(f"admission.{self.name}.wait_ms", (acquired - start) * 1000)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            held = time.perf_counter() - acquired
+            self.service_seconds += _EWMA_ALPHA * (held - self.service_seconds)
+    
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the stage's thread pool within a slot.
+        
+        Args:
+            func: Function to call
+            *args, **kwargs: Its arguments
+        
+        Returns:
+            The function's result
+        """
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current load of the stage."""
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "service_ms": round(self.service_seconds * 1000, 2)
+        }
+
+
+class LatencyWindow:
+    """
+    Latency samples of the last few seconds.
+    
+    Old samples expire, so the percentile drops to 0 once traffic stops
+    instead of holding the last busy value.
+    """
+    
+    def __init__(self, window_seconds: float):
+        """
+        Initialize latency window.
+        
+        Args:
+            window_seconds: Age after which a sample is dropped
+        """
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=_LATENCY_MAX_SAMPLES)
+    
+    def record(self, seconds: float):
+        """Add a latency sample."""
+        self._samples.append((time.monotonic(), seconds))
+    
+    def percentile(self, fraction: float) -> float:
+        """Latency percentile over the window (0.0 without samples)."""
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        if not self._samples:
+            return 0.0
+        values = sorted(seconds for _, seconds in self._samples)
+        return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+class AdmissionController:
+    """
+    Stage limiters of the query pipeline, configured from settings.
+    """
+    
+    def __init__(self):
+        """Initialize one limiter per stage."""
+        limits = {
+            "query": settings.query_max_concurrency,
+            "batch": settings.batch_max_concurrency,
+            "encoder": settings.encoder_concurrency,
+            "bm25": settings.bm25_concurrency,
+            "reranker": settings.reranker_concurrency,
+            "analytics": settings.analytics_concurrency,
+            "llm": settings.llm_concurrency,
+        }
+        self.limiters = {
+            stage: StageLimiter(
+                stage,
+                limit,
+                settings.query_max_queue if stage == "query" else settings.stage_max_queue,
+                settings.admission_queue_timeout_seconds
+            )
+            for stage, limit in limits.items()
+        }
+        self.retrieval_latency = LatencyWindow(settings.latency_window_seconds)
+    
+    def limiter(self, stage: str) -> StageLimiter:
+        """Limiter of a stage (one of STAGES)."""
+        return self.limiters[stage]
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current load of every stage."""
+        return {stage: limiter.snapshot() for stage, limiter in self.limiters.items()}
+
+
+# Global admission controller instance
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create global admission controller."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+
+def stage_limiter(stage: str) -> StageLimiter:
+    """Limiter of a pipeline stage."""
+    return get_admission_controller().limiter(stage)
+
+
+def record_retrieval_latency(seconds: float):
+    """
+    Record the time an interactive query took to reach answer generation
+    (batch queries are left out, their stages run many queries at once).
+    """
+    get_admission_controller().retrieval_latency.record(seconds)
+    get_metrics().observe("query.retrieval_ms", seconds * 1000)
+
+
+def load_pressure() -> float:
+    """
+    Current load relative to capacity: the fullest stage queue (batches
+    waiting for admission do not count), or the recent p90 pre-LLM query
+    latency relative to its SLO, whichever is higher.
+    """
+    controller = get_admission_controller()
+    queue = max(
+        limiter.waiting / limiter.max_queue if limiter.max_queue else float(limiter.waiting > 0)
+        for stage, limiter in controller.limiters.items()
+        if stage != "batch"
+    )
+    latency = controller.retrieval_latency.percentile(_LATENCY_PERCENTILE) / settings.retrieval_latency_slo_seconds
+    return max(queue, latency)
+
+
+def degradation_tier() -> int:
+    """
+    Degradation tier for a new query, from settings.degradation_thresholds
+    (the load pressure at which each tier starts).
+    """
+    if not settings.load_shedding:
+        return DEGRADE_NONE
+    pressure = load_pressure()
+    return sum(1 for threshold in settings.degradation_thresholds[:DEGRADE_TRIM_CONTEXT] if pressure >= threshold)
@@ -0,0 +1,93 @@
+"""
+Per-request deadlines for the query pipeline.
+
+A deadline is an absolute time.monotonic() value fixed when the request
+arrives. It travels with the query state so each stage can see how much
+time is left and cut optional work, and run_with_deadline cancels the
+whole pipeline once the deadline passes or the client goes away, so no
+CPU or LLM work keeps running for a response nobody will read.
+"""
+
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import logging
+import time
+
+from backend.config import settings
+from backend.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# How often a running query checks whether its client disconnected
+_DISCONNECT_POLL_SECONDS = 0.25
+
+
+class DeadlineExceeded(Exception):
+    """
+    The request ran out of time.
+    """
+
+
+class ClientDisconnected(Exception):
+    """
+    The client went away before the response was ready.
+    """
+
+
+def new_deadline(timeout_seconds: Optional[float] = None) -> float:
+    """
+    Deadline for a request starting now.
+    
+    Args:
+        timeout_seconds: Request timeout (default: settings.query_timeout_seconds)
+    
+    Returns:
+        Absolute deadline on the time.monotonic() clock
+    """
+    return time.monotonic() + (timeout_seconds or settings.query_timeout_seconds)
+
+
+def remaining(deadline: float) -> float:
+    """Seconds left until a deadline (negative once it has passed)."""
+    return deadline - time.monotonic()
+
+
+async def run_with_deadline(
+    coro: Awaitable[Any],
+    deadline: float,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+) -> Any:
+    """
+    Await a coroutine, cancelling it at the deadline or when the client disconnects.
+    
+    Args:
+        coro: Work to run (e.g. the query graph)
+        deadline: Absolute deadline from new_deadline
+        is_disconnected: Async check for a closed client connection
+    
+    Returns:
+        The coroutine's result
+    
+    Raises:
+        DeadlineExceeded: The deadline passed first
+        ClientDisconnected: The client disconnected first
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            timeout = remaining(deadline)
+            if is_disconnected is not None:
+                timeout = min(timeout, _DISCONNECT_POLL_SECONDS)
+            done, _ = await asyncio.wait({task}, timeout=max(timeout, 0))
+            if done:
+                return task.result()
+            if remaining(deadline) <= 0:
+                get_metrics().increment("query.deadline_exceeded")
+                raise DeadlineExceeded("Request deadline exceeded")
+            if is_disconnected is not None and await is_disconnected():
+                get_metrics().increment("query.client_disconnected")
+                raise ClientDisconnected("Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+            logger.info("Cancelled in-flight query work")
@@ -2,12 +2,17 @@
 Language detection and multilingual utilities.
 """
 
-from typing import Optional
+from typing import Dict, Optional
+from functools import lru_cache
 import logging
-from langdetect import detect, LangDetectException
+import re
+from langdetect import DetectorFactory, detect, LangDetectException
 
 logger = logging.getLogger(__name__)
 
+# Make the langdetect fallback deterministic
+DetectorFactory.seed = 0
+
 
 # Language code mapping
 LANGUAGE_MAP = {
@@ -28,30 +33,174 @@ CITATION_FORMATS = {
 }
 
 
-def detect_language(text: str) -> str:
+# Unicode blocks of the scripts we classify directly
+_SCRIPT_RANGES = {
+    "devanagari": ((0x0900, 0x097F), (0xA8E0, 0xA8FF)),
+    "bengali": ((0x0980, 0x09FF),),
+    "gurmukhi": ((0x0A00, 0x0A7F),),
+    "gujarati": ((0x0A80, 0x0AFF),),
+    "oriya": ((0x0B00, 0x0B7F),),
+    "tamil": ((0x0B80, 0x0BFF),),
+    "telugu": ((0x0C00, 0x0C7F),),
+    "kannada": ((0x0C80, 0x0CFF),),
+    "malayalam": ((0x0D00, 0x0D7F),)
+}
+
+# Script -> language for scripts used (almost) only by one supported language
+_SCRIPT_LANGUAGES = {
+    "devanagari": "hi",
+    "tamil": "ta",
+    "telugu": "te"
+}
+
+# Share of letters an Indic script needs for mixed-script text
+# ("Startup India योजना क्या है") to count as that language
+_INDIC_SHARE = 0.25
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Compact word n-gram model for romanized (transliterated) queries:
+# weights of frequent function words, question words and bigrams that
+# are rare in English text
+_ROMANIZED_MODEL: Dict[str, Dict[str, float]] = {
+    "hi": {
+        "kya": 2, "hai": 2, "hain": 2, "kaise": 2, "kaisa": 2, "kaun": 2, "kaunsa": 2,
+        "kitna": 2, "kitne": 2, "kitni": 2, "kahan": 2, "kyun": 2, "kyu": 2, "kab": 1,
+        "ke": 1, "ki": 1, "ka": 1, "ko": 1, "se": 1, "mein": 2, "liye": 2, "aur": 2,
+        "nahi": 2, "nahin": 2, "karna": 2, "karne": 2, "karein": 2, "kare": 1,
+        "chahiye": 2, "milega": 2, "milegi": 2, "milta": 2, "milti": 2,
+        "sakta": 2, "sakte": 2, "sakti": 2, "batao": 2, "bataiye": 2, "mujhe": 2,
+        "humein": 2, "apna": 2, "apne": 2, "yojana": 2, "sarkar": 2, "sarkari": 2,
+        "paisa": 2, "paise": 2, "wala": 2, "wali": 2, "bhi": 1, "yeh": 2, "woh": 2,
+        "kuch": 2, "koi": 1,
+        "ke liye": 2, "kya hai": 2, "kaise kare": 2, "kaise milega": 2
+    },
+    "ta": {
+        "enna": 2, "epdi": 2, "eppadi": 2, "enga": 2, "engae": 2, "yaaru": 2,
+        "evlo": 2, "evvalavu": 2, "ethana": 2, "eppo": 2, "irukku": 2, "irukka": 2,
+        "iruku": 2, "vendum": 2, "venum": 2, "panna": 2, "pannanum": 2, "pannalam": 2,
+        "illa": 2, "illai": 2, "sollunga": 2, "sollu": 2, "kudunga": 2, "thittam": 2,
+        "kidaikkum": 2, "kedaikkum": 2, "naan": 2, "naanga": 2, "unga": 2, "ungal": 2,
+        "enakku": 2, "thaan": 2, "dhaan": 2, "athu": 2, "idhu": 2, "ithu": 2,
+        "ku": 1, "oda": 1, "nu": 1,
+        "epdi apply": 2, "enna thittam": 2
+    },
+    "te": {
+        "emi": 2, "enti": 2, "ela": 2, "elaa": 2, "ekkada": 2, "evaru": 2, "entha": 2,
+        "enta": 2, "undi": 2, "unnayi": 2, "kavali": 2, "kaavali": 2, "cheyali": 2,
+        "cheyyali": 2, "cheppandi": 2, "cheppu": 2, "ledu": 2, "leda": 2,
+        "gurinchi": 2, "pathakam": 2, "naaku": 2, "maaku": 2, "meeru": 2, "nenu": 2,
+        "memu": 2, "vastundi": 2, "dorukutundi": 2, "kosam": 2, "mariyu": 2,
+        "ante": 2, "ayithe": 2, "avutundi": 2, "lo": 1, "ki": 1, "ni": 1, "tho": 1,
+        "ela apply": 2, "ante enti": 2
+    },
+    "en": {
+        "the": 1, "is": 1, "are": 1, "what": 1, "how": 1, "which": 1, "who": 1,
+        "where": 1, "when": 1, "why": 1, "for": 1, "of": 1, "to": 1, "in": 1,
+        "and": 1, "can": 1, "does": 1, "do": 1, "a": 1, "an": 1, "with": 1,
+        "my": 1, "i": 1, "about": 1, "should": 1, "there": 1, "get": 1, "from": 1
+    }
+}
+
+# Score a romanized Indic language needs (and must exceed English by)
+_ROMANIZED_MIN_SCORE = 3
+
+
+def _script_counts(text: str) -> Dict[str, int]:
+    """Number of letters per script (Latin and the Indic blocks above)."""
+    counts: Dict[str, int] = {}
+    for char in text:
+        code = ord(char)
+        if code < 0x0900:
+            if char.isalpha():
+                counts["latin"] = counts.get("latin", 0) + 1
+            continue
+        for script, ranges in _SCRIPT_RANGES.items():
+            if any(low <= code <= high for low, high in ranges):
+                counts[script] = counts.get(script, 0) + 1
+                break
+        else:
+            if char.isalpha():
+                counts["other"] = counts.get("other", 0) + 1
+    return counts
+
+
+def dominant_script(text: str) -> Optional[str]:
     """
-    Detect language of text.
+    Script with the most letters in text.
     
     Args:
         text: Input text
     
     Returns:
-        Language code (en, hi, ta, te) or 'en' as fallback
+        Script name ("latin", "devanagari", "tamil", ...) or None if text has no letters
     """
+    counts = _script_counts(text)
+    return max(counts, key=counts.get) if counts else None
+
+
+def _romanized_language(text: str) -> str:
+    """Language of Latin-script text using the romanized word model."""
+    words = _WORD_RE.findall(text.lower())
+    tokens = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    
+    scores = {
+        language: sum(weights.get(token, 0) for token in tokens)
+        for language, weights in _ROMANIZED_MODEL.items()
+    }
+    english = scores.pop("en")
+    language, score = max(scores.items(), key=lambda item: item[1])
+    
+    if score >= _ROMANIZED_MIN_SCORE and score > english:
+        return language
+    return "en"
+
+
+def _langdetect_language(text: str) -> str:
+    """Fallback for text in scripts the script classifier does not cover."""
     try:
         detected = detect(text)
-        
-        # Map to supported languages
-        if detected in LANGUAGE_MAP:
-            logger.info(f"Detected language: {detected}")
-            return LANGUAGE_MAP[detected]
-        else:
-            logger.warning(f"Unsupported language detected: {detected}, defaulting to English")
-            return "en"
-            
     except LangDetectException as e:
         logger.warning(f"Language detection failed: {e}, defaulting to English")
         return "en"
+    
+    if detected in LANGUAGE_MAP:
+        return LANGUAGE_MAP[detected]
+    logger.warning(f"Unsupported language detected: {detected}, defaulting to English")
+    return "en"
+
+
+@lru_cache(maxsize=4096)
+def detect_language(text: str) -> str:
+    """
+    Detect language of text.
+    
+    Classifies by Unicode script first (Devanagari -> hi, Tamil -> ta,
+    Telugu -> te), then tells English from romanized Hindi/Tamil/Telugu
+    with a small word n-gram model. langdetect is only consulted for
+    other scripts. Results are deterministic, so they are cached.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        Language code (en, hi, ta, te) or 'en' as fallback
+    """
+    counts = _script_counts(text)
+    letters = sum(counts.values())
+    if not letters:
+        return "en"
+    
+    indic = {script: n for script, n in counts.items() if script in _SCRIPT_LANGUAGES}
+    if indic:
+        script = max(indic, key=indic.get)
+        if indic[script] >= _INDIC_SHARE * letters:
+            return _SCRIPT_LANGUAGES[script]
+    
+    if counts.get("latin", 0) >= 0.5 * letters:
+        return _romanized_language(text)
+    
+    return _langdetect_language(text)
 
 
 def get_citation_format(language: str) -> str:
@@ -0,0 +1,89 @@
+"""
+In-process query metrics.
+
+Counters and windowed summaries (count, mean, percentiles over the most
+recent observations) for the query pipeline, exposed through the admin
+metrics endpoint.
+"""
+
+from typing import Any, Dict, Optional
+from collections import defaultdict, deque
+import threading
+
+import numpy as np
+
+# Observations kept per summary
+_WINDOW = 1000
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and summaries.
+    """
+    
+    def __init__(self, window: int = _WINDOW):
+        """
+        Initialize metrics registry.
+        
+        Args:
+            window: Most recent observations kept per summary
+        """
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._totals: Dict[str, int] = defaultdict(int)
+    
+    def increment(self, name: str, value: float = 1.0):
+        """Add to a counter."""
+        with self._lock:
+            self._counters[name] += value
+    
+    def observe(self, name: str, value: float):
+        """Record one observation of a summary."""
+        with self._lock:
+            self._samples[name].append(float(value))
+            self._totals[name] += 1
+    
+    def summary(self, name: str) -> Optional[Dict[str, float]]:
+        """Summary of a metric over its window, or None if never observed."""
+        with self._lock:
+            samples = np.array(self._samples.get(name, ()), dtype=float)
+            total = self._totals.get(name, 0)
+        if samples.size == 0:
+            return None
+        return {
+            "count": total,
+            "mean": round(float(samples.mean()), 4),
+            "p50": round(float(np.percentile(samples, 50)), 4),
+            "p95": round(float(np.percentile(samples, 95)), 4),
+            "max": round(float(samples.max()), 4)
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters and summaries."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._samples)
+        return {
+            "counters": counters,
+            "summaries": {name: self.summary(name) for name in names}
+        }
+    
+    def reset(self):
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+            self._totals.clear()
+
+
+# Global metrics instance
+_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create global metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
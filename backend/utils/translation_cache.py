@@ -0,0 +1,165 @@
+"""
+Persistent translation cache.
+
+Translations are kept in a SQLite table so they survive restarts and are
+shared by all API workers on the host. The table is bounded: entries
+expire after a TTL and the least recently used ones are evicted once it
+grows past its maximum size.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    cache_key TEXT PRIMARY KEY,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+_INDEX = "CREATE INDEX IF NOT EXISTS translations_accessed ON translations (accessed_at)"
+
+# Evict down to this share of the maximum size, so eviction runs rarely
+_EVICT_TO = 0.9
+
+
+def cache_key(text: str, source_lang: str, target_lang: str, provider: str = "google") -> str:
+    """Cache key of a translation request (per provider, so stand-ins never mix with real output)."""
+    digest = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+    return f"{provider}:{source_lang}:{target_lang}:{digest}"
+
+
+class TranslationCache:
+    """
+    Size-bounded LRU translation cache with TTL, stored in SQLite.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize translation cache.
+        
+        Args:
+            db_path: SQLite file (default: settings.translation_cache_path)
+            max_entries: Maximum cached translations (default: settings.translation_cache_size)
+            ttl_seconds: Entry lifetime (default: settings.translation_cache_ttl_seconds)
+        """
+        self.db_path = db_path or settings.translation_cache_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or settings.translation_cache_size
+        self.ttl_seconds = ttl_seconds or settings.translation_cache_ttl_seconds
+        self._lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it."""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up cached translations and mark them as recently used.
+        
+        Args:
+            keys: Cache keys
+        
+        Returns:
+            {key: translation} for keys cached and not expired
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        
+        now = time.time()
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT cache_key, translated FROM translations "
+                f"WHERE cache_key IN ({placeholders}) AND created_at > ?",
+                (*keys, now - self.ttl_seconds)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE translations SET accessed_at = ? WHERE cache_key = ?",
+                    [(now, key) for key, _ in rows]
+                )
+        return dict(rows)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Cached translation for a key, or None."""
+        return self.get_many([key]).get(key)
+    
+    def put_many(self, entries: Dict[str, str]):
+        """
+        Store translations, evicting expired and least recently used entries.
+        
+        Args:
+            entries: {key: translation}; keys must come from cache_key()
+        """
+        if not entries:
+            return
+        
+        now = time.time()
+        rows = []
+        for key, translated in entries.items():
+            _, source_lang, target_lang, _ = key.split(":", 3)
+            rows.append((key, source_lang, target_lang, translated, now, now))
+        
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("DELETE FROM translations WHERE created_at <= ?", (now - self.ttl_seconds,))
+                count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                excess = count - int(self.max_entries * _EVICT_TO)
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM translations WHERE cache_key IN ("
+                        "SELECT cache_key FROM translations ORDER BY accessed_at LIMIT ?)",
+                        (excess,)
+                    )
+                    logger.info(f"Evicted {excess} translations from cache")
+    
+    def put(self, key: str, translated: str):
+        """Store one translation."""
+        self.put_many({key: translated})
+    
+    def size(self) -> int:
+        """Number of stored translations (including expired ones not yet evicted)."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    
+    def clear(self):
+        """Remove all translations."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM translations")
@@ -2,37 +2,144 @@
 Optional translation pipeline for improved cross-lingual retrieval.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
+from abc import ABC, abstractmethod
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from backend.config import settings
 from backend.utils.language_utils import is_indic_language
+from backend.utils.metrics import get_metrics
+from backend.utils.translation_cache import TranslationCache, cache_key
 
 logger = logging.getLogger(__name__)
 
 
+class Translator(ABC):
+    """
+    Translation backend interface.
+    Implementations are synchronous; the pipeline runs them on worker threads.
+    """
+    
+    name = "base"
+    
+    @abstractmethod
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        Translate texts.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+        
+        Returns:
+            Translations in input order
+        """
+
+
+class GoogleTranslator(Translator):
+    """
+    Google Translate through googletrans.
+    """
+    
+    name = "google"
+    
+    def __init__(self):
+        """Initialize googletrans client."""
+        from googletrans import Translator as GoogleClient
+        self.client = GoogleClient()
+    
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        results = self.client.translate(texts, src=source_lang, dest=target_lang)
+        return [result.text for result in results]
+
+
+class LocalTranslator(Translator):
+    """
+    Offline stand-in for tests and benchmarks.
+    Returns known translations from a mapping and the input text otherwise.
+    """
+    
+    name = "local"
+    
+    def __init__(self, mapping: Optional[Dict[str, str]] = None, latency_ms: float = 0.0):
+        """
+        Initialize local translator.
+        
+        Args:
+            mapping: {text: translation}
+            latency_ms: Simulated latency per batch
+        """
+        self.mapping = mapping or {}
+        self.latency_ms = latency_ms
+    
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return [self.mapping.get(text, text) for text in texts]
+
+
+# Translator backends selectable with TRANSLATION_PROVIDER
+TRANSLATORS = {
+    "google": GoogleTranslator,
+    "local": LocalTranslator,
+}
+
+
 class TranslationPipeline:
     """
     Optional translation pipeline for queries.
     Translates Indic language queries to English for better retrieval.
+    
+    Translations are served from a persistent cache shared across workers.
+    Misses run on a thread pool so the event loop is never blocked, and
+    concurrent requests for the same text share one backend call. Cache
+    reads and writes use their own threads, so hits never queue behind
+    slow backend calls.
     """
     
     def __init__(self):
         """Initialize translation pipeline."""
-        self.translator = None
+        self.translator: Optional[Translator] = None
         self.enabled = settings.enable_translation
-        self.cache = {}  # Simple in-memory cache
+        self.cache: Optional[TranslationCache] = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.translation_workers,
+            thread_name_prefix="translate"
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
     
-    def initialize(self):
-        """Initialize translator if enabled."""
-        if self.enabled:
-            try:
-                from googletrans import Translator
-                self.translator = Translator()
-                logger.info("Translation pipeline initialized")
-            except Exception as e:
-                logger.warning(f"Error initializing translator (features disabled): {e}")
-                self.enabled = False
+    def initialize(self, translator: Optional[Translator] = None):
+        """
+        Initialize translator and cache if enabled.
+        
+        Args:
+            translator: Backend to use instead of settings.translation_provider
+        """
+        if not self.enabled and translator is None:
+            return
+        
+        try:
+            if translator is None:
+                provider = TRANSLATORS.get(settings.translation_provider)
+                if provider is None:
+                    raise ValueError(f"Unknown translation provider: {settings.translation_provider}")
+                translator = provider()
+            self.translator = translator
+            if self.cache is None:
+                self.cache = TranslationCache()
+            self.enabled = True
+            logger.info(f"Translation pipeline initialized ({self.translator.name})")
+        except Exception as e:
+            logger.warning(f"Error initializing translator (features disabled): {e}")
+            self.enabled = False
+    
+    def set_translator(self, translator: Translator):
+        """Replace the translation backend (e.g. with LocalTranslator in tests)."""
+        self.initialize(translator)
     
     async def translate_query(self, query: str, source_lang: str) -> Optional[str]:
         """
@@ -52,31 +159,100 @@ class TranslationPipeline:
         if not is_indic_language(source_lang):
             return None
         
-        # Check cache
-        cache_key = f"{source_lang}:{query}"
-        if cache_key in self.cache:
-            logger.info("Using cached translation")
-            return self.cache[cache_key]
+        translated = (await self.translate_batch([query], source_lang))[0]
+        if translated:
+            logger.info(f"Translation: {query[:50]}... → {translated[:50]}...")
+        return translated
+    
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str = "en"
+    ) -> List[Optional[str]]:
+        """
+        Translate several texts with one cache lookup and one backend call.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+        
+        Returns:
+            Translations in input order (None where translation failed)
+        """
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+        
+        if self.translator is None:
+            self.initialize()
+            if not self.enabled:
+                return [None] * len(texts)
+        
+        metrics = get_metrics()
+        keys = [cache_key(text, source_lang, target_lang, self.translator.name) for text in texts]
         
         try:
-            if self.translator is None:
-                self.initialize()
-            
-            logger.info(f"Translating query from {source_lang} to English")
-            
-            result = self.translator.translate(query, src=source_lang, dest='en')
-            translated = result.text
-            
-            # Cache translation
-            self.cache[cache_key] = translated
-            
-            logger.info(f"Translation: {query[:50]}... → {translated[:50]}...")
-            
-            return translated
-            
+            cached = await asyncio.to_thread(self.cache.get_many, keys)
+        except Exception as e:
+            logger.warning(f"Translation cache lookup failed: {e}")
+            cached = {}
+        metrics.increment("translation.cache_hits", sum(1 for key in keys if key in cached))
+        
+        # Misses already being translated are awaited; the rest are translated here
+        pending: Dict[str, asyncio.Future] = {}
+        owned: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in cached or key in pending:
+                continue
+            if key in self._inflight:
+                pending[key] = self._inflight[key]
+                metrics.increment("translation.coalesced")
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                pending[key] = future
+                owned[key] = text
+        
+        if owned:
+            metrics.increment("translation.cache_misses", len(owned))
+            await self._translate_owned(owned, source_lang, target_lang)
+        
+        results = dict(cached)
+        for key, future in pending.items():
+            results[key] = await asyncio.shield(future)
+        return [results.get(key) for key in keys]
+    
+    async def _translate_owned(self, owned: Dict[str, str], source_lang: str, target_lang: str):
+        """Translate texts this call is responsible for and resolve their futures."""
+        loop = asyncio.get_running_loop()
+        keys = list(owned)
+        translations: List[Optional[str]] = [None] * len(keys)
+        
+        try:
+            logger.info(f"Translating {len(keys)} text(s) from {source_lang} to {target_lang}")
+            start = time.perf_counter()
+            translations = await loop.run_in_executor(
+                self.executor,
+                self.translator.translate_batch,
+                [owned[key] for key in keys],
+                source_lang,
+                target_lang
+            )
+            get_metrics().observe("translation.ms", (time.perf_counter() - start) * 1000)
         except Exception as e:
             logger.error(f"Translation failed: {e}")
-            return None
+        finally:
+            results = dict(zip(keys, translations))
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(results.get(key) or None)
+        
+        try:
+            await asyncio.to_thread(self.cache.put_many, {key: text for key, text in results.items() if text})
+        except Exception as e:
+            logger.warning(f"Could not cache translations: {e}")
 
 
 # Global instance
@@ -0,0 +1,365 @@
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Fixed corpus subset: the Q&A knowledge base plus unrelated documents as distractors
+DEFAULT_CORPUS = [
+    "sample_data/general_startup_qa.txt",
+    "sample_data/sidbi_fund_of_funds.txt",
+    "sample_data/50.Taxation-of-ESOPs.pdf",
+    "sample_data/act_no_23_of_1968.pdf",
+    "sample_data/startup_funding2019.csv",
+    "sample_data/Unicorntable_india.csv",
+]
+
+# Query sets with ground-truth answers
+DEFAULT_QUERIES = [
+    "sample_data/general_500_qa.json",
+    "sample_data/general_qa.jsonl",
+]
+
+STAGES = ["detect_language", "dense", "sparse", "fusion", "rerank", "total"]
+RECALL_KS = [1, 3, 5, 10, 20]
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Offline retrieval benchmark: per-stage latency, throughput and recall@k/MRR over sample_data."
+    )
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS, help="Documents to ingest")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES, help="Query files (.json or .jsonl)")
+    parser.add_argument("--limit", type=int, help="Use only the first N queries")
+    parser.add_argument("--concurrency", default="1,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--workdir", default="./storage/benchmark", help="Isolated storage for the benchmark index")
+    parser.add_argument("--reingest", action="store_true", help="Rebuild the benchmark index even if the corpus is unchanged")
+    parser.add_argument("--output", help="Result file (default: <workdir>/results/retrieval-<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    return parser.parse_args()
+
+def configure_storage(workdir: Path):
+    """Point all storage settings at the benchmark workdir (before backend is imported)."""
+    storage = workdir / "storage"
+    os.environ.update({
+        "STORAGE_PATH": str(storage),
+        "FAISS_INDEX_PATH": str(storage / "faiss_index"),
+        "BM25_INDEX_PATH": str(storage / "bm25_index.pkl"),
+        "DOCUMENTS_PATH": str(storage / "documents"),
+        "JOBS_DB_PATH": str(storage / "jobs.db"),
+        "CHUNK_CACHE_PATH": str(storage / "chunk_cache"),
+        "TABLE_STORE_PATH": str(storage / "tables"),
+        "FAQ_STORE_PATH": str(storage / "faq"),
+        "TRANSLATION_CACHE_PATH": str(storage / "translation_cache.db"),
+    })
+
+def load_queries(paths, limit=None):
+    """Questions with their ground-truth answer text (glossary entries become "What is <term>?")."""
+    queries = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                records = json.load(f)
+        for record in records:
+            if "question" in record and "answer" in record:
+                queries.append({"id": record.get("id"), "query": record["question"], "answer": record["answer"]})
+            elif "term" in record and "definition" in record:
+                queries.append({"id": record.get("id"), "query": f"What is {record['term']}?", "answer": record["definition"]})
+    return queries[:limit] if limit else queries
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+class RelevanceJudge:
+    """
+    A chunk is relevant to a query if it contains the start of the
+    ground-truth answer or at least 60% of the answer's terms.
+    """
+
+    def __init__(self, chunks):
+        from backend.retriever.analyzer import tokenize
+
+        self._tokenize = tokenize
+        self._chunks = {
+            chunk["chunk_id"]: (_normalize(chunk["content"]), set(tokenize(chunk["content"])))
+            for chunk in chunks
+        }
+
+    def relevant(self, chunk_id, answer):
+        text, terms = self._chunks[chunk_id]
+        if _normalize(answer)[:60] in text:
+            return True
+        answer_terms = set(self._tokenize(answer))
+        return bool(answer_terms) and len(answer_terms & terms) / len(answer_terms) >= 0.6
+
+    def answerable(self, answer):
+        """Whether any chunk of the corpus contains the answer."""
+        return any(self.relevant(chunk_id, answer) for chunk_id in self._chunks)
+
+    def first_relevant_rank(self, results, answer):
+        for rank, result in enumerate(results, 1):
+            if self.relevant(result["chunk_id"], answer):
+                return rank
+        return None
+
+def corpus_fingerprint(paths):
+    from backend.config import settings
+
+    files = []
+    for path in paths:
+        stat = os.stat(path)
+        files.append([path, stat.st_size, stat.st_mtime])
+    return {"files": files, "embedding_model": settings.embedding_model}
+
+async def prepare_index(args, workdir: Path):
+    """Ingest the corpus into the benchmark workdir unless an identical index exists."""
+    from backend.ingestion.ingestion_pipeline import detect_document_type, ingest_batch
+    from backend.ingestion.index_store import IndexStore
+    from backend.config import settings
+
+    fingerprint_file = workdir / "corpus.json"
+    fingerprint = corpus_fingerprint(args.corpus)
+
+    if not args.reingest and fingerprint_file.exists() and IndexStore().current() is not None:
+        with open(fingerprint_file, "r") as f:
+            if json.load(f) == fingerprint:
+                print("♻️  Corpus unchanged, reusing benchmark index")
+                return None
+
+    storage = workdir / "storage"
+    if storage.exists():
+        shutil.rmtree(storage)
+    storage.mkdir(parents=True)
+    settings.documents_path.mkdir(parents=True, exist_ok=True)
+
+    items = [
+        {"file_path": path, "document_type": detect_document_type(path), "metadata": {"source": "benchmark"}}
+        for path in args.corpus
+    ]
+    print(f"📥 Ingesting {len(items)} documents...")
+    start = time.perf_counter()
+    result = await ingest_batch(items)
+    seconds = time.perf_counter() - start
+    if not result.get("success"):
+        raise RuntimeError(f"Benchmark ingestion failed: {result.get('message')}")
+    for failure in result.get("failures", []):
+        print(f"❌ Failed to ingest {os.path.basename(failure['file_path'])}: {failure['message']}")
+
+    with open(fingerprint_file, "w") as f:
+        json.dump(fingerprint, f)
+
+    return {"seconds": round(seconds, 2), "documents": len(result.get("documents", []))}
+
+async def run_query(query):
+    """Run one query through retrieve → fusion → rerank, timing each stage."""
+    from backend.config import settings
+    from backend.utils.language_utils import detect_language
+    from backend.retriever.hybrid_retriever import get_retriever
+    from backend.retriever.filters import normalize_filters
+    from backend.retriever.rrf import reciprocal_rank_fusion
+    from backend.retriever.reranker import get_reranker
+
+    retriever = get_retriever()
+    reranker = get_reranker()
+    timings = {}
+
+    start = time.perf_counter()
+    t = start
+    detect_language(query)
+    timings["detect_language"] = time.perf_counter() - t
+
+    filters = normalize_filters(None)
+    with retriever.acquire() as snapshot:
+        t = time.perf_counter()
+        dense = await retriever.retrieve_dense(query, settings.top_k_retrieval, snapshot, filters)
+        timings["dense"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        sparse = await retriever.retrieve_sparse(query, settings.top_k_retrieval, snapshot, filters)
+        timings["sparse"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    fused = reciprocal_rank_fusion([dense, sparse], k=settings.rrf_k)
+    timings["fusion"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    if settings.rerank_adaptive:
+        reranked, _ = await reranker.rerank_adaptive(query, [dict(r) for r in fused], settings.top_k_rerank)
+    else:
+        reranked = await reranker.rerank(query, [dict(r) for r in fused], settings.top_k_rerank)
+    timings["rerank"] = time.perf_counter() - t
+
+    timings["total"] = time.perf_counter() - start
+    return timings, fused, reranked
+
+def quality(ranks, depth):
+    """Recall@k (share of queries with a relevant chunk in the top k) and MRR."""
+    n = len(ranks)
+    if n == 0:
+        return {}
+    report = {f"recall@{k}": round(sum(1 for r in ranks if r and r <= k) / n, 4) for k in RECALL_KS if k <= depth}
+    report["mrr"] = round(sum(1.0 / r for r in ranks if r) / n, 4)
+    return report
+
+def percentiles(values_ms):
+    values = np.array(values_ms, dtype=float)
+    return {
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+    }
+
+async def measure_throughput(queries, concurrency):
+    """Replay all queries with a fixed number in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query):
+        async with semaphore:
+            start = time.perf_counter()
+            await run_query(query["query"])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    seconds = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "queries": len(queries),
+        "qps": round(len(queries) / seconds, 2),
+        "latency_ms": percentiles(latencies),
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+def print_comparison(result, previous):
+    print(f"\n📊 Compared with {previous.get('timestamp')} ({previous.get('git_commit')})")
+    print(f"{'metric':<28} {'before':>10} {'after':>10} {'change':>9}")
+    rows = []
+    for stage in STAGES:
+        for p in ("p50", "p95"):
+            rows.append((f"{stage} {p} ms", previous["stages"].get(stage, {}).get(p), result["stages"][stage][p]))
+    for ranking in ("fused", "reranked"):
+        for metric, value in result["quality"][ranking].items():
+            rows.append((f"{ranking} {metric}", previous["quality"].get(ranking, {}).get(metric), value))
+    before_qps = {t["concurrency"]: t["qps"] for t in previous.get("throughput", [])}
+    for t in result["throughput"]:
+        rows.append((f"qps @ {t['concurrency']}", before_qps.get(t["concurrency"]), t["qps"]))
+
+    for name, before, after in rows:
+        if before is None:
+            print(f"{name:<28} {'-':>10} {after:>10}")
+            continue
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "-"
+        print(f"{name:<28} {before:>10} {after:>10} {change:>9}")
+
+async def main():
+    args = parse_args()
+    workdir = Path(args.workdir).resolve()
+    configure_storage(workdir)
+
+    from backend.config import settings
+    from backend.retriever.hybrid_retriever import get_retriever
+
+    ingestion = await prepare_index(args, workdir)
+    retriever = get_retriever()
+    retriever.load_indices()
+
+    queries = load_queries(args.queries, args.limit)
+    print(f"🔎 {len(queries)} queries over {len(retriever.chunk_metadata)} chunks")
+
+    # Warm-up (model loading, caches) is excluded from the measurements
+    await run_query(queries[0]["query"])
+
+    judge = RelevanceJudge(retriever.chunk_metadata)
+    stage_ms = {stage: [] for stage in STAGES}
+    fused_ranks, reranked_ranks = [], []
+    unanswerable = 0
+    for query in queries:
+        timings, fused, reranked = await run_query(query["query"])
+        for stage, seconds in timings.items():
+            stage_ms[stage].append(seconds * 1000)
+
+        # Only judge queries whose answer exists somewhere in the corpus
+        if not judge.answerable(query["answer"]):
+            unanswerable += 1
+            continue
+        fused_ranks.append(judge.first_relevant_rank(fused, query["answer"]))
+        reranked_ranks.append(judge.first_relevant_rank(reranked, query["answer"]))
+
+    throughput = []
+    for level in [int(c) for c in args.concurrency.split(",")]:
+        throughput.append(await measure_throughput(queries, level))
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "settings": {
+            "embedding_model": settings.embedding_model,
+            "faiss_storage": settings.faiss_storage,
+            "faiss_metric": settings.faiss_metric,
+            "top_k_retrieval": settings.top_k_retrieval,
+            "top_k_rerank": settings.top_k_rerank,
+            "rerank_adaptive": settings.rerank_adaptive,
+            "cross_lingual_mode": settings.cross_lingual_mode,
+        },
+        "corpus": {
+            "files": args.corpus,
+            "chunks": len(retriever.chunk_metadata),
+            "ingestion": ingestion,
+        },
+        "queries": {"total": len(queries), "judged": len(fused_ranks), "unanswerable": unanswerable},
+        "stages": {stage: percentiles(values) for stage, values in stage_ms.items()},
+        "quality": {
+            "fused": quality(fused_ranks, settings.top_k_retrieval),
+            "reranked": quality(reranked_ranks, settings.top_k_rerank),
+        },
+        "throughput": throughput,
+    }
+
+    print(f"\n{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, summary in result["stages"].items():
+        print(f"{stage:<16} {summary['p50']:>9} {summary['p95']:>9} {summary['p99']:>9}")
+    print(f"\n{'concurrency':<12} {'qps':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for t in throughput:
+        print(f"{t['concurrency']:<12} {t['qps']:>8} {t['latency_ms']['p50']:>9} {t['latency_ms']['p95']:>9}")
+    print(f"\nJudged {len(fused_ranks)} queries ({unanswerable} without an answer in the corpus)")
+    for ranking, report in result["quality"].items():
+        print(f"{ranking:<9} " + "  ".join(f"{k}={v}" for k, v in report.items()))
+
+    output = Path(args.output) if args.output else workdir / "results" / f"retrieval-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Saved results to {output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            print_comparison(result, json.load(f))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.config import settings
+from backend.ingestion.chunk_cache import ChunkCache
+from backend.ingestion.indexer import IndexBuilder
+from backend.ingestion.vector_storage import STORAGE_MODES, METRICS, evaluate_recall
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare recall@k and memory of FAISS storage modes against the exact index."
+    )
+    parser.add_argument("--k", type=int, default=10, help="Neighbours compared per query")
+    parser.add_argument("--sample", type=int, default=200, help="Corpus vectors used as queries")
+    parser.add_argument("--queries", help="Text file with one query per line (embedded instead of sampling)")
+    parser.add_argument("--modes", default=",".join(STORAGE_MODES), help="Comma-separated storage modes")
+    parser.add_argument("--metric", choices=METRICS, default=settings.faiss_metric, help="Distance metric")
+    return parser.parse_args()
+
+def load_corpus_vectors():
+    """Embeddings of the indexed corpus, taken from the chunk cache."""
+    cache = ChunkCache()
+    parts = []
+    for document_id in cache.document_ids():
+        entry = cache.load(document_id)
+        if entry and entry.get("embedding_model") == settings.embedding_model:
+            parts.append(entry["embeddings"])
+    return np.vstack(parts) if parts else None
+
+def main():
+    args = parse_args()
+
+    vectors = load_corpus_vectors()
+    if vectors is None:
+        print("❌ No cached embeddings found. Ingest or reindex documents first.")
+        return
+
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+        indexer = IndexBuilder()
+        queries = indexer.embed_chunks([{"content": text} for text in texts])
+    else:
+        rng = np.random.default_rng(0)
+        queries = vectors[rng.choice(len(vectors), min(args.sample, len(vectors)), replace=False)]
+
+    print(f"Corpus: {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}, {args.metric}\n")
+    print(f"{'mode':<6} {'recall@k':>9} {'bytes/vec':>10} {'index MB':>9} {'build s':>8} {'ms/query':>9}")
+
+    for row in evaluate_recall(vectors, queries, k=args.k, modes=args.modes.split(","), metric=args.metric):
+        label = row["mode"] if row["mode"] == row["actual_mode"] else f"{row['mode']}→{row['actual_mode']}"
+        print(
+            f"{label:<6} {row['recall_at_k']:>9.3f} {row['bytes_per_vector']:>10} "
+            f"{row['index_bytes'] / 1e6:>9.2f} {row['build_seconds']:>8.2f} {row['query_ms']:>9.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
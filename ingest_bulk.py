@@ -0,0 +1,48 @@
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.ingestion.ingestion_pipeline import ingest_directory
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bulk-ingest a directory or manifest with a single index commit."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", dest="directory", help="Directory of documents to ingest")
+    source.add_argument("--manifest", help="JSON/JSONL manifest of {file_path, document_type, metadata}")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not descend into subdirectories")
+    parser.add_argument("--metadata", default="{}", help="JSON metadata applied to every file")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+
+    result = await ingest_directory(
+        directory=args.directory,
+        manifest=args.manifest,
+        recursive=not args.no_recursive,
+        metadata=json.loads(args.metadata)
+    )
+
+    if result.get("success"):
+        print(f"✅ {result['message']}: {result['chunks_created']} chunks")
+    else:
+        print(f"❌ Bulk ingestion failed: {result.get('message')}")
+
+    for failure in result.get("failures", []):
+        print(f"  ⚠️ {failure['file_path']}: {failure['message']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,7 +6,7 @@ import sys
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from backend.ingestion.ingestion_pipeline import ingest_document
+from backend.ingestion.ingestion_pipeline import collect_directory, ingest_batch
 from backend.config import settings
 import logging
 
@@ -21,27 +21,20 @@ async def ingest_samples():
         print(f"❌ Sample directory not found: {sample_dir}")
         return
 
-    files = [f for f in os.listdir(sample_dir) if f.endswith(('.txt', '.csv'))]
-    print(f"Found {len(files)} files to ingest.")
-
-    for file in files:
-        file_path = os.path.join(sample_dir, file)
-        doc_type = "csv" if file.endswith(".csv") else "txt"
-        print(f"Processing {file}...")
-        
-        try:
-            # Call function directly
-            result = await ingest_document(
-                file_path=file_path,
-                document_type=doc_type,
-                metadata={"source": "sample_data", "filename": file}
-            )
-            if result.get("success"):
-                print(f"✅ Ingested {file}: {result.get('chunks_created')} chunks")
-            else:
-                print(f"❌ Failed to ingest {file}: {result.get('message')}")
-        except Exception as e:
-            print(f"❌ Error ingesting {file}: {e}")
+    items = collect_directory(sample_dir, recursive=False, extensions=[".txt", ".csv"])
+    for item in items:
+        item["metadata"] = {"source": "sample_data", "filename": os.path.basename(item["file_path"])}
+    print(f"Found {len(items)} files to ingest.")
+
+    # Parse all files in parallel, then embed and index once
+    result = await ingest_batch(items)
+
+    for doc in result.get("documents", []):
+        print(f"✅ Ingested {os.path.basename(doc['file_path'])}: {doc['chunks_created']} chunks")
+    for failure in result.get("failures", []):
+        print(f"❌ Failed to ingest {os.path.basename(failure['file_path'])}: {failure['message']}")
+    if not result.get("success"):
+        print(f"❌ {result.get('message')}")
 
 if __name__ == "__main__":
     asyncio.run(ingest_samples())
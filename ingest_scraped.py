@@ -7,7 +7,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from backend.ingestion.ingestion_pipeline import ingest_document
+from backend.ingestion.ingestion_pipeline import collect_directory, ingest_batch
 from backend.config import settings
 import logging
 
@@ -24,46 +24,28 @@ async def ingest_scraped_data():
 
     print(f"📂 Scanning {base_dir}...")
     
-    files_to_process = []
-    
     # Recursively find files
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            file_path = Path(root) / file
-            # Simple extension check
-            if file.endswith(('.txt', '.csv', '.pdf', '.docx', '.xlsx')):
-                files_to_process.append(file_path)
-
-    print(f"found {len(files_to_process)} files to ingest.")
-
-    for i, file_path in enumerate(files_to_process, 1):
-        print(f"[{i}/{len(files_to_process)}] Processing {file_path.name}...")
-        
-        # Determine type
-        ext = file_path.suffix.lower().lstrip('.')
-        if ext == 'xlsx': ext = 'excel'
-        
-        try:
-            # Determine category from parent folder
-            category = file_path.parent.name
-            
-            result = await ingest_document(
-                file_path=str(file_path),
-                document_type=ext,
-                metadata={
-                    "source": "scraped_data", 
-                    "filename": file_path.name,
-                    "category": category
-                }
-            )
-            
-            if result.get("success"):
-                print(f"  ✅ Success: {result.get('chunks_created')} chunks")
-            else:
-                print(f"  ❌ Failed: {result.get('message')}")
-                
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
+    items = collect_directory(str(base_dir), extensions=[".txt", ".csv", ".pdf", ".docx", ".xlsx"])
+
+    for item in items:
+        file_path = Path(item["file_path"])
+        # Determine category from parent folder
+        item["metadata"] = {
+            "source": "scraped_data",
+            "filename": file_path.name,
+            "category": file_path.parent.name
+        }
+
+    print(f"found {len(items)} files to ingest.")
+
+    # Parse all files in parallel, then embed and index once
+    result = await ingest_batch(items)
+
+    for doc in result.get("documents", []):
+        print(f"  ✅ {Path(doc['file_path']).name}: {doc['chunks_created']} chunks")
+    for failure in result.get("failures", []):
+        print(f"  ❌ {Path(failure['file_path']).name}: {failure['message']}")
+    print(result.get("message"))
 
 if __name__ == "__main__":
     asyncio.run(ingest_scraped_data())
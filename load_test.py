@@ -0,0 +1,168 @@
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from benchmark_retrieval import DEFAULT_QUERIES, load_queries, percentiles
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Answer returned by the query graph when generation fails
+GENERATION_ERROR = "Error generating answer."
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Load-test /api/query with concurrent traffic (run the API with LLM_PROVIDER=openai against backend.llm.mock_server)."
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES, help="Query files (.json or .jsonl)")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests sent")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests kept in flight (closed loop)")
+    parser.add_argument("--rate", type=float, help="Poisson arrival rate in requests/second (open loop; overrides --concurrency)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--deterministic", action="store_true", help="Send deterministic=true")
+    parser.add_argument("--mock-url", help="Mock LLM base URL; its /stats are reported alongside")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for query order and arrivals")
+    parser.add_argument("--output", help="Result file (default: ./storage/load_tests/load-<timestamp>.json)")
+    return parser.parse_args()
+
+class LoadRecorder:
+    """Outcome and latency of every request, plus the peak number in flight."""
+
+    def __init__(self):
+        self.outcomes = Counter()
+        self.latencies_ms = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def send(self, client, url, payload, timeout):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, json=payload, timeout=timeout)
+            if response.status_code != 200:
+                outcome = str(response.status_code)
+            elif response.json().get("answer", "").startswith(GENERATION_ERROR):
+                outcome = "generation_error"
+            else:
+                outcome = "ok"
+        except httpx.TimeoutException:
+            outcome = "timeout"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.outcomes[outcome] += 1
+        if outcome == "ok":
+            self.latencies_ms.append(elapsed_ms)
+
+async def closed_loop(recorder, client, url, payloads, concurrency, timeout):
+    """Keep a fixed number of requests in flight until all are sent."""
+    queue = list(payloads)
+
+    async def worker():
+        while queue:
+            await recorder.send(client, url, queue.pop(), timeout)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def open_loop(recorder, client, url, payloads, rate, timeout, rng):
+    """Send requests at Poisson arrival times regardless of how fast they complete."""
+    tasks = []
+    for payload in payloads:
+        tasks.append(asyncio.ensure_future(recorder.send(client, url, payload, timeout)))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+
+async def fetch_stats(client, mock_url):
+    if not mock_url:
+        return None
+    try:
+        response = await client.get(f"{mock_url.rstrip('/')}/stats")
+        return response.json()
+    except httpx.HTTPError as e:
+        logger.warning(f"Could not read mock stats: {e}")
+        return None
+
+async def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    queries = load_queries(args.queries)
+    if not queries:
+        print("❌ No queries found")
+        return
+    payloads = [
+        {"query": rng.choice(queries)["query"], "deterministic": args.deterministic}
+        for _ in range(args.requests)
+    ]
+    url = f"{args.url.rstrip('/')}/api/query"
+    mode = f"open loop at {args.rate} req/s" if args.rate else f"closed loop with {args.concurrency} in flight"
+    print(f"🚀 Sending {len(payloads)} queries to {url} ({mode})")
+
+    recorder = LoadRecorder()
+    async with httpx.AsyncClient() as client:
+        mock_before = await fetch_stats(client, args.mock_url)
+        start = time.perf_counter()
+        if args.rate:
+            await open_loop(recorder, client, url, payloads, args.rate, args.timeout, rng)
+        else:
+            await closed_loop(recorder, client, url, payloads, args.concurrency, args.timeout)
+        seconds = time.perf_counter() - start
+        mock_after = await fetch_stats(client, args.mock_url)
+
+    ok = recorder.outcomes["ok"]
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "url": url,
+        "mode": "open" if args.rate else "closed",
+        "rate": args.rate,
+        "concurrency": None if args.rate else args.concurrency,
+        "requests": len(payloads),
+        "seconds": round(seconds, 2),
+        "outcomes": dict(recorder.outcomes),
+        "error_rate": round(1 - ok / len(payloads), 4),
+        "throughput_rps": round(ok / seconds, 2),
+        "peak_in_flight": recorder.peak_in_flight,
+        "latency_ms": percentiles(recorder.latencies_ms) if recorder.latencies_ms else None,
+    }
+    if mock_after is not None:
+        before = mock_before or {}
+        result["mock_llm"] = {
+            key: mock_after[key] - before.get(key, 0) for key in ("requests", "completed", "rejected")
+        }
+        result["mock_llm"]["peak_in_flight"] = mock_after["peak_in_flight"]
+
+    print(f"\n✅ {ok}/{len(payloads)} answered in {result['seconds']}s ({result['throughput_rps']} req/s)")
+    print("Outcomes: " + ", ".join(f"{k}={v}" for k, v in recorder.outcomes.most_common()))
+    if result["latency_ms"]:
+        print("Latency ms: " + "  ".join(f"{k}={v}" for k, v in result["latency_ms"].items()))
+    print(f"Peak in flight: {recorder.peak_in_flight}")
+    if "mock_llm" in result:
+        print("Mock LLM: " + ", ".join(f"{k}={v}" for k, v in result["mock_llm"].items()))
+
+    output = Path(args.output) if args.output else Path("./storage/load_tests") / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Saved results to {output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -41,10 +41,19 @@ apiClient.interceptors.response.use(
 );
 
 // Types
+export interface QueryFilters {
+    type?: string[];
+    document?: string[];
+    year?: number[];
+    category?: string[];
+    sheet_name?: string[];
+}
+
 export interface QueryRequest {
     query: string;
     deterministic?: boolean;
     language?: string;
+    filters?: QueryFilters;
 }
 
 export interface Source {
@@ -67,6 +76,7 @@ export interface IngestRequest {
     file_path: string;
     document_type: string;
     metadata?: Record<string, any>;
+    replaces_document_id?: string;
 }
 
 export interface IngestResponse {
@@ -76,6 +86,39 @@ export interface IngestResponse {
     document_id?: string;
 }
 
+export interface DeleteDocumentResponse {
+    success: boolean;
+    message: string;
+    document_id: string;
+    chunks_removed: number;
+    compaction_job_id?: string;
+}
+
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface JobProgress {
+    stage: string;
+    pages_parsed: number;
+    pages_total?: number;
+    chunks_embedded: number;
+    chunks_total?: number;
+    eta_seconds?: number;
+}
+
+export interface JobResponse {
+    job_id: string;
+    job_type: string;
+    status: JobStatus;
+    params?: Record<string, any>;
+    progress?: JobProgress;
+    result?: IngestResponse | Record<string, any>;
+    error?: string;
+    cancel_requested: boolean;
+    created_at: number;
+    started_at?: number;
+    finished_at?: number;
+}
+
 export interface StatsResponse {
     total_documents: number;
     total_chunks: number;
@@ -85,6 +128,19 @@ export interface StatsResponse {
     embedding_model: string;
 }
 
+export interface MetricSummary {
+    count: number;
+    mean: number;
+    p50: number;
+    p95: number;
+    max: number;
+}
+
+export interface MetricsResponse {
+    counters: Record<string, number>;
+    summaries: Record<string, MetricSummary | null>;
+}
+
 // API Methods
 export const api = {
     // User endpoints
@@ -104,23 +160,48 @@ export const api = {
     },
 
     // Admin endpoints
-    async ingestDocument(request: IngestRequest): Promise<IngestResponse> {
-        const response = await apiClient.post<IngestResponse>('/api/admin/ingest', request);
+    async ingestDocument(request: IngestRequest): Promise<JobResponse> {
+        const response = await apiClient.post<JobResponse>('/api/admin/ingest', request);
         return response.data;
     },
 
-    async reindex(rebuildFaiss = true, rebuildBm25 = true) {
-        const response = await apiClient.post('/api/admin/reindex', {
+    async reindex(rebuildFaiss = true, rebuildBm25 = true): Promise<JobResponse> {
+        const response = await apiClient.post<JobResponse>('/api/admin/reindex', {
             rebuild_faiss: rebuildFaiss,
             rebuild_bm25: rebuildBm25,
         });
         return response.data;
     },
 
+    async deleteDocument(documentId: string): Promise<DeleteDocumentResponse> {
+        const response = await apiClient.delete<DeleteDocumentResponse>(`/api/admin/documents/${documentId}`);
+        return response.data;
+    },
+
+    async compact(): Promise<JobResponse> {
+        const response = await apiClient.post<JobResponse>('/api/admin/compact');
+        return response.data;
+    },
+
+    async getJob(jobId: string): Promise<JobResponse> {
+        const response = await apiClient.get<JobResponse>(`/api/admin/jobs/${jobId}`);
+        return response.data;
+    },
+
+    async cancelJob(jobId: string): Promise<JobResponse> {
+        const response = await apiClient.post<JobResponse>(`/api/admin/jobs/${jobId}/cancel`);
+        return response.data;
+    },
+
     async getStats(): Promise<StatsResponse> {
         const response = await apiClient.get<StatsResponse>('/api/admin/stats');
         return response.data;
     },
+
+    async getMetrics(): Promise<MetricsResponse> {
+        const response = await apiClient.get<MetricsResponse>('/api/admin/metrics');
+        return response.data;
+    },
 };
 
 export default api;
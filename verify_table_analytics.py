@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.ingestion.table_store import TableStore
+from backend.retriever.table_analytics import answer_from_tables
+
+SAMPLE_TABLE = Path("sample_data/Unicorntable_india.csv")
+
+# (query, text the computed answer must contain, text it must not contain)
+CHECKS = [
+    ("top 5 companies by valuation", "max of Valuation ($B)", "Entry Valuation"),
+    ("top 5 companies by valuation", "Flipkart", None),
+    ("average valuation by sector", "mean of Valuation ($B) grouped by Sector", "Entry Valuation"),
+    ("total entry valuation", "sum of Entry Valuation($B)", None),
+]
+
+def verify_table_analytics() -> bool:
+    print("📊 Verifying table analytics on the unicorn table...")
+
+    # Isolated table store, so the live one is never touched
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TableStore(Path(tmp))
+        store.save_document("unicorns", str(SAMPLE_TABLE), "csv")
+
+        ok = True
+        for query, expected, unexpected in CHECKS:
+            results = answer_from_tables(query, store=store)
+            content = results[0]["content"] if results else ""
+            if expected in content and (unexpected is None or unexpected not in content):
+                print(f"✅ '{query}' → {expected}")
+            else:
+                print(f"❌ '{query}': expected '{expected}', got:\n{content or '(no table answer)'}")
+                ok = False
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_table_analytics() else 1)